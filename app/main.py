@@ -1,5 +1,6 @@
 import os
 import sys
+from contextlib import asynccontextmanager
 from pathlib import Path
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
@@ -11,9 +12,24 @@ APP_DIR = Path(__file__).parent.absolute()
 sys.path.insert(0, str(APP_DIR))
 
 # Now import routers
-from routers import site, chatbot
+from routers import site, chatbot, projects
+from services.static_assets import BUILD_DIR, FingerprintedStaticFiles
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app):
+    # Discover the Gemini model in the background so the site serves immediately
+    chatbot.gemini.start()
+    chatbot.disk_cache.start()
+    site.page_cache.warm(site.PAGES)
+    yield
+    await chatbot.gemini.stop()
+    chatbot.disk_cache.stop()
+
+app = FastAPI(lifespan=lifespan)
+
+# Fingerprinted build output (see build_static.py) is cached by browsers for good
+if BUILD_DIR.exists():
+    app.mount("/static/build", FingerprintedStaticFiles(directory=str(BUILD_DIR)), name="static-build")
 
 # Mount static files using absolute path
 static_dir = APP_DIR / "static"
@@ -25,6 +41,7 @@ else:
 # Include routes
 app.include_router(site.router)
 app.include_router(chatbot.router)
+app.include_router(projects.router)
 
 if __name__ == "__main__":
     import uvicorn
@@ -1,64 +1,49 @@
 from fastapi import APIRouter, HTTPException, Request
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, Response, StreamingResponse
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
-import google.generativeai as genai
+import asyncio
 import os
 import json
+from contextlib import aclosing
 from datetime import datetime
 
-router = APIRouter()
-
-# Load environment variables from .env file
+# Load environment variables from .env file (before the services read their settings)
 from dotenv import load_dotenv
 load_dotenv()
 
-def test_gemini_api(api_key):
-    """Test if the Gemini API key is valid and working"""
-    try:
-        genai.configure(api_key=api_key)
-        # Try to list models to test the API
-        models = genai.list_models()
-        available_models = [model.name for model in models if 'generateContent' in model.supported_generation_methods]
-        print(f"Available models: {available_models}")
-        return True, available_models
-    except Exception as e:
-        print(f"API test failed: {e}")
-        return False, str(e)
-
-# Configure Gemini AI
-api_key = os.getenv("GEMINI_API_KEY")
-if not api_key or api_key == "your-gemini-api-key-here":
-    print("ERROR: GEMINI_API_KEY not found or not configured properly")
-    print("Please set your Gemini API key in environment variables or .env file")
-    print("Get your free API key from: https://makersuite.google.com/app/apikey")
-    # Don't initialize the model if no valid API key
-    model = None
-else:
-    try:
-        # Test the API key first
-        api_working, available_models = test_gemini_api(api_key)
-        if not api_working:
-            print(f"❌ API key test failed: {available_models}")
-            model = None
-        else:
-            # Try to initialize with available models (prioritize working models)
-            model = None
-            for model_name in ['gemini-1.5-flash', 'gemini-1.5-pro', 'gemini-2.0-flash']:
-                try:
-                    model = genai.GenerativeModel(model_name)
-                    print(f"✅ Gemini AI configured successfully with {model_name}")
-                    break
-                except Exception as model_error:
-                    print(f"❌ Failed to initialize {model_name}: {model_error}")
-                    continue
-            
-            if model is None:
-                print("❌ Could not initialize any Gemini model")
-                print(f"Available models: {available_models}")
-    except Exception as e:
-        print(f"ERROR configuring Gemini AI: {e}")
-        model = None
+from services.gemini import WARMING, GeminiModelManager, generate_text, stream_text, upstream_breaker, upstream_scheduler
+from services.session_store import SessionStore
+from services.conversation import ConversationMemory, context_digest, is_follow_up
+from services.response_cache import (
+    JOB_CACHE_MAX_ENTRIES, JOB_CACHE_TTL_SECONDS, ResponseCache, normalize_question, profile_version
+)
+from services.job_description import JobDescriptionPreprocessor, job_fingerprint
+from services.singleflight import SingleFlight
+from services.faq import FaqAnswerer
+from services.skill_matcher import JOB_ANALYSIS_MODE, SkillMatcher, render_job_analysis
+from services.batch_jobs import BATCH_MAX_ITEM_CHARS, BatchManager
+from services.circuit_breaker import CircuitOpen
+from services.rate_limit import ClientRateLimiter, RateLimited
+from services.request_guard import ClientDisconnected, RequestGuard
+from services.persistent_cache import PersistentCache, TieredCache
+from services.idempotency import MAX_KEY_LENGTH, IdempotencyConflict, IdempotencyStore, request_fingerprint
+from services.scheduler import PRIORITY_JOB
+from services.profile_index import (
+    PROFILE_JOB_TOKEN_BUDGET, PROFILE_JOB_TOP_K, PROFILE_RETRIEVAL, PROFILE_TOKEN_BUDGET, PROFILE_TOP_K,
+    ProfileIndex, render_profile_excerpt
+)
+
+router = APIRouter()
+
+# Gemini model, discovered in the background once the app starts (see app/main.py)
+gemini = GeminiModelManager(os.getenv("GEMINI_API_KEY"))
+
+def model_unavailable_message(default):
+    """Explain why the model can't answer: still warming up, or not configured"""
+    if gemini.state == WARMING:
+        return "I am still starting up and connecting to the AI service. Please try again in a few seconds."
+    return default
 
 class ChatMessage(BaseModel):
     message: str
@@ -68,10 +53,22 @@ class JobAnalysis(BaseModel):
     job_description: str
     session_id: Optional[str] = None
 
+class BatchJobAnalysis(BaseModel):
+    job_descriptions: List[str]
+    session_id: Optional[str] = None
+
 class ChatResponse(BaseModel):
     response: str
     session_id: str
     timestamp: str
+    # Set on apologies (not configured, timeout, quota, errors); those are sent but never replayed
+    _failed: bool = False
+
+def failed_response(**fields):
+    """A ChatResponse carrying an error message for the user"""
+    response = ChatResponse(**fields)
+    response._failed = True
+    return response
 
 # Muhammad Farhan's profile data
 FARHAN_PROFILE = """
@@ -172,8 +169,160 @@ LINKS:
 - Telegram: @farhanalise
 """
 
-# Chat session storage (in production, use Redis or database)
-chat_sessions = {}
+# Lexical index over FARHAN_PROFILE sections, built once at startup
+profile_index = ProfileIndex(FARHAN_PROFILE)
+
+def current_profile_index():
+    """The profile index, rebuilt if FARHAN_PROFILE has been edited"""
+    global profile_index
+    if profile_index.profile != FARHAN_PROFILE:
+        profile_index = ProfileIndex(FARHAN_PROFILE)
+    return profile_index
+
+def profile_context(query, top_k=PROFILE_TOP_K, token_budget=PROFILE_TOKEN_BUDGET):
+    """Relevant slice of FARHAN_PROFILE for a prompt (the full profile when retrieval is off)"""
+    if not PROFILE_RETRIEVAL:
+        return FARHAN_PROFILE
+    return current_profile_index().context(query, top_k, token_budget)
+
+def degraded_chat_answer(message):
+    """Answer from the profile alone while the Gemini circuit breaker is open"""
+    sections = current_profile_index().select(message, top_k=1, token_budget=PROFILE_TOKEN_BUDGET)
+    return (
+        "⚠️ The AI assistant is temporarily unavailable, so here is the most relevant part of Muhammad's profile:<br><br>"
+        + render_profile_excerpt(sections)
+        + '<br><br>For anything more specific, please <a href="https://muhammadfarhan.work/contact">contact Muhammad directly</a>.'
+    )
+
+# Chat session storage (bounded in-memory store; in production, use Redis or database)
+session_store = SessionStore()
+
+# Recent turns + rolling summary sent with each chat prompt, within a token budget
+conversation_memory = ConversationMemory(session_store)
+
+def chat_context(chat_message):
+    """Conversation context for a follow-up question ("" for a self-contained one)"""
+    if not is_follow_up(chat_message.message):
+        return ""
+    return conversation_memory.context(chat_message.session_id)
+
+# Answers to repeated questions, keyed on the normalized question text (+ conversation digest for follow-ups)
+response_cache = ResponseCache()
+
+# SQLite tier behind the in-memory answer caches, so cached answers survive redeploys
+disk_cache = PersistentCache()
+chat_answers = TieredCache(response_cache, disk_cache, "chat")
+
+# Identical chat prompts in flight at the same time share one Gemini call
+chat_flights = SingleFlight()
+
+# Local answers for fixed-answer questions (email, CV, LinkedIn, ...)
+faq_answerer = FaqAnswerer(FARHAN_PROFILE)
+
+async def local_chat_answer(message, context=""):
+    """Return (cache_key, answer or None) from the FAQ fast path or the answer caches.
+
+    Follow-ups answered with conversation context are cached per context
+    digest; self-contained questions get no context and share one key.
+    """
+    global faq_answerer
+    if faq_answerer.profile != FARHAN_PROFILE:
+        faq_answerer = FaqAnswerer(FARHAN_PROFILE)
+    cache_key = normalize_question(message)
+    if context:
+        cache_key = f"{cache_key}:{context_digest(context)}"
+    faq_response = faq_answerer.answer(message)
+    if faq_response is not None:
+        return cache_key, faq_response
+    chat_answers.use_version(profile_version(FARHAN_PROFILE))
+    return cache_key, await chat_answers.get(cache_key)
+
+# Job analyses, keyed on a hash of the normalized job description + profile version
+job_analysis_cache = ResponseCache(max_entries=JOB_CACHE_MAX_ENTRIES, ttl=JOB_CACHE_TTL_SECONDS)
+job_analyses = TieredCache(job_analysis_cache, disk_cache, "job")
+job_analysis_flights = SingleFlight()
+
+# Background batch job analyses
+batch_manager = BatchManager()
+
+# Per-session and per-IP token buckets in front of the chat and job endpoints
+rate_limiter = ClientRateLimiter()
+
+TOO_MANY_REQUESTS_MESSAGE = "I am sorry, but I am receiving too many requests right now. Please wait a moment and try again."
+
+def too_many_requests(error):
+    """429 with Retry-After for a request refused by the rate limiter or upstream queue"""
+    return HTTPException(
+        status_code=429,
+        detail=TOO_MANY_REQUESTS_MESSAGE,
+        headers={"Retry-After": str(error.retry_after)}
+    )
+
+# Server-side deadline and client-disconnect handling for the chat and job endpoints
+request_guard = RequestGuard()
+
+# nginx's "client closed request"; nobody is listening for the body any more
+CLIENT_CLOSED_REQUEST = 499
+
+TIMEOUT_MESSAGE = "I am sorry, but the AI service is taking too long to respond right now. Please try again in a moment."
+
+# Responses to Idempotency-Key requests, replayed for retries and double submits
+idempotency_store = IdempotencyStore()
+
+def idempotency_key(request, scope):
+    """The request's Idempotency-Key header scoped to an endpoint, or None"""
+    key = request.headers.get("Idempotency-Key")
+    if key is None:
+        return None
+    key = key.strip()
+    if not key or len(key) > MAX_KEY_LENGTH:
+        raise HTTPException(status_code=400, detail=f"Idempotency-Key must be 1-{MAX_KEY_LENGTH} characters")
+    return f"{scope}:{key}"
+
+def stored_response(key, body):
+    """Response already stored for this key (None without a key or a stored response)"""
+    if key is None:
+        return None
+    try:
+        return idempotency_store.stored(key, request_fingerprint(body.model_dump()))
+    except IdempotencyConflict:
+        raise HTTPException(
+            status_code=422,
+            detail="This Idempotency-Key was already used for a different request"
+        )
+
+def pending_stream(key, body):
+    """The answer future of a stream still running under this key, or None"""
+    if key is None:
+        return None
+    try:
+        return idempotency_store.pending_stream(key, request_fingerprint(body.model_dump()))
+    except IdempotencyConflict:
+        raise HTTPException(
+            status_code=422,
+            detail="This Idempotency-Key was already used for a different request"
+        )
+
+async def idempotent(key, body, fn):
+    """Run fn() once per key: duplicates join the call in flight or get its stored response"""
+    if key is None:
+        return await fn()
+    try:
+        return await idempotency_store.run(
+            key, request_fingerprint(body.model_dump()), fn, keep=lambda response: not response._failed
+        )
+    except IdempotencyConflict:
+        raise HTTPException(
+            status_code=422,
+            detail="This Idempotency-Key was already used for a different request"
+        )
+
+def admit(request, session_id, cost=1):
+    """Reject over-limit clients before any work is done; ``cost`` is the number of analyses requested"""
+    try:
+        rate_limiter.check(request.client.host if request.client else None, session_id, cost)
+    except RateLimited as e:
+        raise too_many_requests(e)
 
 @router.get("/chatbot", response_class=HTMLResponse)
 async def chatbot_page(request: Request):
@@ -695,6 +844,35 @@ async def chatbot_page(request: Request):
 
         <script>
             let sessionId = Date.now().toString();
+            let isSending = false;
+            
+            // Idempotency-Key for one message, so a retried request isn't answered twice
+            function newRequestKey() {
+                if (window.crypto && crypto.randomUUID) {
+                    return crypto.randomUUID();
+                }
+                return `${sessionId}-${Date.now()}-${Math.random().toString(36).slice(2)}`;
+            }
+            
+            // Network failures are retried with the same Idempotency-Key, so the message is answered once
+            async function postWithRetry(url, payload, requestKey, headers = {}) {
+                for (let attempt = 0; ; attempt++) {
+                    try {
+                        return await fetch(url, {
+                            method: 'POST',
+                            headers: {
+                                'Content-Type': 'application/json',
+                                ...headers,
+                                'Idempotency-Key': requestKey
+                            },
+                            body: JSON.stringify(payload)
+                        });
+                    } catch (error) {
+                        if (attempt >= 2) throw error;
+                        await new Promise(resolve => setTimeout(resolve, 1000 * (attempt + 1)));
+                    }
+                }
+            }
             
             // Add debugging
             console.log('🧠 Chatbot page loaded');
@@ -795,8 +973,8 @@ async def chatbot_page(request: Request):
                 const message = chatInput.value.trim();
                 console.log('Message:', message);
                 
-                if (!message) {
-                    console.log('Empty message, returning');
+                if (!message || isSending) {
+                    console.log('Empty message or a message in flight, returning');
                     return;
                 }
                 
@@ -804,6 +982,18 @@ async def chatbot_page(request: Request):
                 chatInput.value = '';
                 chatInput.style.height = 'auto';
                 
+                // One message at a time: a double-pressed Enter or click can't send it twice
+                isSending = true;
+                sendButton.disabled = true;
+                try {
+                    await answerMessage(message, newRequestKey());
+                } finally {
+                    isSending = false;
+                    sendButton.disabled = false;
+                }
+            }
+            
+            async function answerMessage(message, requestKey) {
                 showTyping();
                 
                 // Check if this looks like a job description
@@ -814,26 +1004,17 @@ async def chatbot_page(request: Request):
                                        message.toLowerCase().includes('responsibilities') ||
                                        message.length > 200; // Long text likely job description
                 
+                if (!isJobDescription) {
+                    await streamChat(message, requestKey);
+                    return;
+                }
+                
                 try {
                     console.log('🧠 Sending request to API...');
-                    const endpoint = isJobDescription ? '/api/chatbot/analyze-job' : '/api/chatbot/chat';
-                    const body = isJobDescription ? 
-                        JSON.stringify({
-                            job_description: message,
-                            session_id: sessionId
-                        }) :
-                        JSON.stringify({
-                            message: message,
-                            session_id: sessionId
-                        });
-                    
-                    const response = await fetch(endpoint, {
-                        method: 'POST',
-                        headers: {
-                            'Content-Type': 'application/json',
-                        },
-                        body: body
-                    });
+                    const response = await postWithRetry('/api/chatbot/analyze-job', {
+                        job_description: message,
+                        session_id: sessionId
+                    }, requestKey);
                     
                     console.log('🧠 Response received:', response.status);
                     const data = await response.json();
@@ -842,6 +1023,8 @@ async def chatbot_page(request: Request):
                     
                     if (response.ok) {
                         addMessage(data.response);
+                    } else if (response.status === 429) {
+                        addMessage(data.detail);
                     } else {
                         addMessage('Sorry, I encountered an error. Please try again.');
                     }
@@ -852,30 +1035,123 @@ async def chatbot_page(request: Request):
                 }
             }
             
+            function parseSseFrame(frame) {
+                let event = 'message';
+                const dataLines = [];
+                
+                frame.split('\\n').forEach(line => {
+                    if (line.startsWith('event:')) {
+                        event = line.slice(6).trim();
+                    } else if (line.startsWith('data:')) {
+                        dataLines.push(line.slice(5).trim());
+                    }
+                });
+                
+                if (!dataLines.length) return null;
+                
+                try {
+                    return { event: event, data: JSON.parse(dataLines.join('\\n')) };
+                } catch (error) {
+                    return null;
+                }
+            }
+            
+            async function streamChat(message, requestKey) {
+                // Render the answer token by token from the SSE endpoint
+                let messageDiv = null;
+                let text = '';
+                
+                function render(content) {
+                    if (!messageDiv) {
+                        hideTyping();
+                        addMessage(content);
+                        messageDiv = chatMessages.lastElementChild;
+                    } else {
+                        messageDiv.innerHTML = content;
+                    }
+                    chatMessages.scrollTop = chatMessages.scrollHeight;
+                }
+                
+                try {
+                    console.log('🧠 Streaming request to API...');
+                    const response = await postWithRetry('/api/chatbot/chat/stream', {
+                        message: message,
+                        session_id: sessionId
+                    }, requestKey, { 'Accept': 'text/event-stream' });
+                    
+                    console.log('🧠 Stream opened:', response.status);
+                    if (response.status === 429) {
+                        const data = await response.json();
+                        hideTyping();
+                        addMessage(data.detail);
+                        return;
+                    }
+                    
+                    if (!response.ok || !response.body) {
+                        hideTyping();
+                        addMessage('Sorry, I encountered an error. Please try again.');
+                        return;
+                    }
+                    
+                    const reader = response.body.getReader();
+                    const decoder = new TextDecoder();
+                    let buffer = '';
+                    
+                    while (true) {
+                        const { value, done } = await reader.read();
+                        if (done) break;
+                        buffer += decoder.decode(value, { stream: true });
+                        
+                        const frames = buffer.split('\\n\\n');
+                        buffer = frames.pop();
+                        
+                        for (const frame of frames) {
+                            const event = parseSseFrame(frame);
+                            if (!event) continue;
+                            
+                            if (event.event === 'token') {
+                                text += event.data.text;
+                                render(text);
+                            } else {
+                                // 'done' carries the full answer, 'error' a user-facing message
+                                render(event.data.response);
+                            }
+                        }
+                    }
+                    
+                    if (!messageDiv) {
+                        hideTyping();
+                        addMessage('Sorry, I encountered an error. Please try again.');
+                    }
+                } catch (error) {
+                    console.error('🧠 Error in streamChat:', error);
+                    hideTyping();
+                    if (messageDiv) {
+                        messageDiv.innerHTML = text + '<br><br>Sorry, the connection was interrupted. Please try again.';
+                    } else {
+                        addMessage('Sorry, I am having trouble connecting. Please try again.');
+                    }
+                }
+            }
+            
 
         </script>
     </body>
     </html>
     """
 
-@router.post("/api/chatbot/chat")
-async def chat_with_bot(chat_message: ChatMessage):
-    """Handle chat messages with FarhanBot"""
-    try:
-        # Check if model is properly configured
-        if model is None:
-            return ChatResponse(
-                response="I am sorry, but the AI assistant is not properly configured. The Gemini API key is either missing, invalid, or the API is not accessible. Please contact the administrator to set up a valid API key. You can still learn about Muhammad Farhan by exploring the website sections.",
-                session_id=chat_message.session_id or "default",
-                timestamp=datetime.now().isoformat()
-            )
-        
-        # Create system prompt for the bot
-        system_prompt = f"""
+def build_chat_prompt(message, context=""):
+    """Create the system prompt for a chat question, with the conversation so far if any"""
+    if context:
+        context = f"""
+Conversation so far (use it to understand follow-up questions):
+{context}
+"""
+    return f"""
 You are Farhan's AI Assistant, an AI assistant for Muhammad Farhan's portfolio website. You are helpful, professional, and recruiter-friendly.
 
 Use this profile information to answer questions:
-{FARHAN_PROFILE}
+{profile_context(message)}
 
 Instructions:
 - Be professional but conversational and friendly
@@ -903,16 +1179,70 @@ Format your responses with:
 - Do not repeat the same link multiple times in the same response
 
 Tone: Helpful, concise, recruiter-friendly, and professional.
-
-Answer the user's question: {chat_message.message}
+{context}
+Answer the user's question: {message}
 """
 
+async def generate_chat_answer(cache_key, system_prompt):
+    """Call Gemini for a chat prompt and cache a non-empty answer"""
+    response_text = await generate_text(gemini.model, system_prompt)
+    if response_text:
+        chat_answers.set(cache_key, response_text)
+    return response_text
+
+@router.post("/api/chatbot/chat")
+async def chat_with_bot(chat_message: ChatMessage, request: Request):
+    """Handle chat messages with FarhanBot"""
+    key = idempotency_key(request, "chat")
+    replay = stored_response(key, chat_message)
+    if replay is not None:
+        return replay
+    admit(request, chat_message.session_id)
+    try:
+        return await request_guard.run(
+            request, idempotent(key, chat_message, lambda: chat_response(chat_message))
+        )
+    except ClientDisconnected:
+        return Response(status_code=CLIENT_CLOSED_REQUEST)
+    except asyncio.TimeoutError:
+        return ChatResponse(
+            response=TIMEOUT_MESSAGE,
+            session_id=chat_message.session_id or "default",
+            timestamp=datetime.now().isoformat()
+        )
+
+async def chat_response(chat_message):
+    """Answer one chat message and record it in the session"""
+    try:
+        context = chat_context(chat_message)
+
+        # FAQs and repeat questions are answered locally without calling Gemini
+        cache_key, cached_response = await local_chat_answer(chat_message.message, context)
+        
+        # Check if model is properly configured
+        if gemini.model is None and cached_response is None:
+            return failed_response(
+                response=model_unavailable_message(
+                    "I am sorry, but the AI assistant is not properly configured. The Gemini API key is either missing, invalid, or the API is not accessible. Please contact the administrator to set up a valid API key. You can still learn about Muhammad Farhan by exploring the website sections."
+                ),
+                session_id=chat_message.session_id or "default",
+                timestamp=datetime.now().isoformat()
+            )
+        
+        system_prompt = build_chat_prompt(chat_message.message, context)
+
         # Generate response using Gemini
         try:
-            response = model.generate_content(system_prompt)
+            response_text = cached_response
+            if response_text is None:
+                try:
+                    response_text = await chat_flights.do(system_prompt, lambda: generate_chat_answer(cache_key, system_prompt))
+                except CircuitOpen:
+                    # Gemini is failing; answer from local profile data without calling it
+                    response_text = degraded_chat_answer(chat_message.message)
             
-            if not response.text:
-                return ChatResponse(
+            if not response_text:
+                return failed_response(
                     response="I am sorry, but I received an empty response from the AI service. Please try again later.",
                     session_id=chat_message.session_id or "default",
                     timestamp=datetime.now().isoformat()
@@ -920,69 +1250,203 @@ Answer the user's question: {chat_message.message}
             
             # Store session for memory (simple implementation)
             if chat_message.session_id:
-                if chat_message.session_id not in chat_sessions:
-                    chat_sessions[chat_message.session_id] = []
-                chat_sessions[chat_message.session_id].append({
-                    "user": chat_message.message,
-                    "bot": response.text,
-                    "timestamp": datetime.now().isoformat()
-                })
+                session_store.append(
+                    chat_message.session_id,
+                    user=chat_message.message,
+                    bot=response_text
+                )
             
             return ChatResponse(
-                response=response.text,
+                response=response_text,
                 session_id=chat_message.session_id or "default",
                 timestamp=datetime.now().isoformat()
             )
             
+        except RateLimited as e:
+            raise too_many_requests(e)
+        except asyncio.TimeoutError:
+            return failed_response(
+                response=TIMEOUT_MESSAGE,
+                session_id=chat_message.session_id or "default",
+                timestamp=datetime.now().isoformat()
+            )
         except Exception as api_error:
             error_msg = str(api_error)
             if "quota" in error_msg.lower() or "429" in error_msg:
-                return ChatResponse(
+                return failed_response(
                     response="I am sorry, but I have reached the daily limit for AI responses. Please try again tomorrow or contact Muhammad directly for immediate assistance.",
                     session_id=chat_message.session_id or "default",
                     timestamp=datetime.now().isoformat()
                 )
             elif "rate" in error_msg.lower():
-                return ChatResponse(
-                    response="I am sorry, but I am receiving too many requests right now. Please wait a moment and try again.",
+                return failed_response(
+                    response=TOO_MANY_REQUESTS_MESSAGE,
                     session_id=chat_message.session_id or "default",
                     timestamp=datetime.now().isoformat()
                 )
             else:
-                return ChatResponse(
+                return failed_response(
                     response="I am sorry, but I encountered an error while processing your request. Please try again later or contact the administrator.",
                     session_id=chat_message.session_id or "default",
                     timestamp=datetime.now().isoformat()
                 )
         
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error in chat endpoint: {e}")
-        return ChatResponse(
+        return failed_response(
             response="I am sorry, but I encountered an error while processing your request. Please try again later or contact the administrator.",
             session_id=chat_message.session_id or "default",
             timestamp=datetime.now().isoformat()
         )
 
-@router.post("/api/chatbot/analyze-job")
-async def analyze_job_match(job_analysis: JobAnalysis):
-    """Analyze job description against Muhammad Farhan's profile"""
-    try:
-        # Check if model is properly configured
-        if model is None:
-            return ChatResponse(
-                response="I am sorry, but the AI assistant is not properly configured for job analysis. The Gemini API key is either missing, invalid, or the API is not accessible. Please contact the administrator to set up a valid API key. You can still learn about Muhammad Farhan's skills and experience by exploring the website sections.",
-                session_id=job_analysis.session_id or "default",
-                timestamp=datetime.now().isoformat()
+def sse_event(event, data):
+    """Format one Server-Sent Events frame"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+async def replay_stream(response):
+    """Replay a stored chat answer as a single-token SSE stream"""
+    yield sse_event("token", {"text": response.response})
+    yield sse_event("done", response.model_dump())
+
+@router.post("/api/chatbot/chat/stream")
+async def chat_with_bot_stream(chat_message: ChatMessage, request: Request):
+    """Stream FarhanBot's answer to the browser as Server-Sent Events"""
+    key = idempotency_key(request, "chat")
+    replay = stored_response(key, chat_message)
+    if replay is not None:
+        return StreamingResponse(
+            replay_stream(replay),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+    in_flight = pending_stream(key, chat_message)
+    if in_flight is None:
+        admit(request, chat_message.session_id)
+    session_id = chat_message.session_id or "default"
+    outcome = {}
+    # Registered before the body starts, so a duplicate arriving meanwhile joins this stream
+    future = None
+    if key is not None and in_flight is None:
+        future = idempotency_store.begin_stream(key, request_fingerprint(chat_message.model_dump()))
+
+    async def event_stream():
+        if in_flight is not None:
+            # Same key as a stream still running: wait (up to the request deadline) for its answer and replay it
+            try:
+                response = await asyncio.wait_for(asyncio.shield(in_flight), request_guard.deadline)
+            except asyncio.TimeoutError:
+                response = None
+            if response is not None:
+                async for frame in replay_stream(response):
+                    yield frame
+                return
+        try:
+            async with aclosing(answer_stream()) as frames:
+                async for frame in frames:
+                    yield frame
+        finally:
+            if future is not None:
+                idempotency_store.finish_stream(key, future, outcome.get("done"))
+
+    async def answer_stream():
+        context = chat_context(chat_message)
+        cache_key, cached_response = await local_chat_answer(chat_message.message, context)
+        if gemini.model is None and cached_response is None:
+            yield sse_event("error", {
+                "response": model_unavailable_message(
+                    "I am sorry, but the AI assistant is not properly configured. The Gemini API key is either missing, invalid, or the API is not accessible. Please contact the administrator to set up a valid API key. You can still learn about Muhammad Farhan by exploring the website sections."
+                ),
+                "session_id": session_id,
+                "timestamp": datetime.now().isoformat()
+            })
+            return
+
+        parts = []
+        error_response = None
+        try:
+            if cached_response is not None:
+                parts.append(cached_response)
+                yield sse_event("token", {"text": cached_response})
+            else:
+                try:
+                    # Overall request deadline on top of stream_text's per-chunk timeout
+                    chunks = request_guard.stream(stream_text(gemini.model, build_chat_prompt(chat_message.message, context)))
+                    async with aclosing(chunks):
+                        async for text in chunks:
+                            parts.append(text)
+                            yield sse_event("token", {"text": text})
+                except CircuitOpen:
+                    # Gemini is failing; answer from local profile data (and don't cache it)
+                    cached_response = degraded_chat_answer(chat_message.message)
+                    parts.append(cached_response)
+                    yield sse_event("token", {"text": cached_response})
+        except (asyncio.CancelledError, GeneratorExit):
+            # Client went away: the Gemini stream is closed with us and nothing is stored
+            request_guard.record_cancelled()
+            raise
+        except RateLimited:
+            error_response = TOO_MANY_REQUESTS_MESSAGE
+        except asyncio.TimeoutError:
+            error_response = TIMEOUT_MESSAGE
+        except Exception as api_error:
+            print(f"Error in chat stream endpoint: {api_error}")
+            error_msg = str(api_error)
+            if "quota" in error_msg.lower() or "429" in error_msg:
+                error_response = "I am sorry, but I have reached the daily limit for AI responses. Please try again tomorrow or contact Muhammad directly for immediate assistance."
+            elif "rate" in error_msg.lower():
+                error_response = TOO_MANY_REQUESTS_MESSAGE
+            else:
+                error_response = "I am sorry, but I encountered an error while processing your request. Please try again later or contact the administrator."
+
+        response_text = "".join(parts)
+        if error_response is None and not response_text:
+            error_response = "I am sorry, but I received an empty response from the AI service. Please try again later."
+
+        if error_response is None and cached_response is None:
+            chat_answers.set(cache_key, response_text)
+
+        if error_response is not None:
+            yield sse_event("error", {
+                "response": error_response,
+                "session_id": session_id,
+                "timestamp": datetime.now().isoformat()
+            })
+            return
+
+        # Store session for memory (simple implementation)
+        if chat_message.session_id:
+            session_store.append(
+                chat_message.session_id,
+                user=chat_message.message,
+                bot=response_text
             )
-        
-        analysis_prompt = f"""
+
+        done = ChatResponse(
+            response=response_text,
+            session_id=session_id,
+            timestamp=datetime.now().isoformat()
+        )
+        outcome["done"] = done
+        yield sse_event("done", done.model_dump())
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def build_job_analysis_prompt(job_description):
+    """Create the structured analysis prompt for a job description"""
+    return f"""
 You are Farhan's AI Assistant, analyzing a job description against Muhammad Farhan's profile.
 
 Muhammad Farhan's Profile:
-{FARHAN_PROFILE}
+{profile_context(job_description, PROFILE_JOB_TOP_K, PROFILE_JOB_TOKEN_BUDGET)}
 
 Job Description:
-{job_analysis.job_description}
+{job_description}
 
 Please provide a structured analysis with the following format:
 
@@ -1020,65 +1484,341 @@ Format your response with:
 Be honest but positive in your assessment. Focus on Muhammad's strengths while acknowledging areas for growth.
 """
 
-        # Generate analysis using Gemini
+def build_job_narrative_prompt(job_description, analysis):
+    """Ask Gemini only for the narrative sections of a locally scored analysis"""
+    transferable = [f"{skill} (via {', '.join(related[:3])})" for skill, related in analysis["transferable"]]
+    score = f"{analysis['score']}/10" if analysis["score"] is not None else "not scored"
+    return f"""
+You are Farhan's AI Assistant, writing the closing part of a job match analysis for Muhammad Farhan.
+
+Muhammad Farhan's Profile:
+{profile_context(job_description, PROFILE_JOB_TOP_K, PROFILE_JOB_TOKEN_BUDGET)}
+
+Job Description:
+{job_description}
+
+The skill comparison has already been computed and will be shown above your text:
+- Matching skills: {', '.join(analysis['matching']) or 'none'}
+- Transferable skills: {', '.join(transferable) or 'none'}
+- Skill gaps: {', '.join(analysis['gaps']) or 'none'}
+- Nice-to-have skills (not scored): {', '.join(analysis.get('preferred', [])) or 'none'}
+- Overall match score: {score}
+
+Write only these two sections. Do not repeat the skill lists and do not change the score:
+
+**5. Why Muhammad Would Be a Good Fit:**
+[2-3 sentences explaining why he would be valuable for this role]
+
+**Recommendation:**
+[Brief recommendation on whether to apply and any suggestions]
+
+Format your response with:
+- Use <br><br> between the two sections and <br> for single line breaks
+- Use <strong>text</strong> for the section headings and important points
+- Professional but engaging tone
+- For links, use <a href="URL">Link Text</a> format only once per link
+
+Be honest but positive in your assessment.
+"""
+
+def build_job_requirements_prompt(chunk, part, parts):
+    """Map step for long job descriptions: pull the requirements out of one chunk"""
+    return f"""
+You are extracting the requirements from part {part} of {parts} of a long job description.
+
+Job Description (part {part} of {parts}):
+{chunk}
+
+List only what this part says about the role itself: required and preferred skills, technologies, years of experience, responsibilities and seniority.
+Use short plain-text bullet points starting with "- ". If this part contains none of these, reply with "- (nothing relevant)".
+"""
+
+# Boilerplate stripping and chunking for long pasted job descriptions
+job_preprocessor = JobDescriptionPreprocessor()
+
+async def condense_job_description(job_description):
+    """Job description text for a prompt: cleaned, then map-reduced into requirement notes if still too long"""
+    cleaned = job_preprocessor.clean(job_description) or job_description
+    if not job_preprocessor.needs_chunking(cleaned):
+        return cleaned
+
+    chunks = job_preprocessor.chunk(cleaned)
+    tasks = [
+        asyncio.ensure_future(generate_text(
+            gemini.model, build_job_requirements_prompt(chunk, part, len(chunks)), priority=PRIORITY_JOB
+        ))
+        for part, chunk in enumerate(chunks, 1)
+    ]
+    try:
+        notes = await asyncio.gather(*tasks)
+    finally:
+        # One failed chunk fails the analysis; don't leave the others running
+        for task in tasks:
+            task.cancel()
+    # Reduce: merge the per-chunk notes, dropping repeats and empty parts
+    merged = []
+    for note in notes:
+        for line in (note or "").splitlines():
+            line = line.strip()
+            if line and line not in merged and "(nothing relevant)" not in line:
+                merged.append(line)
+    return "Key requirements (condensed from a long job description):\n" + "\n".join(merged)
+
+# Deterministic skill matching for job analyses, derived from FARHAN_PROFILE
+skill_matcher = SkillMatcher(FARHAN_PROFILE)
+
+def local_job_analysis(job_description):
+    """Matching, transferable and gap skills plus a score, computed locally"""
+    global skill_matcher
+    if skill_matcher.profile != FARHAN_PROFILE:
+        skill_matcher = SkillMatcher(FARHAN_PROFILE)
+    return skill_matcher.analyze(job_description)
+
+def job_analysis_fallback(job_description):
+    """Local-only analysis used when Gemini is slow or failing (None in "llm" mode)"""
+    if JOB_ANALYSIS_MODE == "llm":
+        return None
+    return render_job_analysis(local_job_analysis(job_description))
+
+async def generate_job_analysis(job_description):
+    """Produce the analysis text according to JOB_ANALYSIS_MODE"""
+    if JOB_ANALYSIS_MODE == "local":
+        return render_job_analysis(local_job_analysis(job_description))
+    if gemini.model is None:
+        raise RuntimeError("Gemini model is not configured")
+    prompt_description = await condense_job_description(job_description)
+    if JOB_ANALYSIS_MODE == "llm":
+        return await generate_text(gemini.model, build_job_analysis_prompt(prompt_description), priority=PRIORITY_JOB)
+    analysis = local_job_analysis(job_description)
+    narrative = await generate_text(
+        gemini.model, build_job_narrative_prompt(prompt_description, analysis), priority=PRIORITY_JOB
+    )
+    return render_job_analysis(analysis, narrative) if narrative else ""
+
+async def run_job_analysis(job_description):
+    """Analyze a job description through the cache; identical submissions share one call"""
+    version = f"{profile_version(FARHAN_PROFILE)}:{JOB_ANALYSIS_MODE}"
+    job_analyses.use_version(version)
+    cache_key = job_fingerprint(job_description, version)
+    cached_response = await job_analyses.get(cache_key)
+    if cached_response is not None:
+        return cached_response
+
+    async def compute():
+        text = await generate_job_analysis(job_description)
+        if text:
+            job_analyses.set(cache_key, text)
+        return text
+
+    return await job_analysis_flights.do(cache_key, compute)
+
+async def job_analysis_response(job_analysis, retry_rate_limited=False):
+    """Analyze one job description and build its ChatResponse (shared by single and batch endpoints).
+
+    With retry_rate_limited, RateLimited is raised instead of answered, so a batch item can wait and retry.
+    """
+    session_id = job_analysis.session_id or "default"
+
+    def respond(text):
+        # Store session for memory
+        if job_analysis.session_id:
+            session_store.append(
+                job_analysis.session_id,
+                user=f"Job Analysis Request: {job_analysis.job_description[:100]}...",
+                bot=text
+            )
+        return ChatResponse(
+            response=text,
+            session_id=session_id,
+            timestamp=datetime.now().isoformat()
+        )
+
+    try:
+        # Check if model is properly configured (only the "llm" mode cannot work without it)
+        if gemini.model is None and JOB_ANALYSIS_MODE == "llm":
+            return failed_response(
+                response=model_unavailable_message(
+                    "I am sorry, but the AI assistant is not properly configured for job analysis. The Gemini API key is either missing, invalid, or the API is not accessible. Please contact the administrator to set up a valid API key. You can still learn about Muhammad Farhan's skills and experience by exploring the website sections."
+                ),
+                session_id=session_id,
+                timestamp=datetime.now().isoformat()
+            )
+        
+        # Generate analysis; falls back to the local analysis if Gemini is slow or failing
         try:
-            response = model.generate_content(analysis_prompt)
+            response_text = await run_job_analysis(job_analysis.job_description)
             
-            if not response.text:
-                return ChatResponse(
+            if not response_text:
+                fallback = job_analysis_fallback(job_analysis.job_description)
+                if fallback:
+                    return respond(fallback)
+                return failed_response(
                     response="I am sorry, but I received an empty response while analyzing the job description. Please try again later.",
-                    session_id=job_analysis.session_id or "default",
+                    session_id=session_id,
                     timestamp=datetime.now().isoformat()
                 )
             
-            # Store session for memory
-            if job_analysis.session_id:
-                if job_analysis.session_id not in chat_sessions:
-                    chat_sessions[job_analysis.session_id] = []
-                chat_sessions[job_analysis.session_id].append({
-                    "user": f"Job Analysis Request: {job_analysis.job_description[:100]}...",
-                    "bot": response.text,
-                    "timestamp": datetime.now().isoformat()
-                })
-            
-            return ChatResponse(
-                response=response.text,
-                session_id=job_analysis.session_id or "default",
+            return respond(response_text)
+            
+        except RateLimited as e:
+            if retry_rate_limited:
+                raise
+            fallback = job_analysis_fallback(job_analysis.job_description)
+            if fallback:
+                return respond(fallback)
+            raise too_many_requests(e)
+        except asyncio.TimeoutError:
+            fallback = job_analysis_fallback(job_analysis.job_description)
+            if fallback:
+                return respond(fallback)
+            return failed_response(
+                response=TIMEOUT_MESSAGE,
+                session_id=session_id,
                 timestamp=datetime.now().isoformat()
             )
-            
         except Exception as api_error:
+            fallback = job_analysis_fallback(job_analysis.job_description)
+            if fallback:
+                return respond(fallback)
             error_msg = str(api_error)
             if "quota" in error_msg.lower() or "429" in error_msg:
-                return ChatResponse(
+                return failed_response(
                     response="I am sorry, but I have reached the daily limit for AI responses. Please try again tomorrow or contact Muhammad directly for immediate assistance.",
-                    session_id=job_analysis.session_id or "default",
+                    session_id=session_id,
                     timestamp=datetime.now().isoformat()
                 )
             elif "rate" in error_msg.lower():
-                return ChatResponse(
-                    response="I am sorry, but I am receiving too many requests right now. Please wait a moment and try again.",
-                    session_id=job_analysis.session_id or "default",
+                return failed_response(
+                    response=TOO_MANY_REQUESTS_MESSAGE,
+                    session_id=session_id,
                     timestamp=datetime.now().isoformat()
                 )
             else:
-                return ChatResponse(
+                return failed_response(
                     response="I am sorry, but I encountered an error while analyzing the job description. Please try again later or contact the administrator.",
-                    session_id=job_analysis.session_id or "default",
+                    session_id=session_id,
                     timestamp=datetime.now().isoformat()
                 )
         
+    except (HTTPException, RateLimited):
+        raise
     except Exception as e:
         print(f"Error in job analysis endpoint: {e}")
-        return ChatResponse(
+        return failed_response(
             response="I am sorry, but I encountered an error while analyzing the job description. Please try again later or contact the administrator.",
+            session_id=session_id,
+            timestamp=datetime.now().isoformat()
+        )
+
+@router.post("/api/chatbot/analyze-job")
+async def analyze_job_match(job_analysis: JobAnalysis, request: Request):
+    """Analyze job description against Muhammad Farhan's profile"""
+    key = idempotency_key(request, "analyze-job")
+    replay = stored_response(key, job_analysis)
+    if replay is not None:
+        return replay
+    admit(request, job_analysis.session_id)
+    try:
+        return await request_guard.run(
+            request, idempotent(key, job_analysis, lambda: job_analysis_response(job_analysis))
+        )
+    except ClientDisconnected:
+        return Response(status_code=CLIENT_CLOSED_REQUEST)
+    except asyncio.TimeoutError:
+        # Past the deadline: the local analysis if there is one, but no session write
+        return ChatResponse(
+            response=job_analysis_fallback(job_analysis.job_description) or TIMEOUT_MESSAGE,
             session_id=job_analysis.session_id or "default",
             timestamp=datetime.now().isoformat()
         )
 
+@router.post("/api/chatbot/analyze-job/batch", status_code=202)
+async def submit_job_batch(batch: BatchJobAnalysis, request: Request):
+    """Queue several job descriptions for analysis and return a job id to poll or stream"""
+    if not batch.job_descriptions:
+        raise HTTPException(status_code=422, detail="job_descriptions must not be empty")
+    if len(batch.job_descriptions) > batch_manager.max_items:
+        raise HTTPException(
+            status_code=413,
+            detail=f"A batch may contain at most {batch_manager.max_items} job descriptions"
+        )
+    if any(len(job_description) > BATCH_MAX_ITEM_CHARS for job_description in batch.job_descriptions):
+        raise HTTPException(
+            status_code=413,
+            detail=f"Each job description may be at most {BATCH_MAX_ITEM_CHARS} characters"
+        )
+    # Each description is its own analysis (and Gemini calls), so each one costs a token
+    admit(request, batch.session_id, cost=len(batch.job_descriptions))
+
+    async def analyze(job_description, can_retry):
+        response = await job_analysis_response(
+            JobAnalysis(job_description=job_description, session_id=batch.session_id),
+            retry_rate_limited=can_retry
+        )
+        return response.model_dump()
+
+    job = batch_manager.submit(batch.job_descriptions, analyze)
+    if job is None:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many batches are running right now. Please try again shortly.",
+            headers={"Retry-After": "30"}
+        )
+    return job.status(include_results=False)
+
+@router.get("/api/chatbot/analyze-job/batch/{job_id}")
+async def get_job_batch(job_id: str, include_results: bool = True):
+    """Batch status, with per-item results as they complete"""
+    job = batch_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Batch not found or expired")
+    return job.status(include_results=include_results)
+
+@router.get("/api/chatbot/analyze-job/batch/{job_id}/stream")
+async def stream_job_batch(job_id: str):
+    """Stream per-item batch results as Server-Sent Events as they finish"""
+    job = batch_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Batch not found or expired")
+
+    async def event_stream():
+        async for item in job.updates():
+            yield sse_event("item", item)
+        yield sse_event("done", job.status(include_results=False))
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.get("/api/chatbot/session/{session_id}")
 async def get_chat_session(session_id: str):
     """Get chat session history"""
-    if session_id in chat_sessions:
-        return {"session": chat_sessions[session_id]}
-    return {"session": []} 
\ No newline at end of file
+    return {"session": session_store.get(session_id)}
+
+@router.get("/api/chatbot/health")
+async def chatbot_health():
+    """Readiness of the AI assistant: model warm-up state and circuit breaker state"""
+    return {"status": "ok", "model": gemini.status(), "circuit": upstream_breaker.status()}
+
+@router.get("/api/chatbot/stats")
+async def get_chatbot_stats():
+    """Chatbot cache, session and upstream counters"""
+    return {
+        "sessions": session_store.stats(),
+        "faq": faq_answerer.stats(),
+        "conversation": conversation_memory.stats(),
+        "chat_cache": response_cache.stats(),
+        "chat_coalescing": chat_flights.stats(),
+        "job_cache": job_analysis_cache.stats(),
+        "disk_cache": disk_cache.stats(),
+        "job_preprocessing": job_preprocessor.stats(),
+        "job_coalescing": job_analysis_flights.stats(),
+        "job_batches": batch_manager.stats(),
+        "rate_limits": rate_limiter.stats(),
+        "requests": request_guard.stats(),
+        "idempotency": idempotency_store.stats(),
+        "upstream": upstream_scheduler.stats(),
+        "routing": gemini.routing_stats()
+    }
@@ -0,0 +1,57 @@
+# app/routers/projects.py
+import json
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query, Request
+from services.page_cache import RenderedPage, respond
+from services.project_catalogue import MAX_PROJECTS_PER_PAGE, PROJECTS_PER_PAGE, ProjectCatalogue, tech_key
+from services.response_cache import ResponseCache
+
+router = APIRouter()
+
+# Loaded once at startup; sections/projects.html renders the first page of the grid from it too
+project_catalogue = ProjectCatalogue()
+
+# Serialised, compressed API responses; the catalogue doesn't change while the app runs
+catalogue_responses = ResponseCache(max_entries=256, ttl=86400)
+catalogue_responses.use_version(project_catalogue.version)
+
+def json_response(request, key, build):
+    """Cached JSON body for key (built on a miss), with ETag / 304 handling"""
+    page = catalogue_responses.get(key)
+    if page is None:
+        page = RenderedPage(json.dumps(build(), ensure_ascii=False, separators=(",", ":")))
+        catalogue_responses.set(key, page)
+    return respond(request, page, media_type="application/json")
+
+@router.get("/api/projects")
+async def list_projects(
+    request: Request,
+    category: Optional[str] = Query(None, max_length=40),
+    tech: Optional[str] = Query(None, max_length=60),
+    page: int = Query(1, ge=1),
+    per_page: int = Query(PROJECTS_PER_PAGE, ge=1, le=MAX_PROJECTS_PER_PAGE),
+):
+    """Project cards filtered by category and/or technology, one page at a time"""
+    if not project_catalogue.indexed(category, tech):
+        # Unknown filters match nothing; answer without caching so made-up values can't churn the cache
+        return project_catalogue.query(category, tech, 1, per_page)
+    # Pages past the end show the last page, so the cache only ever holds real pages
+    page = min(page, project_catalogue.page_count(category, tech, per_page))
+    key = ("list", category or "all", tech_key(tech or ""), page, per_page)
+    return json_response(request, key, lambda: project_catalogue.query(category, tech, page, per_page))
+
+@router.get("/api/projects/filters")
+async def project_filters(request: Request):
+    """Categories and technologies with their project counts"""
+    return json_response(request, ("filters",), lambda: {
+        "categories": project_catalogue.categories,
+        "technologies": project_catalogue.technologies(),
+    })
+
+@router.get("/api/projects/{project_id}")
+async def project_detail(request: Request, project_id: str):
+    """Everything the detail modal shows for one project"""
+    project = project_catalogue.get(project_id)
+    if project is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return json_response(request, ("detail", project_id), lambda: project)
@@ -1,8 +1,15 @@
 # app/routers/site.py
+import asyncio
 from pathlib import Path
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, HTTPException, Query, Request
 from fastapi.responses import HTMLResponse, FileResponse
 from fastapi.templating import Jinja2Templates
+from routers.projects import project_catalogue
+from services.bundles import PageAssets
+from services.images import FORMATS, IMAGE_MAX_WIDTH, ImageManifest, ImageResizer, available_formats
+from services.page_cache import PageCache
+from services.singleflight import SingleFlight
+from services.static_assets import AssetManifest
 
 router = APIRouter()
 
@@ -10,30 +17,57 @@ router = APIRouter()
 APP_DIR = Path(__file__).parent.parent.absolute()
 templates = Jinja2Templates(directory=str(APP_DIR / "templates"))
 
+# {{ static_url('css/projects.css') }} -> fingerprinted URL from the static build
+asset_manifest = AssetManifest()
+templates.env.globals["static_url"] = asset_manifest.url
+
+# {{ page_styles(page) }} / {{ page_scripts(page) }} -> the page's bundles, with critical CSS inlined
+page_assets = PageAssets(asset_manifest)
+templates.env.globals["page_styles"] = page_assets.styles
+templates.env.globals["page_scripts"] = page_assets.scripts
+
+# {{ image_sources('images/x.jpg', sizes) }} -> <source> tags for a <picture>, from the image build
+image_manifest = ImageManifest()
+templates.env.globals["image_sources"] = image_manifest.sources
+templates.env.globals["image_srcsets_json"] = image_manifest.srcsets_json
+
+# {{ project_catalogue.query() }} -> the first page of the projects grid, rendered server-side
+templates.env.globals["project_catalogue"] = project_catalogue
+
+# Resized images for widths the build didn't produce; identical requests share one resize
+image_resizer = ImageResizer()
+resize_flights = SingleFlight()
+RESIZED_CACHE_CONTROL = "public, max-age=86400"
+
+# The site pages don't depend on the request, so they're rendered once and served as bytes
+page_cache = PageCache(templates)
+
+PAGES = ["index.html", "pages/about.html", "pages/tech-stack.html", "pages/projects.html", "pages/contact.html"]
+
 @router.get("/", response_class=HTMLResponse)
 async def read_home(request: Request):
     """Main portfolio page with all sections"""
-    return templates.TemplateResponse("index.html", {"request": request})
+    return page_cache.respond(request, "index.html")
 
 @router.get("/about", response_class=HTMLResponse)
 async def read_about(request: Request):
     """About page"""
-    return templates.TemplateResponse("pages/about.html", {"request": request})
+    return page_cache.respond(request, "pages/about.html")
 
 @router.get("/tech-stack", response_class=HTMLResponse)
 async def read_tech_stack(request: Request):
     """Tech stack page"""
-    return templates.TemplateResponse("pages/tech-stack.html", {"request": request})
+    return page_cache.respond(request, "pages/tech-stack.html")
 
 @router.get("/projects", response_class=HTMLResponse)
 async def read_projects(request: Request):
     """Projects page"""
-    return templates.TemplateResponse("pages/projects.html", {"request": request})
+    return page_cache.respond(request, "pages/projects.html")
 
 @router.get("/contact", response_class=HTMLResponse)
 async def read_contact(request: Request):
     """Contact page"""
-    return templates.TemplateResponse("pages/contact.html", {"request": request})
+    return page_cache.respond(request, "pages/contact.html")
 
 @router.get("/download-cv")
 async def download_cv():
@@ -42,4 +76,25 @@ async def download_cv():
     if cv_path.exists():
         return FileResponse(str(cv_path), filename="Muhammad_Farhan_CV.pdf")
     else:
-        return {"error": "CV file not found"}
\ No newline at end of file
+        return {"error": "CV file not found"}
+
+@router.get("/images/{name:path}")
+async def resized_image(
+    name: str,
+    w: int = Query(..., ge=16, le=IMAGE_MAX_WIDTH),
+    output_format: str = Query("webp", alias="format", pattern="^(webp|avif)$"),
+):
+    """Image resized to a width on demand, cached on disk"""
+    source = image_resizer.source(name)
+    if source is None:
+        raise HTTPException(status_code=404, detail="Image not found")
+    if output_format not in available_formats():
+        # No Pillow (or no encoder for this format): send the original
+        return FileResponse(str(source), headers={"Cache-Control": RESIZED_CACHE_CONTROL})
+
+    width = image_resizer.snap_width(w)
+    path = await resize_flights.do(
+        (str(source), width, output_format),
+        lambda: asyncio.to_thread(image_resizer.render, source, width, output_format)
+    )
+    return FileResponse(str(path), media_type=FORMATS[output_format][2], headers={"Cache-Control": RESIZED_CACHE_CONTROL})
@@ -0,0 +1,182 @@
+# app/services/batch_jobs.py
+import asyncio
+import os
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+
+from services.rate_limit import RateLimited
+from services.scheduler import GEMINI_MAX_QUEUE
+
+# Batch limits (override via environment / .env)
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "50"))
+BATCH_MAX_ITEM_CHARS = int(os.getenv("BATCH_MAX_ITEM_CHARS", "20000"))
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "3"))
+BATCH_MAX_ACTIVE = int(os.getenv("BATCH_MAX_ACTIVE", "10"))
+# Items analysed at once across all batches; kept well under the upstream queue so chat turns still fit
+BATCH_MAX_IN_FLIGHT = int(os.getenv("BATCH_MAX_IN_FLIGHT", str(max(1, GEMINI_MAX_QUEUE // 4))))
+BATCH_RATE_LIMIT_RETRIES = int(os.getenv("BATCH_RATE_LIMIT_RETRIES", "5"))
+BATCH_RETENTION_SECONDS = float(os.getenv("BATCH_RETENTION_SECONDS", "3600"))
+
+
+class BatchJob:
+    """One submitted batch: per-item status plus results in completion order"""
+
+    def __init__(self, job_descriptions):
+        self.id = uuid.uuid4().hex
+        self.created_at = datetime.now().isoformat()
+        self.finished_at = None
+        self.items = [
+            {"index": index, "status": "pending", "result": None}
+            for index in range(len(job_descriptions))
+        ]
+        self.job_descriptions = job_descriptions
+        self.completed = []
+        self.task = None
+        self._finished_monotonic = None
+        self._changed = asyncio.Condition()
+
+    @property
+    def done(self):
+        return len(self.completed) == len(self.items)
+
+    def status(self, include_results=True):
+        summary = {
+            "job_id": self.id,
+            "status": "completed" if self.done else "running",
+            "total": len(self.items),
+            "completed": len(self.completed),
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+        if include_results:
+            summary["results"] = self.items
+        return summary
+
+    async def _record(self, index, status, result):
+        async with self._changed:
+            item = self.items[index]
+            item["status"] = status
+            item["result"] = result
+            self.completed.append(item)
+            if self.done:
+                self.finished_at = datetime.now().isoformat()
+                self._finished_monotonic = time.monotonic()
+            self._changed.notify_all()
+
+    async def updates(self):
+        """Yield items as they finish (already-finished ones first), until the batch is done"""
+        sent = 0
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(lambda: len(self.completed) > sent)
+                ready = self.completed[sent:]
+            for item in ready:
+                yield item
+            sent += len(ready)
+            if sent == len(self.items):
+                return
+
+
+class BatchManager:
+    """Runs batches in the background with bounded per-batch and global concurrency.
+
+    Items from all batches share ``max_in_flight`` slots, so background work
+    never fills the upstream queue. An item refused or shed upstream
+    (RateLimited) waits its retry_after and tries again, up to ``retries`` times.
+    """
+
+    def __init__(
+        self,
+        max_items=BATCH_MAX_ITEMS,
+        concurrency=BATCH_MAX_CONCURRENCY,
+        max_active=BATCH_MAX_ACTIVE,
+        retention=BATCH_RETENTION_SECONDS,
+        max_in_flight=BATCH_MAX_IN_FLIGHT,
+        retries=BATCH_RATE_LIMIT_RETRIES,
+    ):
+        self.max_items = max_items
+        self.concurrency = concurrency
+        self.max_active = max_active
+        self.retention = retention
+        self.max_in_flight = max_in_flight
+        self.retries = retries
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+        self._jobs = OrderedDict()
+        self._counters = {
+            "submitted": 0, "items_completed": 0, "items_failed": 0, "items_retried": 0, "rejected": 0,
+        }
+
+    def active(self):
+        return sum(1 for job in self._jobs.values() if not job.done)
+
+    def submit(self, job_descriptions, analyze):
+        """Start a batch; analyze(job_description, can_retry) must return a JSON-serialisable result.
+
+        While can_retry is True, analyze may raise RateLimited to have the item tried again later.
+
+        Returns None when too many batches are already running.
+        """
+        self._prune()
+        if self.active() >= self.max_active:
+            self._counters["rejected"] += 1
+            return None
+        job = BatchJob(job_descriptions)
+        self._jobs[job.id] = job
+        job.task = asyncio.create_task(self._run(job, analyze))
+        self._counters["submitted"] += 1
+        return job
+
+    def get(self, job_id):
+        self._prune()
+        return self._jobs.get(job_id)
+
+    async def _run(self, job, analyze):
+        slots = asyncio.Semaphore(self.concurrency)
+
+        async def run_item(index, job_description):
+            async with slots:
+                job.items[index]["status"] = "running"
+                try:
+                    result = await self._attempt(analyze, job_description)
+                except Exception as e:
+                    print(f"Error in batch item {job.id}[{index}]: {e}")
+                    self._counters["items_failed"] += 1
+                    await job._record(index, "error", {"error": "Analysis failed for this job description."})
+                else:
+                    self._counters["items_completed"] += 1
+                    await job._record(index, "done", result)
+
+        await asyncio.gather(*(
+            run_item(index, job_description)
+            for index, job_description in enumerate(job.job_descriptions)
+        ))
+
+    async def _attempt(self, analyze, job_description):
+        for attempt in range(self.retries + 1):
+            try:
+                async with self._in_flight:
+                    return await analyze(job_description, attempt < self.retries)
+            except RateLimited as e:
+                if attempt == self.retries:
+                    raise
+                self._counters["items_retried"] += 1
+                await asyncio.sleep(e.retry_after)
+
+    def _prune(self):
+        cutoff = time.monotonic() - self.retention
+        for job_id in [
+            job_id for job_id, job in self._jobs.items()
+            if job.done and job._finished_monotonic < cutoff
+        ]:
+            del self._jobs[job_id]
+
+    def stats(self):
+        self._prune()
+        return {
+            "batches": len(self._jobs),
+            "active": self.active(),
+            "max_in_flight": self.max_in_flight,
+            **self._counters,
+        }
@@ -0,0 +1,221 @@
+# app/services/bundles.py
+import gzip
+import json
+import re
+
+from markupsafe import Markup
+
+from services.static_assets import BUILD_DIR, STATIC_DIR, write_asset
+
+try:
+    import rjsmin
+except ImportError:  # optional: scripts are then bundled without minification
+    rjsmin = None
+
+BUNDLE_REPORT_PATH = BUILD_DIR / "bundle-report.json"
+
+# Each page's stylesheets and scripts, in the order base.html used to load them
+_CSS = ["css/mobile-menu.css", "css/base.css"]
+
+
+def _js(*page_scripts):
+    return ["js/navigation.js", *page_scripts, "js/background-animation.js", "js/farhanbot-widget.js"]
+
+
+BUNDLES = {
+    "index": {
+        "css": ["css/tech-stack.css", "css/projects.css", "css/contact-animations.css", *_CSS],
+        "js": _js("js/tech-stack.js", "js/projects.js", "js/contact-animations.js"),
+    },
+    "about": {"css": _CSS, "js": _js()},
+    "tech-stack": {"css": ["css/tech-stack.css", *_CSS], "js": _js("js/tech-stack.js")},
+    "projects": {"css": ["css/projects.css", *_CSS], "js": _js("js/projects.js")},
+    "contact": {"css": ["css/contact-animations.css", *_CSS], "js": _js("js/contact-animations.js")},
+}
+
+# Pages whose above-the-fold CSS is inlined, with the rest of their stylesheet deferred
+CRITICAL_PAGES = ("index",)
+
+_STRING_OR_COMMENT = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')|/\*.*?\*/', re.S)
+_SPACE_AROUND = re.compile(r"\s*([{};,>])\s*")
+_PSEUDO = re.compile(r"::?[\w-]+(\([^)]*\))?")
+_ATTRIBUTE = re.compile(r"\[[^\]]*\]")
+_COMBINATOR = re.compile(r"\s*[>+~]\s*|\s+")
+_SIMPLE = re.compile(r"([.#]?)([\w-]+)")
+
+
+def _squeeze(text):
+    return _SPACE_AROUND.sub(r"\1", re.sub(r"\s+", " ", text))
+
+
+def minify_css(css):
+    """Strip comments and redundant whitespace, leaving strings untouched"""
+    parts, last = [], 0
+    for match in _STRING_OR_COMMENT.finditer(css):
+        parts.append(_squeeze(css[last:match.start()]))
+        parts.append(match.group(1) or "")
+        last = match.end()
+    parts.append(_squeeze(css[last:]))
+    return "".join(parts).replace(";}", "}").strip()
+
+
+def minify_js(source):
+    return rjsmin.jsmin(source) if rjsmin is not None else source
+
+
+def parse_css(css):
+    """Split minified CSS into (prelude, body) rules; @media/@supports bodies are parsed recursively"""
+    rules, index = [], 0
+    while index < len(css):
+        brace = css.find("{", index)
+        semicolon = css.find(";", index)
+        if brace == -1 or (semicolon != -1 and semicolon < brace):
+            # Statement at-rule such as @import / @charset
+            end = len(css) if semicolon == -1 else semicolon + 1
+            rules.append((css[index:end], None))
+            index = end
+            continue
+        depth, end = 0, brace
+        while end < len(css):
+            depth += {"{": 1, "}": -1}.get(css[end], 0)
+            if depth == 0:
+                break
+            end += 1
+        prelude, body = css[index:brace].strip(), css[brace + 1:end]
+        if prelude.startswith(("@media", "@supports")):
+            body = parse_css(body)
+        rules.append((prelude, body))
+        index = end + 1
+    return rules
+
+
+def render_css(rules):
+    return "".join(
+        prelude if body is None else f"{prelude}{{{body if isinstance(body, str) else render_css(body)}}}"
+        for prelude, body in rules
+    )
+
+
+def _selector_matches(selector, tags, classes, ids):
+    selector = _ATTRIBUTE.sub("", _PSEUDO.sub("", selector))
+    for compound in _COMBINATOR.split(selector.strip()):
+        for kind, name in _SIMPLE.findall(compound):
+            if kind == "." and name not in classes:
+                return False
+            if kind == "#" and name not in ids:
+                return False
+            if not kind and name.lower() not in tags:
+                return False
+    return True
+
+
+def critical_css(css, html):
+    """Rules from css that can apply to elements in html (the above-the-fold markup).
+
+    Selectors are matched on tag, class and id only (pseudo-classes and
+    attribute selectors are ignored, so hover states come along); keyframes
+    are kept when a kept rule names them, and @font-face is always kept.
+    """
+    tags = {tag.lower() for tag in re.findall(r"<([a-zA-Z][\w-]*)", html)} | {"html", "body"}
+    classes = {name for attribute in re.findall(r'class="([^"]*)"', html) for name in attribute.split()}
+    ids = set(re.findall(r'id="([^"]*)"', html))
+
+    def select(rules):
+        kept = []
+        for prelude, body in rules:
+            if isinstance(body, list):
+                nested = select(body)
+                if nested:
+                    kept.append((prelude, nested))
+            elif prelude.startswith("@font-face"):
+                kept.append((prelude, body))
+            elif not prelude.startswith("@") and any(
+                _selector_matches(selector, tags, classes, ids) for selector in prelude.split(",")
+            ):
+                kept.append((prelude, body))
+        return kept
+
+    rules = parse_css(css)
+    kept = select(rules)
+    used = render_css(kept)
+    keyframes = [
+        (prelude, body) for prelude, body in rules
+        if re.match(r"@(-\w+-)?keyframes\s", prelude) and re.search(rf"\b{re.escape(prelude.split()[-1])}\b", used)
+    ]
+    return render_css(kept + keyframes)
+
+
+def above_the_fold(html):
+    """Markup up to the end of the first <section> in <main> (header + hero)"""
+    main = html.find("<main")
+    first = html.find("<section", main)
+    second = html.find("<section", first + 1)
+    return html[:second] if main != -1 and first != -1 and second != -1 else html
+
+
+def _size(data):
+    return {"bytes": len(data), "gzip_bytes": len(gzip.compress(data, mtime=0))}
+
+
+def build_bundles(pages_html, static_dir=STATIC_DIR, build_dir=BUILD_DIR):
+    """Write one minified CSS and JS bundle per page, plus critical CSS for CRITICAL_PAGES.
+
+    ``pages_html`` maps page names to their rendered HTML (needed for the
+    critical pages). Returns the manifest entries for the bundles and a
+    size report comparing the separate source files with the bundles.
+    """
+    manifest, report = {}, {}
+    for page, assets in BUNDLES.items():
+        css_sources = [(static_dir / name).read_bytes() for name in assets["css"]]
+        js_sources = [(static_dir / name).read_bytes() for name in assets["js"]]
+        css = minify_css("\n".join(source.decode("utf-8") for source in css_sources))
+        js = ";\n".join(minify_js(source.decode("utf-8")) for source in js_sources)
+
+        manifest[f"bundles/{page}.css"] = write_asset(f"bundles/{page}.css", css.encode("utf-8"), build_dir)
+        manifest[f"bundles/{page}.js"] = write_asset(f"bundles/{page}.js", js.encode("utf-8"), build_dir)
+        report[page] = {
+            "before": {"requests": len(css_sources) + len(js_sources), **_size(b"".join(css_sources + js_sources))},
+            "after": {"requests": 2, **_size(css.encode("utf-8") + js.encode("utf-8"))},
+        }
+        if page in CRITICAL_PAGES and page in pages_html:
+            critical = critical_css(css, above_the_fold(pages_html[page])).encode("utf-8")
+            manifest[f"critical/{page}.css"] = write_asset(f"critical/{page}.css", critical, build_dir)
+            report[page]["critical_css"] = _size(critical)
+
+    build_dir.mkdir(parents=True, exist_ok=True)
+    (build_dir / BUNDLE_REPORT_PATH.name).write_text(json.dumps(report, indent=2, sort_keys=True))
+    return manifest, report
+
+
+class PageAssets:
+    """Template helpers that link a page's bundles (or, without a build, its source files)"""
+
+    def __init__(self, assets):
+        self.assets = assets
+        self._critical = {}
+
+    def styles(self, page):
+        if f"bundles/{page}.css" not in self.assets.entries:
+            return Markup("\n".join(
+                f'<link rel="stylesheet" href="{self.assets.url(name)}">' for name in BUNDLES[page]["css"]
+            ))
+        url = self.assets.url(f"bundles/{page}.css")
+        critical = self.critical(page)
+        if critical is None:
+            return Markup(f'<link rel="stylesheet" href="{url}">')
+        # Inline what the first screen needs; load the full stylesheet without blocking rendering
+        return Markup(
+            f"<style>{critical}</style>\n"
+            f'<link rel="preload" href="{url}" as="style" onload="this.onload=null;this.rel=\'stylesheet\'">\n'
+            f'<noscript><link rel="stylesheet" href="{url}"></noscript>'
+        )
+
+    def scripts(self, page):
+        names = [f"bundles/{page}.js"] if f"bundles/{page}.js" in self.assets.entries else BUNDLES[page]["js"]
+        return Markup("\n".join(f'<script src="{self.assets.url(name)}"></script>' for name in names))
+
+    def critical(self, page):
+        if page not in self._critical:
+            hashed = self.assets.entries.get(f"critical/{page}.css")
+            self._critical[page] = (BUILD_DIR / hashed).read_text() if hashed else None
+        return self._critical[page]
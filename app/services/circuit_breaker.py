@@ -0,0 +1,147 @@
+# app/services/circuit_breaker.py
+import asyncio
+import math
+import os
+import time
+from datetime import datetime
+
+# Breaker tuning (override via environment / .env)
+GEMINI_BREAKER_FAILURE_THRESHOLD = int(os.getenv("GEMINI_BREAKER_FAILURE_THRESHOLD", "5"))
+GEMINI_BREAKER_RESET_SECONDS = float(os.getenv("GEMINI_BREAKER_RESET_SECONDS", "30"))
+GEMINI_BREAKER_HALF_OPEN_PROBES = int(os.getenv("GEMINI_BREAKER_HALF_OPEN_PROBES", "1"))
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpen(Exception):
+    """Raised instead of calling Gemini while the breaker is open"""
+
+    def __init__(self, retry_after):
+        super().__init__("Gemini circuit breaker is open")
+        self.retry_after = max(1, math.ceil(retry_after))
+
+
+def is_upstream_failure(error):
+    """True for errors that say Gemini itself is unhealthy (timeouts, 429, 5xx).
+
+    Client-side errors such as a rejected prompt (4xx) don't trip the breaker.
+    """
+    if isinstance(error, asyncio.TimeoutError):
+        return True
+    code = getattr(error, "code", None)
+    if isinstance(code, int):
+        return code == 429 or code >= 500
+    return True
+
+
+class CircuitBreaker:
+    """Closed -> open after ``failure_threshold`` consecutive upstream failures.
+
+    While open every call fails fast with CircuitOpen. After ``reset_timeout``
+    the breaker goes half-open and lets ``half_open_probes`` calls through: a
+    success closes it again, a failure re-opens it for another interval.
+
+    Every state change starts a new generation. before_call returns the
+    generation a call was admitted under, and outcomes reported for an
+    older generation (a straggler admitted before the breaker opened) are
+    counted as stale and otherwise ignored.
+    """
+
+    def __init__(
+        self,
+        failure_threshold=GEMINI_BREAKER_FAILURE_THRESHOLD,
+        reset_timeout=GEMINI_BREAKER_RESET_SECONDS,
+        half_open_probes=GEMINI_BREAKER_HALF_OPEN_PROBES,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_probes = half_open_probes
+        self.state = CLOSED
+        self.failures = 0
+        self.last_error = None
+        self.since = datetime.now().isoformat()
+        self._opened_at = None
+        self._probes = 0
+        self._generation = 0
+        self._counters = {"opened": 0, "short_circuited": 0, "successes": 0, "failures": 0, "stale": 0}
+
+    def before_call(self):
+        """Admit a call and return its generation, or raise CircuitOpen; every admitted call must report back"""
+        if self.state == OPEN:
+            remaining = self._opened_at + self.reset_timeout - time.monotonic()
+            if remaining > 0:
+                self._counters["short_circuited"] += 1
+                raise CircuitOpen(remaining)
+            self._set_state(HALF_OPEN)
+            self._probes = 0
+
+        if self.state == HALF_OPEN:
+            if self._probes >= self.half_open_probes:
+                self._counters["short_circuited"] += 1
+                raise CircuitOpen(self.reset_timeout)
+            self._probes += 1
+        return self._generation
+
+    def _stale(self, generation):
+        if generation != self._generation:
+            self._counters["stale"] += 1
+            return True
+        return False
+
+    def record_success(self, generation):
+        if self._stale(generation):
+            return
+        self._counters["successes"] += 1
+        self.failures = 0
+        if self.state != CLOSED:
+            self._set_state(CLOSED)
+            print("✅ Gemini circuit closed")
+
+    def record_failure(self, error, generation):
+        """Count an upstream failure; anything not is_upstream_failure only ends a probe"""
+        if self._stale(generation):
+            return
+        if not is_upstream_failure(error):
+            if self.state == HALF_OPEN:
+                self._probes -= 1
+            return
+        self._counters["failures"] += 1
+        self.failures += 1
+        self.last_error = f"{type(error).__name__}: {error}"[:300]
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            self._open()
+
+    def record_abandoned(self, generation):
+        """A call that ended without an outcome (cancelled / never reached Gemini)"""
+        if self._stale(generation):
+            return
+        if self.state == HALF_OPEN:
+            self._probes -= 1
+
+    def _open(self):
+        self._counters["opened"] += 1
+        self._opened_at = time.monotonic()
+        self._set_state(OPEN)
+        print(f"❌ Gemini circuit opened after {self.failures} failure(s): {self.last_error}")
+
+    def _set_state(self, state):
+        self.state = state
+        self._generation += 1
+        self.since = datetime.now().isoformat()
+
+    def status(self):
+        retry_in = None
+        if self.state == OPEN:
+            retry_in = round(max(0.0, self._opened_at + self.reset_timeout - time.monotonic()), 1)
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "failure_threshold": self.failure_threshold,
+            "reset_seconds": self.reset_timeout,
+            "retry_in_seconds": retry_in,
+            "last_error": self.last_error,
+            "since": self.since,
+            **self._counters,
+        }
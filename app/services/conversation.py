@@ -0,0 +1,146 @@
+# app/services/conversation.py
+import hashlib
+import html
+import os
+import re
+
+from services.tokens import estimate_tokens
+
+# Conversation context budgets (override via environment / .env)
+CHAT_HISTORY_TOKEN_BUDGET = int(os.getenv("CHAT_HISTORY_TOKEN_BUDGET", "500"))
+CHAT_SUMMARY_TOKEN_BUDGET = int(os.getenv("CHAT_SUMMARY_TOKEN_BUDGET", "200"))
+
+# Longest answer text kept per recent turn / per summary line
+TURN_ANSWER_CHARS = 800
+SUMMARY_QUESTION_CHARS = 120
+SUMMARY_ANSWER_CHARS = 160
+
+_TAG = re.compile(r"<[^>]+>")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s")
+_WORD = re.compile(r"[a-z']+")
+
+# Words that point back at earlier turns. "he", "him" and "his" are left out:
+# on this site they mean Muhammad, not something said before.
+_BACK_REFERENCES = {
+    "it", "its", "it's", "that", "this", "these", "those", "they", "them", "their", "there",
+    "one", "ones", "same", "else", "more", "other", "another", "again", "also", "too",
+    "previous", "above", "earlier", "former", "latter", "mentioned", "elaborate", "expand",
+}
+_CONTINUATIONS = ("and ", "but ", "or ", "so ", "what about ", "how about ", "why ")
+# Fragments this short ("why?", "which one", "more please") lean on the turn before
+FOLLOW_UP_MAX_WORDS = 2
+
+
+def plain_text(answer):
+    """Strip the chatbot's HTML formatting down to plain text"""
+    text = _TAG.sub(" ", answer.replace("<br>", "\n"))
+    return " ".join(html.unescape(text).split())
+
+
+def _clip(text, limit):
+    return text if len(text) <= limit else text[:limit].rsplit(" ", 1)[0] + "..."
+
+
+def is_follow_up(message):
+    """True when a message only makes sense with the conversation before it.
+
+    Self-contained questions are answered (and cached) without the
+    conversation, so they share cache entries and in-flight calls
+    across sessions.
+    """
+    text = " ".join(message.lower().split())
+    words = _WORD.findall(text)
+    if len(words) <= FOLLOW_UP_MAX_WORDS:
+        return True
+    if text.startswith(_CONTINUATIONS):
+        return True
+    return any(word in _BACK_REFERENCES for word in words)
+
+
+def summarize_turn(turn):
+    """One summary line for a turn: the question plus the gist of the answer"""
+    question = _clip(" ".join(turn["user"].split()), SUMMARY_QUESTION_CHARS)
+    answer = plain_text(turn["bot"])
+    gist = _SENTENCE_END.split(answer, 1)[0] if answer else ""
+    return f'- Visitor asked "{question}"; answered: {_clip(gist, SUMMARY_ANSWER_CHARS)}'
+
+
+class ConversationMemory:
+    """Builds the conversation block for a chat prompt within a token budget.
+
+    The most recent turns are included verbatim (answer text clipped) up to
+    ``history_budget`` tokens. Turns that no longer fit are folded into a
+    rolling summary kept on the session; this only happens when the budget
+    is exceeded, and each turn is summarised once. Summary lines beyond
+    ``summary_budget`` tokens are dropped oldest first. Sizes come from the
+    local token estimator, so no API calls are made.
+    """
+
+    def __init__(self, store, history_budget=CHAT_HISTORY_TOKEN_BUDGET, summary_budget=CHAT_SUMMARY_TOKEN_BUDGET):
+        self.store = store
+        self.history_budget = history_budget
+        self.summary_budget = summary_budget
+        self._counters = {"contexts": 0, "turns_included": 0, "turns_folded": 0, "tokens": 0}
+
+    def context(self, session_id):
+        """Conversation-so-far text for a session ("" for a new or missing session)"""
+        if not session_id or self.history_budget <= 0:
+            return ""
+        summary, folded, first, turns = self.store.memory(session_id)
+        unfolded = [
+            (first + offset, turn) for offset, turn in enumerate(turns)
+            if first + offset >= folded
+        ]
+
+        recent, used = [], 0
+        for index, turn in reversed(unfolded):
+            text = self._render_turn(turn)
+            tokens = estimate_tokens(text)
+            if used + tokens > self.history_budget:
+                break
+            recent.append(text)
+            used += tokens
+        recent.reverse()
+
+        overflow = unfolded[:len(unfolded) - len(recent)]
+        if overflow:
+            summary = self._fold(summary, [turn for _index, turn in overflow])
+            self.store.set_summary(session_id, summary, overflow[-1][0] + 1)
+            self._counters["turns_folded"] += len(overflow)
+
+        parts = []
+        if summary:
+            parts.append(f"Summary of earlier conversation:\n{summary}")
+        if recent:
+            parts.append("Recent messages:\n" + "\n".join(recent))
+        context = "\n\n".join(parts)
+
+        if context:
+            self._counters["contexts"] += 1
+            self._counters["turns_included"] += len(recent)
+            self._counters["tokens"] += estimate_tokens(context)
+        return context
+
+    def _render_turn(self, turn):
+        return f"Visitor: {turn['user']}\nAssistant: {_clip(plain_text(turn['bot']), TURN_ANSWER_CHARS)}"
+
+    def _fold(self, summary, turns):
+        lines = summary.splitlines() if summary else []
+        lines.extend(summarize_turn(turn) for turn in turns)
+        while len(lines) > 1 and estimate_tokens("\n".join(lines)) > self.summary_budget:
+            lines.pop(0)
+        return "\n".join(lines)
+
+    def stats(self):
+        contexts = self._counters["contexts"]
+        return {
+            "history_token_budget": self.history_budget,
+            "summary_token_budget": self.summary_budget,
+            "avg_context_tokens": round(self._counters["tokens"] / contexts, 1) if contexts else 0.0,
+            **self._counters,
+        }
+
+
+def context_digest(context):
+    """Short hash of a conversation context, so cached answers don't leak across conversations"""
+    return hashlib.sha256(context.encode("utf-8")).hexdigest()[:12] if context else ""
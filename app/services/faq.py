@@ -0,0 +1,159 @@
+# app/services/faq.py
+import os
+import re
+import time
+
+from services.response_cache import normalize_question
+
+# Minimum confidence for answering locally instead of calling Gemini
+FAQ_CONFIDENCE_THRESHOLD = float(os.getenv("FAQ_CONFIDENCE_THRESHOLD", "0.6"))
+
+_FACT_LINE = re.compile(r"^-\s*([^:]+):\s*(.+)$")
+_HEADER = re.compile(r"^([A-Z][A-Z &/]+?)(\s*\(.*\))?:\s*$")
+
+# Words that carry no intent of their own ("what's his ...", "can you give me ...")
+_FILLER = frozenset(
+    "a an and are as be can could do does find for get give he her him his how i id in "
+    "is it its know let like me muhammad farhan farhans of on or please s see send "
+    "share tell the their there to what whats where which who would you your "
+    "hi hello hey thanks thank".split()
+)
+
+# intent -> (trigger words, supporting words)
+INTENTS = {
+    "email": ({"email", "mail", "gmail"}, {"address"}),
+    "phone": ({"phone", "mobile", "call", "telephone"}, {"number", "contact"}),
+    "whatsapp": ({"whatsapp"}, {"number", "link", "message"}),
+    "telegram": ({"telegram"}, {"handle", "username", "link", "message"}),
+    "linkedin": ({"linkedin"}, {"profile", "link", "url", "page"}),
+    "github": ({"github", "repos", "repositories"}, {"profile", "link", "url", "page", "code"}),
+    "cv": ({"cv", "resume"}, {"download", "link", "copy", "pdf", "latest", "full", "url"}),
+    "availability": (
+        {"remote", "hybrid", "relocate", "relocation", "availability", "available", "notice", "freelance", "contract"},
+        {"work", "working", "open", "period", "full", "time", "fulltime", "job", "jobs", "roles", "start", "now", "currently"},
+    ),
+    "location": ({"located", "location", "based", "live", "lives", "city", "country"}, {"where", "currently", "now"}),
+    "contact": ({"contact", "reach", "touch", "hire"}, {"details", "info", "information", "way", "best"}),
+}
+
+
+def parse_profile_facts(profile):
+    """Pull "- Key: value" facts and short sections (e.g. AVAILABILITY) out of the profile"""
+    facts, sections, header = {}, {}, None
+    for line in profile.splitlines():
+        stripped = line.strip()
+        if _HEADER.match(stripped):
+            header = _HEADER.match(stripped).group(1).strip()
+            sections[header] = []
+            continue
+        match = _FACT_LINE.match(stripped)
+        if match:
+            facts.setdefault(match.group(1).strip().lower(), match.group(2).strip())
+        if header and stripped.startswith("-"):
+            sections[header].append(stripped.lstrip("- ").strip())
+    return facts, sections
+
+
+class FaqAnswerer:
+    """Answers fixed-answer questions (email, CV, LinkedIn, ...) from profile data.
+
+    Each intent scores 0.7 for a trigger word plus 0.1 per supporting word,
+    minus 0.15 for every word the intent does not explain, so anything more
+    specific than a plain FAQ falls through to Gemini.
+    """
+
+    def __init__(self, profile, threshold=FAQ_CONFIDENCE_THRESHOLD):
+        self.profile = profile
+        self.threshold = threshold
+        self.facts, self.sections = parse_profile_facts(profile)
+        self._counters = {"answered": 0, "fell_through": 0}
+        self._intent_counts = {intent: 0 for intent in INTENTS}
+        self._match_seconds = 0.0
+
+    def classify(self, message):
+        """Return [(intent, confidence)] above the threshold, best first"""
+        words = [word for word in normalize_question(message).split() if word not in _FILLER]
+        if not words:
+            return []
+
+        matches = []
+        for intent, (triggers, supporting) in INTENTS.items():
+            hits = [word for word in words if word in triggers]
+            if not hits:
+                continue
+            support = [word for word in words if word in supporting]
+            matches.append((intent, hits, support))
+
+        # Words explained by any matched intent don't count against the others
+        explained = set()
+        for _intent, hits, support in matches:
+            explained.update(hits)
+            explained.update(support)
+        unknown = sum(1 for word in words if word not in explained)
+
+        scored = []
+        for intent, _hits, support in matches:
+            confidence = 0.7 + min(0.3, 0.1 * len(support)) - 0.15 * unknown
+            if confidence >= self.threshold:
+                scored.append((intent, round(min(confidence, 1.0), 2)))
+        return sorted(scored, key=lambda item: item[1], reverse=True)
+
+    def answer(self, message):
+        """Return an HTML answer for a recognised FAQ, or None to fall through"""
+        started = time.perf_counter()
+        intents = self.classify(message)[:3]
+        answers = [self._render(intent) for intent, _confidence in intents]
+        answers = [answer for answer in answers if answer]
+        self._match_seconds += time.perf_counter() - started
+
+        if not answers:
+            self._counters["fell_through"] += 1
+            return None
+
+        self._counters["answered"] += 1
+        for intent, _confidence in intents:
+            self._intent_counts[intent] += 1
+        return "<br><br>".join(answers) + "<br><br>Feel free to reach out to Muhammad directly for a detailed discussion."
+
+    def _render(self, intent):
+        facts = self.facts
+        if intent == "email" and "email" in facts:
+            return f'📧 <strong>Email:</strong> <a href="mailto:{facts["email"]}">{facts["email"]}</a>'
+        if intent == "phone" and "phone" in facts:
+            number = facts["phone"]
+            return f'📞 <strong>Phone:</strong> <a href="tel:{number.replace(" ", "")}">{number}</a>'
+        if intent == "whatsapp" and "whatsapp" in facts:
+            return f'💬 <strong>WhatsApp:</strong> <a href="{facts["whatsapp"]}">Message Muhammad on WhatsApp</a>'
+        if intent == "telegram" and "telegram" in facts:
+            handle = facts["telegram"]
+            return f'✈️ <strong>Telegram:</strong> <a href="https://t.me/{handle.lstrip("@")}">{handle}</a>'
+        if intent == "linkedin" and "linkedin" in facts:
+            return f'💼 <strong>LinkedIn:</strong> <a href="{facts["linkedin"]}">{facts["linkedin"]}</a>'
+        if intent == "github" and "github" in facts:
+            return f'🐙 <strong>GitHub:</strong> <a href="{facts["github"]}">{facts["github"]}</a>'
+        if intent == "cv" and "cv download" in facts:
+            return f'📄 <strong>CV / Resume:</strong> <a href="{facts["cv download"]}">Download Muhammad\'s CV</a>'
+        if intent == "availability" and self.sections.get("AVAILABILITY"):
+            items = "<br>".join(f"• {item}" for item in self.sections["AVAILABILITY"])
+            location = f'<br>• Based in {facts["location"]}' if "location" in facts else ""
+            return f"🌍 <strong>Availability:</strong><br>{items}{location}"
+        if intent == "location" and "location" in facts:
+            return f'📍 <strong>Location:</strong> {facts["location"]}'
+        if intent == "contact":
+            lines = [
+                self._render(name) for name in ("email", "phone", "linkedin", "whatsapp")
+                if name in facts
+            ]
+            if lines:
+                return "<strong>How to contact Muhammad:</strong><br>" + "<br>".join(lines)
+        return None
+
+    def stats(self):
+        handled = self._counters["answered"] + self._counters["fell_through"]
+        return {
+            **self._counters,
+            "absorbed_rate": round(self._counters["answered"] / handled, 3) if handled else 0.0,
+            "avg_match_us": round(self._match_seconds / handled * 1e6, 1) if handled else 0.0,
+            "threshold": self.threshold,
+            "intents": dict(self._intent_counts),
+        }
@@ -0,0 +1,197 @@
+# app/services/gemini.py
+import asyncio
+import os
+from datetime import datetime
+
+import google.generativeai as genai
+
+from services.circuit_breaker import CircuitBreaker
+from services.model_router import ModelRouter
+from services.rate_limit import RateLimited
+from services.scheduler import PRIORITY_CHAT, UpstreamScheduler
+
+# Upstream tuning (override via environment / .env)
+GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "4"))
+GEMINI_TIMEOUT_SECONDS = float(os.getenv("GEMINI_TIMEOUT_SECONDS", "30"))
+GEMINI_WARMUP_TIMEOUT_SECONDS = float(os.getenv("GEMINI_WARMUP_TIMEOUT_SECONDS", "15"))
+GEMINI_WARMUP_RETRY_SECONDS = float(os.getenv("GEMINI_WARMUP_RETRY_SECONDS", "60"))
+
+# Preferred models, best first
+GEMINI_MODEL_CANDIDATES = ['gemini-1.5-flash', 'gemini-1.5-pro', 'gemini-2.0-flash']
+
+WARMING = "warming"
+SERVING = "serving"
+DEGRADED = "degraded"
+
+
+class GeminiModelManager:
+    """Discovers and initialises the Gemini models in the background.
+
+    Importing the chatbot never touches the network: start() schedules model
+    discovery on the running event loop and the app serves immediately, with
+    state moving from "warming" to "serving" (or "degraded", retried later).
+    Once serving, ``model`` is a ModelRouter over every usable candidate.
+    """
+
+    def __init__(self, api_key, candidates=GEMINI_MODEL_CANDIDATES):
+        self.api_key = api_key
+        self.candidates = candidates
+        self.model = None
+        self.model_name = None
+        self.available_models = []
+        self.error = None
+        self.attempts = 0
+        self.since = datetime.now().isoformat()
+        self._task = None
+        if not api_key or api_key == "your-gemini-api-key-here":
+            self.api_key = None
+            self.state = DEGRADED
+            self.error = "GEMINI_API_KEY not found or not configured properly"
+        else:
+            self.state = WARMING
+
+    def start(self):
+        """Schedule background warm-up (no-op without an API key or if already started)"""
+        if self.api_key is None:
+            print(f"ERROR: {self.error}")
+            print("Please set your Gemini API key in environment variables or .env file")
+            print("Get your free API key from: https://makersuite.google.com/app/apikey")
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._warm_up())
+
+    async def stop(self):
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _warm_up(self):
+        while self.model is None:
+            self.attempts += 1
+            try:
+                # A discovery thread that outlives the timeout is simply ignored
+                available, models = await asyncio.wait_for(
+                    asyncio.to_thread(self._discover),
+                    timeout=GEMINI_WARMUP_TIMEOUT_SECONDS,
+                )
+                self.available_models = available
+                if not models:
+                    self._set_state(DEGRADED, "Could not initialize any Gemini model")
+                else:
+                    self.model = ModelRouter(models, scheduler=upstream_scheduler)
+                    self.model_name = self.model.primary
+                    self._set_state(SERVING)
+                    print(f"✅ Gemini AI configured successfully with {', '.join(models)}")
+                    return
+            except asyncio.TimeoutError:
+                self._set_state(DEGRADED, f"Model discovery timed out after {GEMINI_WARMUP_TIMEOUT_SECONDS}s")
+            except Exception as e:
+                self._set_state(DEGRADED, f"ERROR configuring Gemini AI: {e}")
+
+            print(f"❌ {self.error} - retrying in {GEMINI_WARMUP_RETRY_SECONDS}s")
+            await asyncio.sleep(GEMINI_WARMUP_RETRY_SECONDS)
+
+    def _discover(self):
+        """Blocking model discovery; runs in a worker thread.
+
+        Returns (available model names, {name: model} in preference order).
+        """
+        genai.configure(api_key=self.api_key)
+        available = [
+            model.name for model in genai.list_models()
+            if 'generateContent' in model.supported_generation_methods
+        ]
+        print(f"Available models: {available}")
+
+        # Route between the candidates the key can actually use, else try them all
+        names = [name for name in self.candidates if f"models/{name}" in available] or self.candidates
+        models = {}
+        for model_name in names:
+            try:
+                models[model_name] = genai.GenerativeModel(model_name)
+            except Exception as model_error:
+                print(f"❌ Failed to initialize {model_name}: {model_error}")
+        return available, models
+
+    def _set_state(self, state, error=None):
+        self.state = state
+        self.error = error
+        self.since = datetime.now().isoformat()
+
+    def routing_stats(self):
+        return self.model.stats() if isinstance(self.model, ModelRouter) else None
+
+    def status(self):
+        if isinstance(self.model, ModelRouter):
+            self.model_name = self.model.primary
+        return {
+            "state": self.state,
+            "model": self.model_name,
+            "error": self.error,
+            "attempts": self.attempts,
+            "since": self.since,
+            "available_models": self.available_models,
+        }
+
+# Caps how many Gemini calls may be in flight at once; chat turns are served before job analyses
+upstream_scheduler = UpstreamScheduler(GEMINI_MAX_CONCURRENCY)
+
+# Fails fast while Gemini is erroring instead of sending doomed requests
+upstream_breaker = CircuitBreaker()
+
+
+async def generate_text(model, prompt, timeout=None, priority=PRIORITY_CHAT):
+    """Run a Gemini completion on the async client without blocking the event loop.
+
+    Raises CircuitOpen while the breaker is open, asyncio.TimeoutError if the
+    upstream call takes longer than the timeout, and RateLimited if no
+    upstream slot frees up in time.
+    """
+    generation = upstream_breaker.before_call()
+    try:
+        async with upstream_scheduler.slot(priority):
+            response = await asyncio.wait_for(
+                model.generate_content_async(prompt),
+                timeout=timeout or GEMINI_TIMEOUT_SECONDS,
+            )
+    except (RateLimited, asyncio.CancelledError):
+        upstream_breaker.record_abandoned(generation)
+        raise
+    except Exception as e:
+        upstream_breaker.record_failure(e, generation)
+        raise
+    upstream_breaker.record_success(generation)
+    return response.text
+
+
+async def stream_text(model, prompt, timeout=None):
+    """Yield Gemini text chunks as they are generated.
+
+    The timeout applies to the first chunk and to each gap between chunks.
+    """
+    timeout = timeout or GEMINI_TIMEOUT_SECONDS
+    generation = upstream_breaker.before_call()
+    try:
+        async with upstream_scheduler.slot():
+            response = await asyncio.wait_for(
+                model.generate_content_async(prompt, stream=True),
+                timeout=timeout,
+            )
+            chunks = response.__aiter__()
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(chunks.__anext__(), timeout=timeout)
+                except StopAsyncIteration:
+                    break
+                if chunk.text:
+                    yield chunk.text
+    except (RateLimited, asyncio.CancelledError, GeneratorExit):
+        upstream_breaker.record_abandoned(generation)
+        raise
+    except Exception as e:
+        upstream_breaker.record_failure(e, generation)
+        raise
+    upstream_breaker.record_success(generation)
@@ -0,0 +1,115 @@
+# app/services/idempotency.py
+import asyncio
+import hashlib
+import json
+import os
+import time
+
+from services.response_cache import ResponseCache
+from services.singleflight import SingleFlight
+
+# Idempotency window (override via environment / .env)
+IDEMPOTENCY_MAX_ENTRIES = int(os.getenv("IDEMPOTENCY_MAX_ENTRIES", "1024"))
+IDEMPOTENCY_TTL_SECONDS = float(os.getenv("IDEMPOTENCY_TTL_SECONDS", "600"))
+
+# Longest Idempotency-Key header accepted
+MAX_KEY_LENGTH = 255
+
+
+class IdempotencyConflict(Exception):
+    """The key was already used for a request with a different body"""
+
+
+def request_fingerprint(payload):
+    """Hash of a request body, to tell a genuine retry from a reused key"""
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class IdempotencyStore:
+    """Replays responses for repeated Idempotency-Key requests.
+
+    Successful responses are kept in a bounded LRU + TTL ResponseCache
+    (apologies are not, so a retry gets a fresh attempt); a duplicate that
+    arrives while the first request is still running joins it through
+    SingleFlight instead of starting a second call. Streamed answers can't
+    be shared chunk by chunk, so a duplicate stream waits for the first
+    one to finish (begin_stream / pending_stream) and replays its answer.
+    """
+
+    def __init__(self, max_entries=IDEMPOTENCY_MAX_ENTRIES, ttl=IDEMPOTENCY_TTL_SECONDS):
+        self._responses = ResponseCache(max_entries=max_entries, ttl=ttl)
+        self._flights = SingleFlight()
+        self._streams = {}
+        self._counters = {"replayed": 0, "conflicts": 0, "joined_streams": 0}
+
+    def stored(self, key, fingerprint):
+        """The stored response for key, or None; raises IdempotencyConflict on a body mismatch"""
+        entry = self._responses.get(key)
+        if entry is None:
+            return None
+        stored_fingerprint, response = entry
+        if stored_fingerprint != fingerprint:
+            self._counters["conflicts"] += 1
+            raise IdempotencyConflict(key)
+        self._counters["replayed"] += 1
+        return response
+
+    def remember(self, key, fingerprint, response):
+        self._responses.set(key, (fingerprint, response))
+
+    async def run(self, key, fingerprint, fn, keep=lambda response: True):
+        """Return the stored response for key, join the in-flight one, or run fn() and store it if keep(it)"""
+        response = self.stored(key, fingerprint)
+        if response is not None:
+            return response
+
+        async def compute():
+            response = await fn()
+            if keep(response):
+                self.remember(key, fingerprint, response)
+            return response
+
+        return await self._flights.do((key, fingerprint), compute)
+
+    def pending_stream(self, key, fingerprint):
+        """Future for a stream still running under key, or None; raises IdempotencyConflict on a body mismatch"""
+        entry = self._streams.get(key)
+        if entry is None:
+            return None
+        stream_fingerprint, future, started = entry
+        if time.monotonic() - started > self._responses.ttl:
+            # A stream whose body never ran (the client left first) never finishes; forget it
+            del self._streams[key]
+            return None
+        if stream_fingerprint != fingerprint:
+            self._counters["conflicts"] += 1
+            raise IdempotencyConflict(key)
+        self._counters["joined_streams"] += 1
+        return future
+
+    def begin_stream(self, key, fingerprint):
+        """Mark a stream as running under key; pass the result to finish_stream"""
+        future = asyncio.get_running_loop().create_future()
+        self._streams[key] = (fingerprint, future, time.monotonic())
+        return future
+
+    def finish_stream(self, key, future, response):
+        """Store a streamed answer (None if it failed) and hand it to the duplicates waiting on it"""
+        entry = self._streams.get(key)
+        if entry is not None and entry[1] is future:
+            del self._streams[key]
+            if response is not None:
+                self.remember(key, entry[0], response)
+        if not future.done():
+            future.set_result(response)
+
+    def stats(self):
+        responses = self._responses.stats()
+        return {
+            "entries": responses["entries"],
+            "max_entries": responses["max_entries"],
+            "ttl_seconds": responses["ttl_seconds"],
+            **self._counters,
+            "streams_in_flight": len(self._streams),
+            "joined_in_flight": self._flights.stats()["collapsed"],
+        }
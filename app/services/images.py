@@ -0,0 +1,167 @@
+# app/services/images.py
+import hashlib
+import html
+import io
+import json
+import os
+from pathlib import Path
+
+from markupsafe import Markup
+
+from services.static_assets import BUILD_DIR, BUILD_URL, STATIC_DIR, fingerprint
+
+try:
+    from PIL import Image, ImageOps, features
+except ImportError:  # optional: without Pillow images are served as uploaded
+    Image = None
+
+# Responsive image settings (override via environment / .env)
+IMAGE_WIDTHS = tuple(int(width) for width in os.getenv("IMAGE_WIDTHS", "320,640,960,1280").split(","))
+IMAGE_MAX_WIDTH = int(os.getenv("IMAGE_MAX_WIDTH", "2560"))
+IMAGE_CACHE_DIR = Path(os.getenv("IMAGE_CACHE_DIR", "data/image_cache"))
+
+IMAGES_DIR = STATIC_DIR / "images"
+IMAGE_MANIFEST_PATH = BUILD_DIR / "images.json"
+
+# Source images picked up by the build and the resize endpoint
+IMAGE_SUFFIXES = (".jpg", ".jpeg", ".png")
+
+# On-demand widths are rounded up to a multiple of this, so the disk cache stays small
+WIDTH_STEP = 80
+
+# Output formats, best first: Pillow format name, save options, MIME type
+FORMATS = {
+    "avif": ("AVIF", {"quality": 55}, "image/avif"),
+    "webp": ("WEBP", {"quality": 80, "method": 6}, "image/webp"),
+}
+
+
+def available_formats():
+    """Output formats this Pillow build can encode"""
+    if Image is None:
+        return []
+    return [name for name in FORMATS if features.check(name)]
+
+
+def resize(source, width, output_format):
+    """Encode ``source`` at most ``width`` pixels wide, without EXIF or other metadata"""
+    with Image.open(source) as image:
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "transparency" in image.info or image.mode in ("LA", "P") else "RGB")
+        if image.width > width:
+            image = image.resize((width, round(image.height * width / image.width)), Image.LANCZOS)
+        pillow_format, options, _media_type = FORMATS[output_format]
+        buffer = io.BytesIO()
+        image.save(buffer, pillow_format, **options)
+        return buffer.getvalue()
+
+
+def build_images(images_dir=IMAGES_DIR, build_dir=BUILD_DIR, widths=IMAGE_WIDTHS):
+    """Write resized AVIF/WebP variants of every image to build_dir, plus images.json.
+
+    Variant names carry a hash of the source, so they can be served as
+    immutable. Widths wider than the source are skipped (the source width
+    is used instead), so images are never upscaled.
+    """
+    formats = available_formats()
+    manifest = {}
+    for path in sorted(images_dir.iterdir()):
+        if path.suffix.lower() not in IMAGE_SUFFIXES:
+            continue
+        digest = fingerprint(path.read_bytes())
+        with Image.open(path) as image:
+            original_width, original_height = ImageOps.exif_transpose(image).size
+        sizes = sorted({min(width, original_width) for width in widths})
+        name = path.relative_to(STATIC_DIR).as_posix()
+        entry = {"width": original_width, "height": original_height, "variants": {}}
+        for output_format in formats:
+            variants = []
+            for width in sizes:
+                target = build_dir / "images" / f"{path.stem}.{digest}.{width}.{output_format}"
+                if not target.exists():
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    target.write_bytes(resize(path, width, output_format))
+                variants.append([width, target.relative_to(build_dir).as_posix()])
+            entry["variants"][output_format] = variants
+        manifest[name] = entry
+
+    build_dir.mkdir(parents=True, exist_ok=True)
+    (build_dir / IMAGE_MANIFEST_PATH.name).write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    return manifest
+
+
+class ImageManifest:
+    """Resolves images to srcset data from images.json (empty without a build)"""
+
+    def __init__(self, path=IMAGE_MANIFEST_PATH):
+        self.path = path
+        self._entries = None
+
+    @property
+    def entries(self):
+        if self._entries is None:
+            try:
+                self._entries = json.loads(self.path.read_text())
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def srcsets(self):
+        """{"/static/images/x.jpg": {"webp": "url 320w, ...", ...}} for scripts"""
+        return {
+            f"/static/{name}": {
+                output_format: ", ".join(f"{BUILD_URL}/{path} {width}w" for width, path in variants)
+                for output_format, variants in entry["variants"].items()
+            }
+            for name, entry in self.entries.items()
+        }
+
+    def sources(self, name, sizes="100vw"):
+        """<source> tags for a <picture>, best format first ("" if the image wasn't built)"""
+        srcsets = self.srcsets().get(f"/static/{name}", {})
+        return Markup("\n".join(
+            f'<source type="{FORMATS[output_format][2]}" srcset="{html.escape(srcsets[output_format])}" sizes="{html.escape(sizes)}">'
+            for output_format in FORMATS if output_format in srcsets
+        ))
+
+    def srcsets_json(self):
+        """srcsets() as JSON that is safe inside a <script> element"""
+        return Markup(json.dumps(self.srcsets(), sort_keys=True).replace("</", "<\\/"))
+
+
+class ImageResizer:
+    """Resizes images on demand for widths the build didn't produce, caching them on disk.
+
+    Results are stored under ``cache_dir`` keyed by source path, source
+    modification time, width and format, so an edited image is re-encoded.
+    """
+
+    def __init__(self, images_dir=IMAGES_DIR, cache_dir=IMAGE_CACHE_DIR, max_width=IMAGE_MAX_WIDTH):
+        self.images_dir = images_dir.resolve()
+        self.cache_dir = cache_dir
+        self.max_width = max_width
+
+    def source(self, name):
+        """Path of an image under the images directory, or None"""
+        path = (self.images_dir / name).resolve()
+        if self.images_dir not in path.parents or path.suffix.lower() not in IMAGE_SUFFIXES or not path.is_file():
+            return None
+        return path
+
+    def snap_width(self, width):
+        return min(self.max_width, -(-width // WIDTH_STEP) * WIDTH_STEP)
+
+    def cache_path(self, source, width, output_format):
+        key = f"{source}:{source.stat().st_mtime_ns}:{width}:{output_format}"
+        return self.cache_dir / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()[:24]}.{output_format}"
+
+    def render(self, source, width, output_format):
+        """Resize into the disk cache (blocking; run in a thread) and return the cached path"""
+        target = self.cache_path(source, width, output_format)
+        if not target.exists():
+            target.parent.mkdir(parents=True, exist_ok=True)
+            partial = target.with_name(target.name + ".tmp")
+            partial.write_bytes(resize(source, width, output_format))
+            partial.replace(target)
+        return target
@@ -0,0 +1,212 @@
+# app/services/job_description.py
+import hashlib
+import math
+import os
+import re
+
+from services.tokens import CHARS_PER_TOKEN, estimate_tokens
+
+# Large job description handling (override via environment / .env)
+JOB_MAX_PROMPT_TOKENS = int(os.getenv("JOB_MAX_PROMPT_TOKENS", "1500"))
+JOB_CHUNK_TOKENS = int(os.getenv("JOB_CHUNK_TOKENS", "1000"))
+JOB_MAX_CHUNKS = int(os.getenv("JOB_MAX_CHUNKS", "4"))
+
+# Lines that vary between copies of the same posting without changing the job
+_BOILERPLATE_LINES = [
+    re.compile(pattern, re.IGNORECASE) for pattern in (
+        r"^(apply|click)\b.*\b(now|here|below|apply)\b",
+        r"^(share|save) (this )?(job|role|position)\b",
+        r"^posted\b.*\bago$",
+        r"^\d+\+? (applicants|applications)\b",
+        r"^(easy apply|apply now|see more|show more|show less)$",
+        r"^#li-\w+$",
+        r"^(job|reference|ref|req(uisition)?)( id| number| no\.?)?\s*[:#]",
+    )
+]
+_WHITESPACE = re.compile(r"\s+")
+
+# Section headings whose whole section says nothing about the job itself
+_BOILERPLATE_HEADINGS = re.compile(
+    r"^(about (us|the company|our company)|who we are|our (story|mission|values|culture)"
+    r"|(benefits|perks)\b|what we offer|why (join|work)|how to apply"
+    r"|(equal (employment )?opportunit|eeo\b|diversity|inclusion)"
+    r"|(legal|privacy|disclaimer|accommodations?|e-verify|recruitment fraud)\b"
+    r"|(salary|compensation|pay range)\b)",
+    re.IGNORECASE,
+)
+
+# Section headings that start the job content again after a boilerplate section
+_JOB_HEADINGS = re.compile(
+    r"^(about (the|this) (role|job|position|team)|the (role|job|position|opportunity)|role\b|job\b"
+    r"|(key )?(responsibilit|dut|accountabilit)|what you('ll| will) (do|be doing|bring|need)"
+    r"|(requirement|qualification|skill|experience|competenc)|(essential|desirable|required|preferred)\b"
+    r"|(must|nice) to have|who you are|what we('re| are) looking for|you (have|bring|will)"
+    r"|(tech(nology|nical)?|our) stack|tools|day[- ]to[- ]day|your (role|impact|responsibilities))",
+    re.IGNORECASE,
+)
+
+# Stand-alone legal sentences that turn up outside of a heading too
+_BOILERPLATE_PHRASES = re.compile(
+    r"equal (employment )?opportunity employer|without regard to|reasonable accommodation"
+    r"|e-verify|protected veteran|we are committed to (diversity|inclusion|equal)",
+    re.IGNORECASE,
+)
+_BULLET = " \t-•*·"
+_BULLET_START = re.compile(r"[-•·]|\*(?!\*)")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def normalize_job_description(text):
+    """Lower-case, collapse whitespace and drop job-board boilerplate lines"""
+    lines = []
+    for raw_line in text.splitlines():
+        line = _WHITESPACE.sub(" ", raw_line).strip(" \t-•*·").lower()
+        if not line or any(pattern.search(line) for pattern in _BOILERPLATE_LINES):
+            continue
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def job_fingerprint(text, version):
+    """Content hash of a job description, folded together with the profile version"""
+    digest = hashlib.sha256()
+    digest.update(version.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(normalize_job_description(text).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _heading_text(line):
+    """A heading without markdown emphasis or a trailing colon ("**Benefits:**" -> "Benefits")"""
+    return line.strip("#*_ ").rstrip(":*_ ").strip()
+
+
+def _is_heading(line):
+    """Short, unpunctuated, non-bullet lines ("Benefits", "What you'll do:")"""
+    return (
+        len(line) <= 60
+        and not _BULLET_START.match(line)
+        and not line.rstrip(":").endswith((".", ",", ";"))
+        and len(line.split()) <= 8
+    )
+
+
+class JobDescriptionPreprocessor:
+    """Trims pasted job descriptions before they reach a prompt.
+
+    clean() drops boilerplate sections (benefits, about us, EEO / legal
+    statements) and repeated lines; chunk() splits what is left into
+    prompt-sized pieces for map-reduce analysis. Input and trimmed sizes are
+    counted for /api/chatbot/stats.
+    """
+
+    def __init__(
+        self,
+        max_prompt_tokens=JOB_MAX_PROMPT_TOKENS,
+        chunk_tokens=JOB_CHUNK_TOKENS,
+        max_chunks=JOB_MAX_CHUNKS,
+    ):
+        self.max_prompt_tokens = max_prompt_tokens
+        self.chunk_tokens = chunk_tokens
+        self.max_chunks = max_chunks
+        self._counters = {
+            "processed": 0,
+            "input_chars": 0,
+            "cleaned_chars": 0,
+            "boilerplate_lines": 0,
+            "duplicate_lines": 0,
+            "chunked": 0,
+            "chunks": 0,
+        }
+
+    def clean(self, text):
+        """Job description without boilerplate sections and duplicate lines.
+
+        A boilerplate heading skips everything after it (short lines such as
+        "25 days annual leave" included) until a block opens with a job
+        heading ("Requirements", "What you'll do") or a line ends in ":".
+        """
+        kept, seen, skipping, block_start = [], set(), False, True
+        for raw_line in text.splitlines():
+            line = raw_line.strip()
+            if not line:
+                if kept and kept[-1]:
+                    kept.append("")
+                block_start = True
+                continue
+            opens_block, block_start = block_start, False
+            if _is_heading(line):
+                heading = _heading_text(line)
+                if _BOILERPLATE_HEADINGS.search(heading):
+                    skipping = True
+                elif skipping and (line.rstrip("*_ ").endswith(":") or (opens_block and _JOB_HEADINGS.search(heading))):
+                    skipping = False
+                if skipping:
+                    self._counters["boilerplate_lines"] += 1
+                    continue
+            key = _WHITESPACE.sub(" ", line.strip(_BULLET)).lower()
+            if (
+                skipping
+                or _BOILERPLATE_PHRASES.search(line)
+                or any(pattern.search(key) for pattern in _BOILERPLATE_LINES)
+            ):
+                self._counters["boilerplate_lines"] += 1
+                continue
+            if key in seen:
+                self._counters["duplicate_lines"] += 1
+                continue
+            seen.add(key)
+            kept.append(line)
+
+        cleaned = "\n".join(kept).strip()
+        self._counters["processed"] += 1
+        self._counters["input_chars"] += len(text)
+        self._counters["cleaned_chars"] += len(cleaned)
+        return cleaned
+
+    def needs_chunking(self, text):
+        return estimate_tokens(text) > self.max_prompt_tokens
+
+    def chunk(self, text):
+        """Split on line boundaries into at most max_chunks pieces of about chunk_tokens each"""
+        target = max(self.chunk_tokens, math.ceil(estimate_tokens(text) / self.max_chunks))
+        chunks, current, used = [], [], 0
+        for line in self._lines(text, target):
+            tokens = estimate_tokens(line) + 1
+            if current and used + tokens > target:
+                chunks.append("\n".join(current).strip())
+                current, used = [], 0
+            current.append(line)
+            used += tokens
+        if current:
+            chunks.append("\n".join(current).strip())
+
+        chunks = [chunk for chunk in chunks if chunk]
+        if len(chunks) > self.max_chunks:
+            # Line boundaries can overshoot; fold the remainder into the last chunk
+            chunks[self.max_chunks - 1:] = ["\n".join(chunks[self.max_chunks - 1:])]
+        self._counters["chunked"] += 1
+        self._counters["chunks"] += len(chunks)
+        return chunks
+
+    def _lines(self, text, target):
+        """Lines of the text, with any single line longer than a chunk split into sentences"""
+        for line in text.splitlines():
+            if estimate_tokens(line) <= target:
+                yield line
+                continue
+            for sentence in _SENTENCE_END.split(line):
+                limit = target * CHARS_PER_TOKEN
+                for start in range(0, len(sentence), limit):
+                    yield sentence[start:start + limit]
+
+    def stats(self):
+        processed = self._counters["processed"]
+        input_chars = self._counters["input_chars"]
+        return {
+            "max_prompt_tokens": self.max_prompt_tokens,
+            "avg_input_chars": round(input_chars / processed) if processed else 0,
+            "avg_cleaned_chars": round(self._counters["cleaned_chars"] / processed) if processed else 0,
+            "trimmed_ratio": round(1 - self._counters["cleaned_chars"] / input_chars, 3) if input_chars else 0.0,
+            **self._counters,
+        }
@@ -0,0 +1,207 @@
+# app/services/model_router.py
+import asyncio
+import os
+import time
+from collections import deque
+
+# Routing settings (override via environment / .env)
+GEMINI_HEDGE_ENABLED = os.getenv("GEMINI_HEDGE_ENABLED", "true").lower() in ("1", "true", "yes")
+GEMINI_ROUTER_WINDOW = int(os.getenv("GEMINI_ROUTER_WINDOW", "100"))
+GEMINI_ROUTER_MAX_ERROR_RATE = float(os.getenv("GEMINI_ROUTER_MAX_ERROR_RATE", "0.5"))
+GEMINI_ROUTER_PROBE_SECONDS = float(os.getenv("GEMINI_ROUTER_PROBE_SECONDS", "30"))
+
+# Latency samples needed before a model's p95 is trusted for hedging
+MIN_SAMPLES = 5
+
+
+class ModelStats:
+    """Rolling latency and error-rate window for one model.
+
+    Only full completions feed ``latencies`` (used for ranking and the hedge
+    threshold); a streamed call returns after its first chunk, so its
+    time-to-first-chunk is kept apart in ``first_chunk``.
+    """
+
+    def __init__(self, window=GEMINI_ROUTER_WINDOW):
+        self.latencies = deque(maxlen=window)
+        self.first_chunk = deque(maxlen=window)
+        self.outcomes = deque(maxlen=window)
+        self.last_attempt = 0.0
+        self.counters = {"routed": 0, "hedged_to": 0, "hedge_wins": 0, "errors": 0, "probes": 0}
+
+    def record(self, seconds, stream=False):
+        (self.first_chunk if stream else self.latencies).append(seconds)
+        self.outcomes.append(True)
+
+    def recover(self):
+        """A probe succeeded: forget the errors that demoted this model"""
+        self.outcomes.clear()
+        self.outcomes.append(True)
+
+    def record_error(self):
+        self.outcomes.append(False)
+        self.counters["errors"] += 1
+
+    def percentile(self, fraction):
+        if len(self.latencies) < MIN_SAMPLES:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def error_rate(self):
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+    def snapshot(self):
+        p50, p95 = self.percentile(0.5), self.percentile(0.95)
+        first_chunk = sorted(self.first_chunk)
+        return {
+            "samples": len(self.latencies),
+            "stream_samples": len(first_chunk),
+            "first_chunk_p50_ms": round(first_chunk[len(first_chunk) // 2] * 1000, 1) if first_chunk else None,
+            "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            "error_rate": round(self.error_rate(), 3),
+            **self.counters,
+        }
+
+
+class ModelRouter:
+    """Routes each Gemini call to the best-performing model.
+
+    Looks like a single GenerativeModel to callers (generate_content_async).
+    Models are ranked healthy-first (error rate below ``max_error_rate``),
+    then by rolling p50 latency; unmeasured models keep their preference
+    order. With hedging on, a call still running past the primary's p95
+    starts the same request on the runner-up; the first success wins and
+    the other is cancelled. Streaming calls are routed but never hedged.
+
+    A hedge is an extra upstream call, so it needs a free slot of its own
+    from ``scheduler`` (taken only when nobody is queued); without one the
+    call just waits for the primary. A demoted model is sent a probe at
+    most every ``probe_interval`` seconds, falling back to the normal route
+    if it fails; a successful probe clears its error window.
+    """
+
+    def __init__(self, models, hedge=GEMINI_HEDGE_ENABLED, max_error_rate=GEMINI_ROUTER_MAX_ERROR_RATE,
+                 scheduler=None, probe_interval=GEMINI_ROUTER_PROBE_SECONDS):
+        self.models = dict(models)
+        self.hedge = hedge
+        self.max_error_rate = max_error_rate
+        self.scheduler = scheduler
+        self.probe_interval = probe_interval
+        self._order = list(self.models)
+        self._stats = {name: ModelStats() for name in self.models}
+        self._counters = {"requests": 0, "hedged": 0, "hedge_wins": 0, "hedges_skipped": 0, "probes": 0}
+
+    def unhealthy(self, name):
+        return self._stats[name].error_rate() >= self.max_error_rate
+
+    def ranked(self):
+        def key(name):
+            stats = self._stats[name]
+            p50 = stats.percentile(0.5)
+            return (
+                self.unhealthy(name),
+                p50 if p50 is not None else float("inf"),
+                self._order.index(name),
+            )
+        return sorted(self._order, key=key)
+
+    @property
+    def primary(self):
+        return self.ranked()[0]
+
+    async def generate_content_async(self, prompt, stream=False):
+        self._counters["requests"] += 1
+        ranked = self.ranked()
+        probe = self._probe_candidate(ranked)
+        if probe is not None:
+            try:
+                response = await self._attempt(probe, prompt, stream)
+            except Exception:
+                pass  # still failing; serve this call from the normal route
+            else:
+                self._stats[probe].recover()
+                print(f"✅ Gemini model {probe} recovered, routing to it again")
+                return response
+
+        primary = ranked[0]
+        self._stats[primary].counters["routed"] += 1
+
+        hedge_after = self._stats[primary].percentile(0.95)
+        if stream or not self.hedge or len(ranked) < 2 or hedge_after is None:
+            return await self._attempt(primary, prompt, stream)
+        return await self._hedged(primary, ranked[1], prompt, hedge_after)
+
+    def _probe_candidate(self, ranked):
+        """A demoted model due a probe, if any (claimed at once so concurrent calls don't all probe it)"""
+        now = time.monotonic()
+        for name in ranked[1:]:
+            stats = self._stats[name]
+            if self.unhealthy(name) and now - stats.last_attempt >= self.probe_interval:
+                stats.last_attempt = now
+                stats.counters["probes"] += 1
+                self._counters["probes"] += 1
+                return name
+        return None
+
+    async def _attempt(self, name, prompt, stream=False):
+        started = self._stats[name].last_attempt = time.monotonic()
+        try:
+            response = await self.models[name].generate_content_async(prompt, stream=stream)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self._stats[name].record_error()
+            raise
+        self._stats[name].record(time.monotonic() - started, stream)
+        return response
+
+    async def _hedge_attempt(self, name, prompt):
+        try:
+            return await self._attempt(name, prompt)
+        finally:
+            self.scheduler.release()
+
+    async def _hedged(self, primary, fallback, prompt, hedge_after):
+        primary_task = asyncio.create_task(self._attempt(primary, prompt))
+        hedge_task = None
+        try:
+            done, _pending = await asyncio.wait({primary_task}, timeout=hedge_after)
+            if done:
+                return primary_task.result()
+            if self.scheduler is not None and not self.scheduler.try_acquire():
+                # Every upstream slot is busy (or spoken for): don't exceed the concurrency cap
+                self._counters["hedges_skipped"] += 1
+                return await primary_task
+
+            self._counters["hedged"] += 1
+            self._stats[fallback].counters["hedged_to"] += 1
+            hedge_task = asyncio.create_task(
+                self._hedge_attempt(fallback, prompt) if self.scheduler is not None else self._attempt(fallback, prompt)
+            )
+            pending = {primary_task, hedge_task}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge_task:
+                            self._counters["hedge_wins"] += 1
+                            self._stats[fallback].counters["hedge_wins"] += 1
+                        return task.result()
+            # Both failed: surface the primary's error
+            return primary_task.result()
+        finally:
+            for task in (primary_task, hedge_task):
+                if task is not None and not task.done():
+                    task.cancel()
+
+    def stats(self):
+        return {
+            "primary": self.primary,
+            "hedging": self.hedge,
+            **self._counters,
+            "models": {name: self._stats[name].snapshot() for name in self._order},
+        }
@@ -0,0 +1,126 @@
+# app/services/page_cache.py
+import gzip
+import hashlib
+import os
+import time
+from pathlib import Path
+
+from fastapi.responses import Response
+
+try:
+    import brotli
+except ImportError:  # optional: pages are still served gzip-compressed
+    brotli = None
+
+# How often template files are checked for edits (override via environment / .env)
+PAGE_CACHE_CHECK_SECONDS = float(os.getenv("PAGE_CACHE_CHECK_SECONDS", "2"))
+
+# Pages are revalidated on every visit; unchanged ones cost a 304
+CACHE_CONTROL = "no-cache"
+
+
+def accepted_encodings(header):
+    """Content codings the client accepts (q > 0), from an Accept-Encoding header"""
+    encodings = set()
+    for part in (header or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = params.strip()
+        if quality.startswith("q="):
+            try:
+                if float(quality[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        if coding:
+            encodings.add(coding.strip().lower())
+    return encodings
+
+
+class RenderedPage:
+    """A rendered body (a page, or a JSON document) as bytes, with compressed variants and ETags"""
+
+    def __init__(self, text):
+        self.variants = {"identity": text.encode("utf-8")}
+        self.variants["gzip"] = gzip.compress(self.variants["identity"], compresslevel=9, mtime=0)
+        if brotli is not None:
+            self.variants["br"] = brotli.compress(self.variants["identity"], quality=11)
+        tag = hashlib.sha256(self.variants["identity"]).hexdigest()[:20]
+        self.etags = {
+            encoding: f'"{tag}"' if encoding == "identity" else f'"{tag}-{encoding}"'
+            for encoding in self.variants
+        }
+
+    def negotiate(self, accept_encoding):
+        accepted = accepted_encodings(accept_encoding)
+        for encoding in ("br", "gzip"):
+            if encoding in self.variants and (encoding in accepted or "*" in accepted):
+                return encoding
+        return "identity"
+
+    def matches(self, if_none_match):
+        """True if If-None-Match names any variant of this page"""
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return not tags.isdisjoint(self.etags.values())
+
+
+def respond(request, page, media_type="text/html"):
+    """Response for a RenderedPage: 304 if the client's copy is current, else the negotiated variant"""
+    encoding = page.negotiate(request.headers.get("accept-encoding"))
+    headers = {"ETag": page.etags[encoding], "Cache-Control": CACHE_CONTROL, "Vary": "Accept-Encoding"}
+    if page.matches(request.headers.get("if-none-match")):
+        return Response(status_code=304, headers=headers)
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(page.variants[encoding], media_type=media_type, headers=headers)
+
+
+class PageCache:
+    """Serves static Jinja pages from pre-rendered, pre-compressed bytes.
+
+    A page is rendered on first use (or by ``warm``) and kept until a file
+    under the templates directory changes; edits are noticed by comparing
+    file mtimes at most every ``check_interval`` seconds. Responses carry a
+    strong ETag per encoding, so conditional requests get a 304 without
+    touching the template.
+    """
+
+    def __init__(self, templates, check_interval=PAGE_CACHE_CHECK_SECONDS):
+        self.templates = templates
+        self.directory = Path(templates.env.loader.searchpath[0])
+        self.check_interval = check_interval
+        self._pages = {}
+        self._signature = None
+        self._checked_at = 0.0
+
+    def warm(self, names):
+        """Render pages ahead of the first request"""
+        for name in names:
+            self.page(name)
+
+    def page(self, name):
+        self._check_templates()
+        page = self._pages.get(name)
+        if page is None:
+            page = self._pages[name] = RenderedPage(self.templates.get_template(name).render())
+        return page
+
+    def respond(self, request, name):
+        return respond(request, self.page(name))
+
+    def _check_templates(self):
+        now = time.monotonic()
+        if self._pages and now - self._checked_at < self.check_interval:
+            return
+        self._checked_at = now
+        signature = tuple(sorted(
+            (str(path), path.stat().st_mtime_ns) for path in self.directory.rglob("*.html")
+        ))
+        if signature != self._signature:
+            if self._signature is not None:
+                print("🔄 Templates changed, re-rendering pages")
+            self._pages.clear()
+            self._signature = signature
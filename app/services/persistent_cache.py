@@ -0,0 +1,272 @@
+# app/services/persistent_cache.py
+import asyncio
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+# Disk cache tier (override via environment / .env); an empty path disables it
+RESPONSE_CACHE_DB = os.getenv("RESPONSE_CACHE_DB", "data/response_cache.db")
+RESPONSE_CACHE_DB_MAX_MB = float(os.getenv("RESPONSE_CACHE_DB_MAX_MB", "64"))
+RESPONSE_CACHE_DB_READ_TIMEOUT_SECONDS = float(os.getenv("RESPONSE_CACHE_DB_READ_TIMEOUT_SECONDS", "0.25"))
+
+# Pending writes kept for the writer thread before new ones are dropped
+MAX_PENDING_WRITES = 1000
+
+# Eviction trims the database to this fraction of its size budget
+EVICT_TO = 0.9
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    version TEXT NOT NULL,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at);
+"""
+
+_STOP = object()
+
+
+class PersistentCache:
+    """SQLite (WAL) response store that survives restarts and redeploys.
+
+    Reads run in a worker thread with their own connection and give up
+    after ``read_timeout`` so a slow disk never holds up a request. Writes,
+    LRU touches and invalidations are queued and applied in batches by a
+    single writer thread (write-behind); if the queue is full they are
+    dropped, since the in-memory tier already has the value. The database
+    is kept under ``max_bytes`` of stored values by evicting the least
+    recently read rows. Entries carry the profile version they were
+    generated for and are only returned for that version.
+    """
+
+    def __init__(self, path=RESPONSE_CACHE_DB, max_bytes=int(RESPONSE_CACHE_DB_MAX_MB * 1024 * 1024),
+                 read_timeout=RESPONSE_CACHE_DB_READ_TIMEOUT_SECONDS):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.read_timeout = read_timeout
+        self.enabled = False
+        self._queue = queue.Queue(maxsize=MAX_PENDING_WRITES)
+        self._writer = None
+        self._readers = threading.local()
+        self._size = {"entries": 0, "bytes": 0}
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "writes": 0,
+            "dropped_writes": 0,
+            "evictions": 0,
+            "invalidated": 0,
+            "errors": 0,
+        }
+
+    def start(self):
+        """Open the database and start the writer thread (no-op without a path)"""
+        if not self.path or self.enabled:
+            return
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = self._connect()
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(_SCHEMA)
+            connection.execute("DELETE FROM responses WHERE expires_at < ?", (time.time(),))
+            connection.commit()
+            self._refresh_size(connection)
+        except (OSError, sqlite3.Error) as error:
+            print(f"⚠️  Disk response cache disabled ({self.path}): {error}")
+            return
+        self.enabled = True
+        self._writer = threading.Thread(target=self._write_loop, args=(connection,), name="response-cache-writer", daemon=True)
+        self._writer.start()
+        print(f"✅ Disk response cache at {self.path} ({self._size['entries']} entries)")
+
+    def stop(self, timeout=5):
+        """Flush queued writes and stop the writer thread"""
+        if not self.enabled:
+            return
+        self.enabled = False
+        self._queue.put(_STOP)
+        self._writer.join(timeout)
+
+    async def get(self, namespace, key, version):
+        """Stored value for key under this profile version, or None (also on a slow or failed read)"""
+        if not self.enabled:
+            return None
+        try:
+            value = await asyncio.wait_for(
+                asyncio.to_thread(self._read, namespace, key, version), self.read_timeout
+            )
+        except asyncio.TimeoutError:
+            value = None
+        except sqlite3.Error as error:
+            self._counters["errors"] += 1
+            print(f"⚠️  Disk response cache read failed: {error}")
+            value = None
+        if value is None:
+            self._counters["misses"] += 1
+            return None
+        self._counters["hits"] += 1
+        self._enqueue(("touch", namespace, key, time.time()))
+        return value
+
+    def put(self, namespace, key, version, value, ttl):
+        """Queue a value to be written; never blocks"""
+        if self.enabled:
+            self._enqueue(("put", namespace, key, version, value, time.time() + ttl))
+
+    def invalidate(self, namespace, version):
+        """Queue removal of a namespace's entries from other profile versions"""
+        if self.enabled:
+            self._enqueue(("invalidate", namespace, version))
+
+    def _enqueue(self, operation):
+        try:
+            self._queue.put_nowait(operation)
+        except queue.Full:
+            self._counters["dropped_writes"] += 1
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path, timeout=1.0, check_same_thread=False)
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def _read(self, namespace, key, version):
+        connection = getattr(self._readers, "connection", None)
+        if connection is None:
+            connection = self._readers.connection = self._connect()
+        row = connection.execute(
+            "SELECT value FROM responses WHERE namespace = ? AND key = ? AND version = ? AND expires_at >= ?",
+            (namespace, key, version, time.time()),
+        ).fetchone()
+        return row[0] if row else None
+
+    def _write_loop(self, connection):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < MAX_PENDING_WRITES:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = any(operation is _STOP for operation in batch)
+            try:
+                with connection:
+                    for operation in batch:
+                        if operation is not _STOP:
+                            self._apply(connection, operation)
+                    if self._size["bytes"] > self.max_bytes:
+                        self._evict(connection)
+            except sqlite3.Error as error:
+                self._counters["errors"] += 1
+                print(f"⚠️  Disk response cache write failed: {error}")
+            if stop:
+                connection.close()
+                return
+
+    def _apply(self, connection, operation):
+        kind = operation[0]
+        if kind == "put":
+            _kind, namespace, key, version, value, expires_at = operation
+            size = len(value.encode("utf-8"))
+            previous = connection.execute(
+                "SELECT size FROM responses WHERE namespace = ? AND key = ?", (namespace, key)
+            ).fetchone()
+            connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (namespace, key, version, value, size, expires_at, time.time()),
+            )
+            if previous:
+                self._size["bytes"] += size - previous[0]
+            else:
+                self._size["entries"] += 1
+                self._size["bytes"] += size
+            self._counters["writes"] += 1
+        elif kind == "touch":
+            _kind, namespace, key, accessed_at = operation
+            connection.execute(
+                "UPDATE responses SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                (accessed_at, namespace, key),
+            )
+        elif kind == "invalidate":
+            _kind, namespace, version = operation
+            removed = connection.execute(
+                "DELETE FROM responses WHERE namespace = ? AND version != ?", (namespace, version)
+            ).rowcount
+            if removed:
+                self._counters["invalidated"] += removed
+                self._refresh_size(connection)
+
+    def _evict(self, connection):
+        """Drop least recently read rows until the stored values fit the budget again"""
+        target = self.max_bytes * EVICT_TO
+        connection.execute("DELETE FROM responses WHERE expires_at < ?", (time.time(),))
+        self._refresh_size(connection)
+        freed, doomed = 0, []
+        excess = self._size["bytes"] - target
+        for namespace, key, size in connection.execute(
+            "SELECT namespace, key, size FROM responses ORDER BY accessed_at"
+        ):
+            if freed >= excess:
+                break
+            doomed.append((namespace, key))
+            freed += size
+        connection.executemany("DELETE FROM responses WHERE namespace = ? AND key = ?", doomed)
+        self._counters["evictions"] += len(doomed)
+        self._refresh_size(connection)
+
+    def _refresh_size(self, connection):
+        entries, size = connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        self._size = {"entries": entries, "bytes": size}
+
+    def stats(self):
+        lookups = self._counters["hits"] + self._counters["misses"]
+        return {
+            "enabled": self.enabled,
+            "path": self.path or None,
+            "entries": self._size["entries"],
+            "size_bytes": self._size["bytes"],
+            "max_bytes": self.max_bytes,
+            "pending_writes": self._queue.qsize(),
+            "hit_rate": round(self._counters["hits"] / lookups, 3) if lookups else 0.0,
+            **self._counters,
+        }
+
+
+class TieredCache:
+    """An in-memory ResponseCache backed by a PersistentCache namespace.
+
+    Lookups try memory first and promote disk hits into memory; stores go
+    to memory immediately and to disk through the write-behind queue.
+    """
+
+    def __init__(self, memory, disk, namespace):
+        self.memory = memory
+        self.disk = disk
+        self.namespace = namespace
+
+    def use_version(self, version):
+        """Switch profile version in both tiers (stale disk rows are removed in the background)"""
+        if version != self.memory.version:
+            self.disk.invalidate(self.namespace, version)
+        self.memory.use_version(version)
+
+    async def get(self, key):
+        value = self.memory.get(key)
+        if value is None:
+            value = await self.disk.get(self.namespace, key, self.memory.version)
+            if value is not None:
+                self.memory.set(key, value)
+        return value
+
+    def set(self, key, value):
+        self.memory.set(key, value)
+        self.disk.put(self.namespace, key, self.memory.version, value, self.memory.ttl)
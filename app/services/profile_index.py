@@ -0,0 +1,203 @@
+# app/services/profile_index.py
+import html
+import math
+import os
+import re
+from collections import Counter
+
+from services.tokens import estimate_tokens
+
+# Retrieval settings (override via environment / .env)
+PROFILE_RETRIEVAL = os.getenv("PROFILE_RETRIEVAL", "true").lower() in ("1", "true", "yes")
+PROFILE_TOP_K = int(os.getenv("PROFILE_TOP_K", "4"))
+PROFILE_TOKEN_BUDGET = int(os.getenv("PROFILE_TOKEN_BUDGET", "600"))
+PROFILE_JOB_TOP_K = int(os.getenv("PROFILE_JOB_TOP_K", "8"))
+PROFILE_JOB_TOKEN_BUDGET = int(os.getenv("PROFILE_JOB_TOKEN_BUDGET", "1200"))
+
+_HEADER = re.compile(r"^([A-Z][A-Z &/]+?)(\s*\(.*\))?:\s*$")
+_ENTRY = re.compile(r"^\d+\.\s")
+_TOKEN = re.compile(r"[a-z0-9+#]+")
+_URL = re.compile(r"https?://\S+")
+# Question filler and words that refer to Muhammad himself; "about" would otherwise
+# pull in the "About Me:" line and "him" / "farhan" the PERSONAL INFO section
+_STOPWORDS = frozenset(
+    "a about an and any are as at be been by can could describe did do does farhan for from "
+    "give has have he her him his how i in is it its know knows me more muhammad my of on or "
+    "please share she show some tell that the their them there these they this those to us "
+    "was we what when where which who with would you your".split()
+)
+
+
+def tokenize(text):
+    return [token for token in _TOKEN.findall(text.lower()) if token not in _STOPWORDS]
+
+
+class ProfileSection:
+    __slots__ = ("order", "header", "body", "tokens")
+
+    def __init__(self, order, header, body):
+        self.order = order
+        self.header = header
+        self.body = body
+        self.tokens = estimate_tokens(f"{header}\n{body}")
+
+
+def split_profile(profile):
+    """Split the profile into retrievable sections.
+
+    Each header (``TOP SKILLS:``) starts a section; numbered entries inside a
+    section (experience roles, projects) become sections of their own, and any
+    trailing notes under the header are kept with every entry.
+    """
+    preamble, blocks = [], []
+    for line in profile.strip().splitlines():
+        if _HEADER.match(line):
+            blocks.append((line.strip(), []))
+        elif blocks:
+            blocks[-1][1].append(line)
+        elif line.strip():
+            preamble.append(line.strip())
+
+    sections = []
+    for header, lines in blocks:
+        entries, notes = [], []
+        for line in lines:
+            if _ENTRY.match(line):
+                entries.append([line])
+            elif entries and line.startswith((" ", "\t")):
+                entries[-1].append(line)
+            elif line.strip():
+                notes.append(line)
+
+        if entries:
+            for entry in entries:
+                body = "\n".join(entry + notes).strip()
+                sections.append(ProfileSection(len(sections), header, body))
+        elif notes:
+            sections.append(ProfileSection(len(sections), header, "\n".join(notes).strip()))
+
+    return "\n".join(preamble), sections
+
+
+class ProfileIndex:
+    """BM25 index over profile sections, built once and queried per request"""
+
+    def __init__(self, profile, k1=1.5, b=0.75, header_boost=10.0):
+        self.profile = profile
+        self.k1 = k1
+        self.b = b
+        self.header_boost = header_boost
+        self.preamble, self.sections = split_profile(profile)
+
+        self._term_freqs = []
+        document_freqs = Counter()
+        for section in self.sections:
+            terms = Counter(tokenize(f"{section.header} {section.body}"))
+            self._term_freqs.append(terms)
+            document_freqs.update(terms.keys())
+
+        self._header_terms = [set(tokenize(section.header)) for section in self.sections]
+        self._lengths = [sum(terms.values()) for terms in self._term_freqs]
+        self._average_length = (sum(self._lengths) / len(self._lengths)) if self._lengths else 0.0
+        count = len(self.sections)
+        self._idf = {
+            term: math.log(1 + (count - freq + 0.5) / (freq + 0.5))
+            for term, freq in document_freqs.items()
+        }
+
+    def score(self, query):
+        """BM25 score of every section for the query, in section order.
+
+        Naming a section outright ("his projects", "certifications") boosts
+        every entry under that header.
+        """
+        query_terms = set(tokenize(query))
+        scores = []
+        for terms, header_terms, length in zip(self._term_freqs, self._header_terms, self._lengths):
+            score = self.header_boost if query_terms & header_terms else 0.0
+            norm = self.k1 * (1 - self.b + self.b * length / self._average_length) if self._average_length else self.k1
+            for term in query_terms:
+                freq = terms.get(term)
+                if freq:
+                    score += self._idf[term] * freq * (self.k1 + 1) / (freq + norm)
+            scores.append(score)
+        return scores
+
+    def select(self, query, top_k=PROFILE_TOP_K, token_budget=PROFILE_TOKEN_BUDGET):
+        """Top-k relevant sections that fit in the token budget, in profile order.
+
+        Entries under the same header share one of the k slots. Questions that
+        match nothing (greetings, "tell me about him") fall back to the leading
+        sections of the profile.
+        """
+        scores = self.score(query)
+        ranked = sorted(
+            (section for section, score in zip(self.sections, scores) if score > 0),
+            key=lambda section: scores[section.order],
+            reverse=True,
+        )
+        if not ranked:
+            ranked = list(self.sections)
+
+        chosen, headers, used = [], set(), estimate_tokens(self.preamble)
+        for section in ranked:
+            if section.header not in headers and len(headers) >= top_k:
+                continue
+            if used + section.tokens > token_budget:
+                continue
+            chosen.append(section)
+            headers.add(section.header)
+            used += section.tokens
+        return sorted(chosen, key=lambda section: section.order)
+
+    def context(self, query, top_k=PROFILE_TOP_K, token_budget=PROFILE_TOKEN_BUDGET):
+        """Render the selected sections as a compact profile block for a prompt"""
+        lines, header, seen = [self.preamble], None, set()
+        for section in self.select(query, top_k, token_budget):
+            if section.header != header:
+                lines.append("")
+                lines.append(section.header)
+                header, seen = section.header, set()
+            # Section notes are repeated on every entry; emit them once per header
+            for line in section.body.splitlines():
+                if line not in seen:
+                    seen.add(line)
+                    lines.append(line)
+        return "\n".join(lines)
+
+
+def _render_line(line):
+    stripped = line.strip()
+    if _ENTRY.match(stripped):
+        return f"<strong>{html.escape(stripped)}</strong>"
+    if stripped.startswith("-"):
+        indent = "&nbsp;&nbsp;&nbsp;" if line.startswith((" ", "\t")) else ""
+        return f"{indent}• {html.escape(stripped.lstrip('- ').strip())}"
+    return html.escape(stripped)
+
+
+def render_profile_excerpt(sections):
+    """Render selected profile sections as chatbot HTML (no model involved)"""
+    blocks, seen = [], set()
+    for section in sections:
+        if not blocks or blocks[-1][0] != section.header:
+            blocks.append((section.header, [], []))
+            seen = set()
+        _header, lines, links = blocks[-1]
+        for line in section.body.splitlines():
+            if not line.strip() or line in seen:
+                continue
+            seen.add(line)
+            url = _URL.search(line)
+            if url and not line.strip().startswith("-"):
+                # Section notes such as "give link for ... https://..." go last
+                links.append(f'<a href="{url.group(0)}">More details</a>')
+            else:
+                lines.append(_render_line(line))
+
+    return "<br><br>".join(
+        "<br>".join(
+            [f"<strong>{html.escape(header.rstrip(':').strip().capitalize())}</strong>"] + lines + links
+        )
+        for header, lines, links in blocks
+    )
@@ -0,0 +1,103 @@
+# app/services/project_catalogue.py
+import hashlib
+import json
+import os
+from pathlib import Path
+
+# Paging for the projects grid and /api/projects (override via environment / .env)
+PROJECTS_PER_PAGE = int(os.getenv("PROJECTS_PER_PAGE", "6"))
+MAX_PROJECTS_PER_PAGE = 24
+
+CATALOGUE_PATH = Path(__file__).parent.parent.absolute() / "content" / "projects.json"
+
+# Fields a grid card needs; features, challenges and results are only fetched for the detail modal
+CARD_FIELDS = ("id", "title", "category", "category_label", "image", "description", "tech", "link")
+
+
+def tech_key(name):
+    """Fold case and spacing so "github actions" finds "GitHub Actions" """
+    return " ".join(name.lower().split())
+
+
+class ProjectCatalogue:
+    """Project records loaded once from a JSON file and indexed by category and technology.
+
+    Each index maps a key to record positions, so a query intersects
+    those lists instead of scanning every project; results keep the
+    order of the file. ``version`` is a hash of the file, used to key
+    cached responses and ETags.
+    """
+
+    def __init__(self, path=CATALOGUE_PATH):
+        raw = Path(path).read_bytes()
+        data = json.loads(raw)
+        self.version = hashlib.sha256(raw).hexdigest()[:16]
+        self.categories = data["categories"]
+        labels = {category["id"]: category["label"] for category in self.categories}
+
+        self.projects = []
+        self.by_id = {}
+        self.by_category = {category: [] for category in labels}
+        self.by_tech = {}
+        self.tech_names = {}
+        for position, project in enumerate(data["projects"]):
+            if project["id"] in self.by_id:
+                raise ValueError(f"Duplicate project id in {path}: {project['id']}")
+            if project["category"] not in labels:
+                raise ValueError(f"Unknown category for project {project['id']}: {project['category']}")
+            project = {**project, "category_label": labels[project["category"]]}
+            self.projects.append(project)
+            self.by_id[project["id"]] = project
+            self.by_category[project["category"]].append(position)
+            for tech in project["tech"]:
+                self.by_tech.setdefault(tech_key(tech), []).append(position)
+                self.tech_names.setdefault(tech_key(tech), tech)
+
+        for category in self.categories:
+            category["count"] = len(self.by_category[category["id"]])
+        print(f"📁 Project catalogue: {len(self.projects)} projects, {len(self.by_tech)} technologies")
+
+    def get(self, project_id):
+        return self.by_id.get(project_id)
+
+    def card(self, project):
+        return {field: project[field] for field in CARD_FIELDS}
+
+    def indexed(self, category=None, tech=None):
+        """False when the category or technology is not in the index (so nothing can match)"""
+        if category and category != "all" and category not in self.by_category:
+            return False
+        return not tech or tech_key(tech) in self.by_tech
+
+    def _matches(self, category, tech):
+        positions = None
+        if category and category != "all":
+            positions = set(self.by_category.get(category, ()))
+        if tech:
+            matches = set(self.by_tech.get(tech_key(tech), ()))
+            positions = matches if positions is None else positions & matches
+        return range(len(self.projects)) if positions is None else sorted(positions)
+
+    def page_count(self, category=None, tech=None, per_page=PROJECTS_PER_PAGE):
+        return max(1, -(-len(self._matches(category, tech)) // per_page))
+
+    def query(self, category=None, tech=None, page=1, per_page=PROJECTS_PER_PAGE):
+        """One page of cards matching a category and/or technology ("all" or None matches everything)"""
+        ordered = self._matches(category, tech)
+        start = (page - 1) * per_page
+        return {
+            "items": [self.card(self.projects[position]) for position in ordered[start:start + per_page]],
+            "total": len(ordered),
+            "page": page,
+            "per_page": per_page,
+            "pages": max(1, -(-len(ordered) // per_page)),
+            "category": category or "all",
+            "tech": tech or None,
+        }
+
+    def technologies(self):
+        """Technologies with how many projects use each, most used first"""
+        return sorted(
+            ({"tech": self.tech_names[key], "count": len(positions)} for key, positions in self.by_tech.items()),
+            key=lambda entry: (-entry["count"], entry["tech"].lower()),
+        )
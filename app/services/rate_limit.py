@@ -0,0 +1,113 @@
+# app/services/rate_limit.py
+import math
+import os
+import time
+from collections import OrderedDict
+
+# Admission limits (override via environment / .env)
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() in ("1", "true", "yes")
+RATE_LIMIT_PER_MINUTE = float(os.getenv("RATE_LIMIT_PER_MINUTE", "10"))
+RATE_LIMIT_BURST = float(os.getenv("RATE_LIMIT_BURST", "5"))
+RATE_LIMIT_IP_PER_MINUTE = float(os.getenv("RATE_LIMIT_IP_PER_MINUTE", "30"))
+RATE_LIMIT_IP_BURST = float(os.getenv("RATE_LIMIT_IP_BURST", "10"))
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "10000"))
+
+
+class RateLimited(Exception):
+    """Raised when a request is refused before reaching Gemini"""
+
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = max(1, math.ceil(retry_after))
+
+
+class TokenBucketLimiter:
+    """Per-key token buckets: ``burst`` tokens, refilled at ``per_minute``.
+
+    Buckets are kept in LRU order and the least recently seen keys are
+    dropped beyond ``max_keys``; a dropped key simply starts with a full bucket.
+    A cost above ``burst`` (a large batch) is let through from a full bucket
+    and leaves it in debt, so the key waits until the whole cost is repaid.
+    """
+
+    def __init__(self, per_minute, burst, max_keys=RATE_LIMIT_MAX_KEYS):
+        self.rate = per_minute / 60.0
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._counters = {"allowed": 0, "limited": 0}
+
+    def _tokens(self, key, now):
+        tokens, updated = self._buckets.get(key, (self.burst, now))
+        return min(self.burst, tokens + (now - updated) * self.rate)
+
+    def wait_time(self, key, cost=1.0):
+        """Seconds until ``cost`` tokens would be allowed (0 = now); takes nothing"""
+        needed = min(cost, self.burst)
+        tokens = self._tokens(key, time.monotonic())
+        if tokens >= needed:
+            return 0.0
+        return (needed - tokens) / self.rate if self.rate > 0 else 60.0
+
+    def acquire(self, key, cost=1.0):
+        """Take ``cost`` tokens; return 0 if allowed, else seconds until it would be"""
+        wait = self.wait_time(key, cost)
+        if wait:
+            self._counters["limited"] += 1
+            return wait
+        now = time.monotonic()
+        tokens = self._tokens(key, now) - cost
+        self._buckets.pop(key, None)
+        self._buckets[key] = (tokens, now)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        self._counters["allowed"] += 1
+        return 0.0
+
+    def refuse(self):
+        """Count a request refused because of another limiter checked with this one"""
+        self._counters["limited"] += 1
+
+    def stats(self):
+        return {
+            "keys": len(self._buckets),
+            "per_minute": self.rate * 60,
+            "burst": self.burst,
+            **self._counters,
+        }
+
+
+class ClientRateLimiter:
+    """Session and client-IP buckets checked together in front of the chatbot APIs.
+
+    Both buckets are checked before either is charged, so a session retrying
+    past its own limit doesn't drain the bucket shared by everyone on its IP.
+    """
+
+    def __init__(self, enabled=RATE_LIMIT_ENABLED):
+        self.enabled = enabled
+        self.sessions = TokenBucketLimiter(RATE_LIMIT_PER_MINUTE, RATE_LIMIT_BURST)
+        self.clients = TokenBucketLimiter(RATE_LIMIT_IP_PER_MINUTE, RATE_LIMIT_IP_BURST)
+
+    def check(self, client_ip, session_id=None, cost=1.0):
+        """Raise RateLimited if the client IP or the session is over its limit"""
+        if not self.enabled:
+            return
+        buckets = [(self.clients, client_ip or "unknown")]
+        if session_id:
+            buckets.append((self.sessions, session_id))
+        waits = [limiter.wait_time(key, cost) for limiter, key in buckets]
+        if any(waits):
+            for (limiter, _key), wait in zip(buckets, waits):
+                if wait:
+                    limiter.refuse()
+            raise RateLimited("Too many requests", max(waits))
+        for limiter, key in buckets:
+            limiter.acquire(key, cost)
+
+    def stats(self):
+        return {
+            "enabled": self.enabled,
+            "sessions": self.sessions.stats(),
+            "clients": self.clients.stats(),
+        }
@@ -0,0 +1,78 @@
+# app/services/request_guard.py
+import asyncio
+import os
+import time
+from contextlib import aclosing
+
+# Request deadlines (override via environment / .env)
+REQUEST_DEADLINE_SECONDS = float(os.getenv("REQUEST_DEADLINE_SECONDS", "45"))
+DISCONNECT_POLL_SECONDS = float(os.getenv("DISCONNECT_POLL_SECONDS", "0.5"))
+
+
+class ClientDisconnected(Exception):
+    """The client went away before its answer was ready"""
+
+
+class RequestGuard:
+    """Runs a handler's work under a deadline, watching for client disconnects.
+
+    The work runs as a task; if the deadline passes or the client
+    disconnects first, the task is cancelled, which releases its upstream
+    slot and skips anything it would have done afterwards (session writes,
+    caching).
+    """
+
+    def __init__(self, deadline=REQUEST_DEADLINE_SECONDS, poll_interval=DISCONNECT_POLL_SECONDS):
+        self.deadline = deadline
+        self.poll_interval = poll_interval
+        self._counters = {"completed": 0, "cancelled": 0, "timed_out": 0}
+
+    async def run(self, request, work, deadline=None):
+        """Await ``work``; raise ClientDisconnected or asyncio.TimeoutError instead if need be"""
+        task = asyncio.ensure_future(work)
+        expires_at = time.monotonic() + (deadline or self.deadline)
+        try:
+            while True:
+                remaining = expires_at - time.monotonic()
+                if remaining <= 0:
+                    self._counters["timed_out"] += 1
+                    raise asyncio.TimeoutError()
+                done, _pending = await asyncio.wait({task}, timeout=min(self.poll_interval, remaining))
+                if done:
+                    self._counters["completed"] += 1
+                    return task.result()
+                if await request.is_disconnected():
+                    self.record_cancelled()
+                    raise ClientDisconnected()
+        finally:
+            if not task.done():
+                task.cancel()
+
+    async def stream(self, chunks, deadline=None):
+        """Yield from the async generator ``chunks`` until the deadline, then raise asyncio.TimeoutError.
+
+        ``chunks`` is closed when this generator is, so its upstream slot is
+        released as soon as the client goes away.
+        """
+        expires_at = time.monotonic() + (deadline or self.deadline)
+        async with aclosing(chunks):
+            while True:
+                remaining = expires_at - time.monotonic()
+                try:
+                    if remaining <= 0:
+                        raise asyncio.TimeoutError()
+                    chunk = await asyncio.wait_for(chunks.__anext__(), timeout=remaining)
+                except StopAsyncIteration:
+                    self._counters["completed"] += 1
+                    return
+                except asyncio.TimeoutError:
+                    self._counters["timed_out"] += 1
+                    raise
+                yield chunk
+
+    def record_cancelled(self):
+        """Count a request abandoned by its client (also used by streaming responses)"""
+        self._counters["cancelled"] += 1
+
+    def stats(self):
+        return {"deadline_seconds": self.deadline, **self._counters}
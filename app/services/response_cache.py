@@ -0,0 +1,88 @@
+# app/services/response_cache.py
+import hashlib
+import os
+import re
+import time
+from collections import OrderedDict
+
+# Cache limits (override via environment / .env)
+CHAT_CACHE_MAX_ENTRIES = int(os.getenv("CHAT_CACHE_MAX_ENTRIES", "512"))
+CHAT_CACHE_TTL_SECONDS = float(os.getenv("CHAT_CACHE_TTL_SECONDS", "21600"))
+JOB_CACHE_MAX_ENTRIES = int(os.getenv("JOB_CACHE_MAX_ENTRIES", "256"))
+JOB_CACHE_TTL_SECONDS = float(os.getenv("JOB_CACHE_TTL_SECONDS", "86400"))
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+
+
+def normalize_question(text):
+    """Fold case, punctuation and whitespace so equivalent questions share a key"""
+    return " ".join(_PUNCTUATION.sub(" ", text.lower()).split())
+
+
+def profile_version(profile):
+    """Short content hash used to invalidate cached answers when the profile changes"""
+    return hashlib.sha256(profile.encode("utf-8")).hexdigest()[:16]
+
+
+class ResponseCache:
+    """LRU + TTL cache for generated answers, with hit/miss counters.
+
+    Entries belong to a profile version; switching version drops them all.
+    """
+
+    def __init__(self, max_entries=CHAT_CACHE_MAX_ENTRIES, ttl=CHAT_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.version = None
+        self._entries = OrderedDict()
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "invalidations": 0,
+        }
+
+    def use_version(self, version):
+        """Drop every entry if the profile version has changed"""
+        if version != self.version:
+            if self._entries:
+                self._counters["invalidations"] += 1
+            self._entries.clear()
+            self.version = version
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self._counters["misses"] += 1
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            self._counters["expirations"] += 1
+            self._counters["misses"] += 1
+            return None
+        self._entries.move_to_end(key)
+        self._counters["hits"] += 1
+        return value
+
+    def set(self, key, value):
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self):
+        lookups = self._counters["hits"] + self._counters["misses"]
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "profile_version": self.version,
+            "hit_rate": round(self._counters["hits"] / lookups, 3) if lookups else 0.0,
+            **self._counters,
+        }
@@ -0,0 +1,187 @@
+# app/services/scheduler.py
+import asyncio
+import os
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+
+from services.rate_limit import RateLimited
+
+# Upstream queueing (override via environment / .env)
+GEMINI_MAX_QUEUE = int(os.getenv("GEMINI_MAX_QUEUE", "16"))
+GEMINI_QUEUE_TIMEOUT_SECONDS = float(os.getenv("GEMINI_QUEUE_TIMEOUT_SECONDS", "10"))
+GEMINI_JOB_PROMOTE_SECONDS = float(os.getenv("GEMINI_JOB_PROMOTE_SECONDS", "5"))
+
+# Priority classes, most urgent first
+PRIORITY_CHAT = "chat"
+PRIORITY_JOB = "job"
+PRIORITIES = (PRIORITY_CHAT, PRIORITY_JOB)
+
+
+class _Waiter:
+    __slots__ = ("priority", "future", "enqueued", "granted")
+
+    def __init__(self, priority):
+        self.priority = priority
+        self.future = asyncio.get_running_loop().create_future()
+        self.enqueued = time.monotonic()
+        self.granted = False
+
+
+class _ClassStats:
+    __slots__ = ("counters", "waits")
+
+    def __init__(self):
+        self.counters = {"granted": 0, "promoted": 0, "shed": 0, "rejected": 0, "timeouts": 0}
+        self.waits = deque(maxlen=500)
+
+    def snapshot(self, depth):
+        waits = sorted(self.waits)
+
+        def percentile(fraction):
+            return round(waits[min(len(waits) - 1, int(fraction * len(waits)))] * 1000, 1) if waits else 0.0
+
+        return {
+            "depth": depth,
+            **self.counters,
+            "wait_ms": {
+                "avg": round(sum(waits) / len(waits) * 1000, 1) if waits else 0.0,
+                "p50": percentile(0.5),
+                "p95": percentile(0.95),
+                "max": round(waits[-1] * 1000, 1) if waits else 0.0,
+            },
+        }
+
+
+class UpstreamScheduler:
+    """Hands out a fixed number of Gemini slots, chat turns before job analyses.
+
+    Freed slots go to the oldest waiting chat turn, except that a job analysis
+    waiting longer than ``promote_after`` goes first, so jobs are delayed but
+    never starved. Once ``max_waiting`` callers are queued, a new chat turn
+    sheds the oldest queued job analysis; anything else is refused. Refused,
+    shed and timed-out callers get RateLimited.
+    """
+
+    def __init__(
+        self,
+        concurrency,
+        max_waiting=GEMINI_MAX_QUEUE,
+        wait_timeout=GEMINI_QUEUE_TIMEOUT_SECONDS,
+        promote_after=GEMINI_JOB_PROMOTE_SECONDS,
+    ):
+        self.concurrency = concurrency
+        self.max_waiting = max_waiting
+        self.wait_timeout = wait_timeout
+        self.promote_after = promote_after
+        self._active = 0
+        self._queues = {priority: deque() for priority in PRIORITIES}
+        self._stats = {priority: _ClassStats() for priority in PRIORITIES}
+
+    def waiting(self):
+        return sum(len(queue) for queue in self._queues.values())
+
+    @asynccontextmanager
+    async def slot(self, priority=PRIORITY_CHAT):
+        await self._acquire(priority)
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def _acquire(self, priority):
+        stats = self._stats[priority]
+        if self._active < self.concurrency and not self.waiting():
+            self._active += 1
+            stats.counters["granted"] += 1
+            stats.waits.append(0.0)
+            return
+
+        if self.waiting() >= self.max_waiting:
+            if priority == PRIORITY_CHAT and self._queues[PRIORITY_JOB]:
+                self._shed(self._queues[PRIORITY_JOB].popleft())
+            else:
+                stats.counters["rejected"] += 1
+                raise RateLimited("The AI service queue is full", self.wait_timeout)
+
+        waiter = _Waiter(priority)
+        self._queues[priority].append(waiter)
+        self._dispatch()
+        try:
+            await asyncio.wait_for(waiter.future, timeout=self.wait_timeout)
+        except asyncio.TimeoutError:
+            if waiter.granted:
+                self._release()
+            else:
+                self._discard(waiter)
+            stats.counters["timeouts"] += 1
+            raise RateLimited("Timed out waiting for the AI service", self.wait_timeout) from None
+        except BaseException:
+            # Cancelled (client went away) or shed; hand back a slot granted meanwhile
+            if waiter.granted:
+                self._release()
+            else:
+                self._discard(waiter)
+            raise
+
+    def try_acquire(self):
+        """Take a free slot without queueing (only when nobody is waiting); pair with release()"""
+        if self._active < self.concurrency and not self.waiting():
+            self._active += 1
+            return True
+        return False
+
+    def release(self):
+        self._release()
+
+    def _release(self):
+        self._active -= 1
+        self._dispatch()
+
+    def _dispatch(self):
+        while self._active < self.concurrency and self.waiting():
+            waiter = self._next_waiter()
+            # Skip waiters already given up on (timed out / cancelled, not yet discarded)
+            if not waiter.future.done():
+                self._grant(waiter)
+
+    def _next_waiter(self):
+        jobs, chats = self._queues[PRIORITY_JOB], self._queues[PRIORITY_CHAT]
+        if jobs and (not chats or time.monotonic() - jobs[0].enqueued >= self.promote_after):
+            if chats:
+                self._stats[PRIORITY_JOB].counters["promoted"] += 1
+            return jobs.popleft()
+        return chats.popleft()
+
+    def _grant(self, waiter):
+        self._active += 1
+        waiter.granted = True
+        stats = self._stats[waiter.priority]
+        stats.counters["granted"] += 1
+        stats.waits.append(time.monotonic() - waiter.enqueued)
+        waiter.future.set_result(None)
+
+    def _shed(self, waiter):
+        self._stats[waiter.priority].counters["shed"] += 1
+        if not waiter.future.done():
+            waiter.future.set_exception(
+                RateLimited("Shed to make room for interactive requests", self.wait_timeout)
+            )
+
+    def _discard(self, waiter):
+        try:
+            self._queues[waiter.priority].remove(waiter)
+        except ValueError:
+            pass
+
+    def stats(self):
+        return {
+            "active": self._active,
+            "concurrency": self.concurrency,
+            "waiting": self.waiting(),
+            "max_waiting": self.max_waiting,
+            **{
+                priority: self._stats[priority].snapshot(len(self._queues[priority]))
+                for priority in PRIORITIES
+            },
+        }
@@ -0,0 +1,180 @@
+# app/services/session_store.py
+import json
+import os
+import time
+import zlib
+from collections import OrderedDict, deque
+from datetime import datetime
+
+# Session limits (override via environment / .env)
+CHAT_SESSION_MAX = int(os.getenv("CHAT_SESSION_MAX", "1000"))
+CHAT_SESSION_TTL_SECONDS = float(os.getenv("CHAT_SESSION_TTL_SECONDS", "3600"))
+CHAT_SESSION_MAX_TURNS = int(os.getenv("CHAT_SESSION_MAX_TURNS", "50"))
+CHAT_SESSION_MAX_BYTES = int(os.getenv("CHAT_SESSION_MAX_BYTES", str(32 * 1024 * 1024)))
+CHAT_SESSION_COMPRESS = os.getenv("CHAT_SESSION_COMPRESS", "false").lower() in ("1", "true", "yes")
+
+
+class _Session:
+    __slots__ = ("turns", "last_access", "size", "appended", "summary", "folded")
+
+    def __init__(self, max_turns):
+        self.turns = deque(maxlen=max_turns)
+        self.last_access = time.monotonic()
+        self.size = 0
+        # Turns ever appended, and the rolling summary of the first `folded` of them
+        self.appended = 0
+        self.summary = ""
+        self.folded = 0
+
+
+class SessionStore:
+    """In-memory chat history with LRU + idle-TTL eviction and a global memory budget.
+
+    Sessions are kept in least-recently-used order, so expired and
+    over-budget sessions are always dropped from the front.
+    """
+
+    def __init__(
+        self,
+        max_sessions=CHAT_SESSION_MAX,
+        idle_ttl=CHAT_SESSION_TTL_SECONDS,
+        max_turns=CHAT_SESSION_MAX_TURNS,
+        max_bytes=CHAT_SESSION_MAX_BYTES,
+        compress=CHAT_SESSION_COMPRESS,
+    ):
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self.max_turns = max_turns
+        self.max_bytes = max_bytes
+        self.compress = compress
+        self._sessions = OrderedDict()
+        self._bytes = 0
+        self._counters = {
+            "evicted_lru": 0,
+            "evicted_ttl": 0,
+            "evicted_memory": 0,
+            "trimmed_turns": 0,
+        }
+
+    def __contains__(self, session_id):
+        self._expire()
+        return session_id in self._sessions
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def append(self, session_id, user, bot):
+        """Record one user/bot turn for a session"""
+        self._expire()
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = self._sessions[session_id] = _Session(self.max_turns)
+        else:
+            self._sessions.move_to_end(session_id)
+        session.last_access = time.monotonic()
+
+        turn = self._encode({
+            "user": user,
+            "bot": bot,
+            "timestamp": datetime.now().isoformat()
+        })
+
+        # deque(maxlen) drops the oldest turn itself; keep the byte count in step
+        if len(session.turns) == session.turns.maxlen:
+            dropped = self._turn_size(session.turns[0])
+            session.size -= dropped
+            self._bytes -= dropped
+            self._counters["trimmed_turns"] += 1
+
+        session.turns.append(turn)
+        session.appended += 1
+        size = self._turn_size(turn)
+        session.size += size
+        self._bytes += size
+        self._enforce_limits(keep=session_id)
+
+    def get(self, session_id):
+        """Return a session's turns (oldest first), or an empty list"""
+        self._expire()
+        session = self._sessions.get(session_id)
+        if session is None:
+            return []
+        self._sessions.move_to_end(session_id)
+        session.last_access = time.monotonic()
+        return [self._decode(turn) for turn in session.turns]
+
+    def memory(self, session_id):
+        """Return (summary, folded, first, turns) for building conversation context.
+
+        ``folded`` turns (counted from the start of the session) are already in
+        the rolling summary; ``first`` is the session-wide index of turns[0].
+        """
+        self._expire()
+        session = self._sessions.get(session_id)
+        if session is None:
+            return "", 0, 0, []
+        turns = [self._decode(turn) for turn in session.turns]
+        return session.summary, session.folded, session.appended - len(turns), turns
+
+    def set_summary(self, session_id, summary, folded):
+        """Store a session's rolling summary, covering its first ``folded`` turns"""
+        session = self._sessions.get(session_id)
+        if session is None:
+            return
+        delta = len(summary) - len(session.summary)
+        session.summary = summary
+        session.folded = folded
+        session.size += delta
+        self._bytes += delta
+        self._enforce_limits(keep=session_id)
+
+    def stats(self):
+        """Size and eviction counters for monitoring"""
+        self._expire()
+        return {
+            "sessions": len(self._sessions),
+            "turns": sum(len(session.turns) for session in self._sessions.values()),
+            "bytes": self._bytes,
+            "max_sessions": self.max_sessions,
+            "max_bytes": self.max_bytes,
+            "compressed": self.compress,
+            **self._counters,
+        }
+
+    def _encode(self, turn):
+        data = json.dumps(turn).encode("utf-8")
+        return zlib.compress(data) if self.compress else turn
+
+    def _decode(self, turn):
+        if isinstance(turn, bytes):
+            return json.loads(zlib.decompress(turn).decode("utf-8"))
+        return dict(turn)
+
+    def _turn_size(self, turn):
+        if isinstance(turn, bytes):
+            return len(turn)
+        return sum(len(str(value)) for value in turn.values())
+
+    def _drop(self, session_id, reason):
+        session = self._sessions.pop(session_id)
+        self._bytes -= session.size
+        self._counters[reason] += 1
+
+    def _expire(self):
+        if self.idle_ttl <= 0:
+            return
+        cutoff = time.monotonic() - self.idle_ttl
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if session.last_access >= cutoff:
+                break
+            self._drop(session_id, "evicted_ttl")
+
+    def _enforce_limits(self, keep=None):
+        while len(self._sessions) > self.max_sessions:
+            self._drop(next(iter(self._sessions)), "evicted_lru")
+        while self._bytes > self.max_bytes and self._sessions:
+            session_id = next(iter(self._sessions))
+            if session_id == keep:
+                break
+            self._drop(session_id, "evicted_memory")
@@ -0,0 +1,49 @@
+# app/services/singleflight.py
+import asyncio
+
+
+class _Flight:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key onto one in-flight task.
+
+    The first caller starts the work; callers arriving while it runs await the
+    same task and receive the same result (or exception). The work is cancelled
+    only once every caller waiting on it has gone away.
+    """
+
+    def __init__(self):
+        self._flights = {}
+        self._counters = {"leaders": 0, "collapsed": 0}
+
+    async def do(self, key, fn):
+        """Run fn() for key, or join the call already in flight for it"""
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(fn()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _task: self._forget(key, flight))
+            self._counters["leaders"] += 1
+        else:
+            self._counters["collapsed"] += 1
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                flight.task.cancel()
+
+    def _forget(self, key, flight):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    def stats(self):
+        return {"in_flight": len(self._flights), **self._counters}
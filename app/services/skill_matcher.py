@@ -0,0 +1,265 @@
+# app/services/skill_matcher.py
+import os
+import re
+
+# "hybrid": local scoring + Gemini narrative, "local": no Gemini at all,
+# "llm": the original free-text Gemini analysis
+JOB_ANALYSIS_MODE = os.getenv("JOB_ANALYSIS_MODE", "hybrid").lower()
+
+# canonical skill -> (category, synonyms as they appear in job descriptions)
+SKILL_TAXONOMY = {
+    "Python": ("backend_languages", ["python", "python3"]),
+    "Java": ("backend_languages", ["java", "spring boot", "spring"]),
+    "Go": ("backend_languages", ["golang"]),
+    "Node.js": ("backend_languages", ["node.js", "nodejs", "node js", "express.js"]),
+    "Ruby": ("backend_languages", ["ruby", "ruby on rails", "rails"]),
+    "PHP": ("backend_languages", ["php", "laravel"]),
+    "C#/.NET": ("backend_languages", ["c#", ".net", "dotnet", "asp.net"]),
+    "JavaScript": ("frontend", ["javascript", "ecmascript", "es6"]),
+    "TypeScript": ("frontend", ["typescript"]),
+    "React": ("frontend", ["react", "react.js", "reactjs"]),
+    "Vue": ("frontend", ["vue", "vue.js", "vuejs"]),
+    "Angular": ("frontend", ["angular"]),
+    "Django": ("python_web", ["django", "django rest", "django rest framework", "drf"]),
+    "Flask": ("python_web", ["flask"]),
+    "FastAPI": ("python_web", ["fastapi", "fast api"]),
+    "REST APIs": ("api_design", ["rest api", "rest apis", "restful", "restful apis", "rest services", "api development"]),
+    "GraphQL": ("api_design", ["graphql"]),
+    "gRPC": ("api_design", ["grpc"]),
+    "Microservices": ("architecture", ["microservices", "microservice", "service decomposition", "distributed systems"]),
+    "System Integration": ("architecture", ["system integration", "third-party apis", "third party apis", "payment gateways"]),
+    "PostgreSQL": ("relational_db", ["postgresql", "postgres"]),
+    "MySQL": ("relational_db", ["mysql", "mariadb"]),
+    "SQL": ("relational_db", ["sql"]),
+    "SQL Server": ("relational_db", ["sql server", "mssql"]),
+    "MongoDB": ("nosql", ["mongodb", "mongo"]),
+    "Redis": ("nosql", ["redis"]),
+    "Elasticsearch": ("nosql", ["elasticsearch", "opensearch"]),
+    "DynamoDB": ("nosql", ["dynamodb"]),
+    "Pandas": ("data", ["pandas"]),
+    "NumPy": ("data", ["numpy"]),
+    "ETL": ("data", ["etl", "data pipeline", "data pipelines", "data ingestion"]),
+    "Spark": ("data", ["spark", "pyspark"]),
+    "Airflow": ("data", ["airflow"]),
+    "Machine Learning": ("ml", ["machine learning", "scikit-learn", "sklearn", "tensorflow", "pytorch"]),
+    "Odoo": ("erp", ["odoo", "openerp"]),
+    "ERP": ("erp", ["erp"]),
+    "AWS": ("cloud", ["aws", "amazon web services", "ec2", "s3", "lambda", "api gateway"]),
+    "GCP": ("cloud", ["gcp", "google cloud"]),
+    "Azure": ("cloud", ["azure"]),
+    "DigitalOcean": ("cloud", ["digitalocean", "digital ocean"]),
+    "Linux": ("infrastructure", ["linux", "unix", "bash", "shell scripting"]),
+    "Nginx": ("infrastructure", ["nginx"]),
+    "Docker": ("containers", ["docker", "docker compose", "containerization", "containerisation"]),
+    "Kubernetes": ("containers", ["kubernetes", "k8s", "helm", "eks", "gke", "aks"]),
+    "CI/CD": ("ci_cd", ["ci/cd", "ci cd", "continuous integration", "continuous delivery", "continuous deployment"]),
+    "GitHub Actions": ("ci_cd", ["github actions", "githubactions"]),
+    "Jenkins": ("ci_cd", ["jenkins"]),
+    "GitLab CI": ("ci_cd", ["gitlab ci", "gitlab"]),
+    "Terraform": ("iac", ["terraform", "cloudformation", "infrastructure as code", "ansible"]),
+    "Git": ("tooling", ["git", "github", "version control", "git flow", "gitflow"]),
+    "Kafka": ("messaging", ["kafka"]),
+    "RabbitMQ": ("messaging", ["rabbitmq", "amqp"]),
+    "Celery": ("messaging", ["celery"]),
+    "Observability": ("observability", ["observability", "prometheus", "grafana", "datadog", "new relic", "opentelemetry"]),
+    "Pytest": ("testing", ["pytest", "unit testing", "unittest", "tdd", "test-driven", "automated testing"]),
+    "Code Review": ("testing", ["code review", "code reviews"]),
+    "Agile/Scrum": ("process", ["agile", "scrum", "kanban"]),
+    "Jira": ("process", ["jira", "confluence"]),
+    "API Security": ("security", ["oauth", "oauth2", "jwt", "token-based", "access control", "owasp"]),
+}
+
+# Synonyms that are also ordinary English ("spring 2025", "react quickly", "on the rails");
+# they only count with another skill or a tech word close by
+AMBIGUOUS_SYNONYMS = frozenset({
+    "spring", "react", "rails", "lambda", "spark", "helm", "aks", "angular", "vue",
+    "flask", "ruby", "celery", "airflow", "pandas", "bash", "mongo", "express.js",
+})
+CONTEXT_CHARS = 50
+_TECH_CONTEXT = re.compile(
+    r"\b(frameworks?|librar(y|ies)|developers?|development|engineers?|engineering|stack|sdks?|apis?|"
+    r"functions?|clusters?|charts?|native|hooks|boot|streaming|pipelines?|components?|"
+    r"programming|languages?|backend|back-end|frontend|front-end|serverless|databases?|queues?|dags?)\b",
+    re.IGNORECASE,
+)
+
+# Section headings and inline phrases that mark a skill as nice-to-have rather than required
+_PREFERRED = re.compile(
+    r"nice[- ]to[- ]haves?|good[- ]to[- ]haves?|preferred|desirable|bonus|\bplus\b|pluses|ideally|optional",
+    re.IGNORECASE,
+)
+_BULLET = re.compile(r"[-•·]|\*(?!\*)|\d+[.)]\s")
+HEADING_MAX_WORDS = 6
+
+
+class SkillMatcher:
+    """Deterministic job-description vs profile skill matching.
+
+    All synonyms are compiled into one case-insensitive alternation (longest
+    first), so extraction is a single regex pass over the text. Farhan's own
+    skills are extracted from the profile with the same matcher. Skills under
+    a "Nice to have" heading or on a line marked "preferred" / "a plus" are
+    kept apart from the required ones and don't count towards the score.
+    """
+
+    def __init__(self, profile, taxonomy=SKILL_TAXONOMY):
+        self.profile = profile
+        self.taxonomy = taxonomy
+        self._canonical = {}
+        for skill, (_category, synonyms) in taxonomy.items():
+            for synonym in synonyms:
+                self._canonical.setdefault(synonym.lower(), skill)
+
+        alternation = "|".join(
+            re.escape(synonym) for synonym in sorted(self._canonical, key=len, reverse=True)
+        )
+        self._pattern = re.compile(rf"(?<!\w)(?:{alternation})(?![\w+#])", re.IGNORECASE)
+        self.profile_skills = self.extract(profile)
+        years = re.search(r"EXPERIENCE \((\d+\+?) Years\)", profile, re.IGNORECASE)
+        self.experience_years = years.group(1) if years else None
+        self._profile_categories = {}
+        for skill in self.profile_skills:
+            self._profile_categories.setdefault(self.category(skill), []).append(skill)
+
+    def category(self, skill):
+        return self.taxonomy[skill][0]
+
+    def extract(self, text):
+        """Canonical skills mentioned in the text, in order of first mention"""
+        matches = list(self._pattern.finditer(text))
+        found = {}
+        for match in matches:
+            if match.group(0).lower() in AMBIGUOUS_SYNONYMS and not self._in_tech_context(text, match, matches):
+                continue
+            skill = self._canonical[match.group(0).lower()]
+            found.setdefault(skill, None)
+        return list(found)
+
+    def _in_tech_context(self, text, match, matches):
+        start, end = match.start() - CONTEXT_CHARS, match.end() + CONTEXT_CHARS
+        for other in matches:
+            if other is not match and start <= other.start() < end and other.group(0).lower() not in AMBIGUOUS_SYNONYMS:
+                return True
+        return bool(_TECH_CONTEXT.search(text, max(0, start), end))
+
+    def extract_requirements(self, job_description):
+        """(required, preferred) skills; a skill named in both places is required"""
+        required, preferred = [], []
+        in_preferred = False
+        for line in job_description.splitlines():
+            stripped = line.strip()
+            if not stripped:
+                continue
+            heading = _section_heading(stripped)
+            if heading is not None:
+                in_preferred = bool(_PREFERRED.search(heading))
+            target = preferred if in_preferred or _PREFERRED.search(stripped) else required
+            target.extend(skill for skill in self.extract(stripped) if skill not in target)
+        return required, [skill for skill in preferred if skill not in required]
+
+    def analyze(self, job_description):
+        """Matching / transferable / gap skill sets and a score out of 10 (required skills only)"""
+        required, preferred = self.extract_requirements(job_description)
+        scored = required or preferred
+        matching, transferable, gaps = [], [], []
+        for skill in required + preferred:
+            if skill in self.profile_skills:
+                matching.append(skill)
+            elif self.category(skill) in self._profile_categories:
+                transferable.append((skill, self._profile_categories[self.category(skill)]))
+            else:
+                gaps.append(skill)
+
+        score = None
+        if scored:
+            direct = sum(1 for skill in matching if skill in scored)
+            related = sum(1 for skill, _related in transferable if skill in scored)
+            score = round(10 * (direct + 0.5 * related) / len(scored), 1)
+        return {
+            "required": scored,
+            "preferred": preferred if required else [],
+            "matching": matching,
+            "transferable": transferable,
+            "gaps": gaps,
+            "score": score,
+            "experience_years": self.experience_years,
+        }
+
+
+def _section_heading(line):
+    """Text of a section heading line ("Nice to have:", "## Requirements"), or None"""
+    if _BULLET.match(line):
+        return None
+    text = line.strip("#*_ ").rstrip(":").strip()
+    if not text or len(text.split()) > HEADING_MAX_WORDS:
+        return None
+    if line.rstrip("*_ ").endswith(":") or line.startswith(("#", "**")) or _PREFERRED.match(text):
+        return text
+    return None
+
+
+def _bullets(items):
+    return "<br>".join(f"• {item}" for item in items)
+
+
+def render_job_analysis(analysis, narrative=None):
+    """Render a local analysis in the chatbot's five-section HTML format.
+
+    ``narrative`` (Gemini's "good fit" and recommendation text) replaces the
+    templated closing sections when available.
+    """
+    matching, transferable, gaps = analysis["matching"], analysis["transferable"], analysis["gaps"]
+    score, required = analysis["score"], analysis["required"]
+    preferred = set(analysis.get("preferred", ()))
+
+    def label(skill):
+        return f"{skill} (nice to have)" if skill in preferred else skill
+
+    sections = ["<strong>Job Match Analysis for Muhammad Farhan</strong>"]
+    sections.append(
+        "<strong>1. Matching Skills:</strong><br>"
+        + (_bullets(label(skill) for skill in matching) if matching else "No listed technologies matched directly.")
+    )
+    sections.append(
+        "<strong>2. Transferable Skills:</strong><br>"
+        + (_bullets(f"{label(skill)} (related experience: {', '.join(related[:3])})" for skill, related in transferable)
+           if transferable else "None needed beyond the matching skills above.")
+    )
+    sections.append(
+        "<strong>3. Skill Gaps:</strong><br>"
+        + (_bullets(label(skill) for skill in gaps) if gaps else "No significant gaps against the listed requirements.")
+    )
+    if score is None:
+        score_text = "Not enough specific technologies in the job description to score the match."
+    else:
+        direct = sum(1 for skill in matching if skill not in preferred)
+        related = sum(1 for skill, _related in transferable if skill not in preferred)
+        score_text = (
+            f"<strong>{score}/10</strong> - {direct} of {len(required)} required skills match directly"
+            + (f", {related} through related experience" if related else "")
+            + "."
+        )
+    sections.append(f"<strong>4. Overall Match Score:</strong><br>{score_text}")
+
+    if narrative:
+        sections.append(narrative.strip())
+        return "<br><br>".join(sections)
+
+    strengths = ", ".join(matching[:5]) if matching else "Python backend development"
+    years = f"{analysis['experience_years']} years of " if analysis.get("experience_years") else ""
+    sections.append(
+        "<strong>5. Why Muhammad Would Be a Good Fit:</strong><br>"
+        f"Muhammad brings {years}production backend experience, with hands-on work in {strengths}. "
+        "He has built and deployed microservices end to end, from API design to CI/CD and cloud hosting."
+    )
+    if score is not None and score >= 7:
+        recommendation = "Strong match - Muhammad is well worth shortlisting for this role."
+    elif score is not None and score >= 4:
+        recommendation = "Good partial match - worth a conversation to explore the gaps listed above."
+    else:
+        recommendation = "Partial match - best discussed directly with Muhammad to see how his experience transfers."
+    sections.append(
+        f"<strong>Recommendation:</strong><br>{recommendation} "
+        '<a href="https://muhammadfarhan.work/contact">Get in touch</a> to discuss the role.'
+    )
+    return "<br><br>".join(sections)
@@ -0,0 +1,123 @@
+# app/services/static_assets.py
+import gzip
+import hashlib
+import json
+import mimetypes
+from pathlib import Path
+
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.staticfiles import StaticFiles
+
+from services.page_cache import accepted_encodings
+
+try:
+    import brotli
+except ImportError:  # optional: the build then writes only .gz variants
+    brotli = None
+
+STATIC_DIR = Path(__file__).parent.parent.absolute() / "static"
+BUILD_DIR = STATIC_DIR / "build"
+MANIFEST_PATH = BUILD_DIR / "manifest.json"
+BUILD_URL = "/static/build"
+
+# Files fingerprinted by the build
+ASSET_SUFFIXES = (".css", ".js")
+
+# Precompressed siblings, in order of preference
+ENCODING_SUFFIXES = (("br", ".br"), ("gzip", ".gz"))
+
+# Fingerprinted files never change, so browsers can keep them for a year without revalidating
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+def fingerprint(data):
+    return hashlib.sha256(data).hexdigest()[:12]
+
+
+def write_asset(name, data, build_dir=BUILD_DIR):
+    """Write data under a content-hashed version of name, with .gz/.br siblings; returns the hashed name"""
+    source = Path(name)
+    hashed = source.with_name(f"{source.stem}.{fingerprint(data)}{source.suffix}")
+    target = build_dir / hashed
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_bytes(data)
+    target.with_name(target.name + ".gz").write_bytes(gzip.compress(data, compresslevel=9, mtime=0))
+    if brotli is not None:
+        target.with_name(target.name + ".br").write_bytes(brotli.compress(data, quality=11))
+    return hashed.as_posix()
+
+
+def build(static_dir=STATIC_DIR, build_dir=BUILD_DIR):
+    """Copy every JS/CSS file under static_dir to a content-hashed name in build_dir.
+
+    Returns the manifest entries, mapping source paths (``css/projects.css``)
+    to the hashed ones. Older hashed files are kept so pages rendered
+    against a previous manifest keep working.
+    """
+    manifest = {}
+    for path in sorted(static_dir.rglob("*")):
+        if path.suffix not in ASSET_SUFFIXES or build_dir in path.parents:
+            continue
+        name = path.relative_to(static_dir).as_posix()
+        manifest[name] = write_asset(name, path.read_bytes(), build_dir)
+    return manifest
+
+
+def write_manifest(manifest, build_dir=BUILD_DIR):
+    build_dir.mkdir(parents=True, exist_ok=True)
+    (build_dir / MANIFEST_PATH.name).write_text(json.dumps(manifest, indent=2, sort_keys=True))
+
+
+class AssetManifest:
+    """Resolves static asset paths to fingerprinted URLs for templates.
+
+    Without a build (no manifest), or for files the build doesn't cover,
+    the plain ``/static/...`` URL is returned.
+    """
+
+    def __init__(self, path=MANIFEST_PATH):
+        self.path = path
+        self._entries = None
+
+    @property
+    def entries(self):
+        if self._entries is None:
+            try:
+                self._entries = json.loads(self.path.read_text())
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def url(self, name):
+        hashed = self.entries.get(name)
+        return f"{BUILD_URL}/{hashed}" if hashed else f"/static/{name}"
+
+
+class FingerprintedStaticFiles(StaticFiles):
+    """Serves build output with immutable caching and precompressed variants.
+
+    For JS/CSS a .br or .gz sibling is sent when the client accepts that
+    encoding; otherwise (and for images) the file itself is.
+    """
+
+    async def get_response(self, path, scope):
+        accepted = accepted_encodings(Headers(scope=scope).get("accept-encoding"))
+        response = None
+        for encoding, suffix in ENCODING_SUFFIXES:
+            if encoding not in accepted or not path.endswith(ASSET_SUFFIXES):
+                continue
+            try:
+                response = await super().get_response(path + suffix, scope)
+            except HTTPException:
+                continue
+            if response.status_code == 200:
+                response.headers["Content-Encoding"] = encoding
+                media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+                response.headers["Content-Type"] = f"{media_type}; charset=utf-8"
+            break
+        if response is None:
+            response = await super().get_response(path, scope)
+        response.headers["Cache-Control"] = IMMUTABLE
+        response.headers["Vary"] = "Accept-Encoding"
+        return response
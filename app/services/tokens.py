@@ -0,0 +1,12 @@
+# app/services/tokens.py
+import math
+
+# Gemini averages roughly four characters of English text per token
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text):
+    """Cheap local token estimate, so prompt sizing never needs an API call"""
+    if not text:
+        return 0
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
@@ -2,6 +2,7 @@
 class FarhanBotWidget {
     constructor() {
         this.isOpen = false;
+        this.isSending = false;
         this.sessionId = Date.now().toString();
         this.init();
     }
@@ -559,6 +560,40 @@ class FarhanBotWidget {
         }
     }
 
+    newRequestKey() {
+        // Idempotency-Key for one message, so a retried request isn't answered twice
+        if (window.crypto && crypto.randomUUID) {
+            return crypto.randomUUID();
+        }
+        return `${this.sessionId}-${Date.now()}-${Math.random().toString(36).slice(2)}`;
+    }
+
+    async postWithRetry(url, payload, requestKey, headers = {}) {
+        // Network failures are retried with the same Idempotency-Key, so the message is answered once
+        for (let attempt = 0; ; attempt++) {
+            try {
+                return await fetch(url, {
+                    method: 'POST',
+                    headers: {
+                        'Content-Type': 'application/json',
+                        ...headers,
+                        'Idempotency-Key': requestKey
+                    },
+                    body: JSON.stringify(payload)
+                });
+            } catch (error) {
+                if (attempt >= 2) throw error;
+                await new Promise(resolve => setTimeout(resolve, 1000 * (attempt + 1)));
+            }
+        }
+    }
+
+    setSending(sending) {
+        // One message at a time: a double-pressed Enter or click can't send it twice
+        this.isSending = sending;
+        document.getElementById('farhanbotSend').disabled = sending;
+    }
+
     toggleChat() {
         const chat = document.getElementById('farhanbotChat');
         this.isOpen = !this.isOpen;
@@ -601,12 +636,21 @@ class FarhanBotWidget {
         const input = document.getElementById('farhanbotInput');
         const message = input.value.trim();
         
-        if (!message) return;
+        if (!message || this.isSending) return;
         
         this.addMessage(message, true);
         input.value = '';
         input.style.height = 'auto';
         
+        this.setSending(true);
+        try {
+            await this.answerMessage(message, this.newRequestKey());
+        } finally {
+            this.setSending(false);
+        }
+    }
+
+    async answerMessage(message, requestKey) {
         this.showTyping();
         
         // Check if this looks like a job description
@@ -617,31 +661,24 @@ class FarhanBotWidget {
                                message.toLowerCase().includes('responsibilities') ||
                                message.length > 200; // Long text likely job description
         
+        if (!isJobDescription) {
+            await this.streamChat(message, requestKey);
+            return;
+        }
+        
         try {
-            const endpoint = isJobDescription ? '/api/chatbot/analyze-job' : '/api/chatbot/chat';
-            const body = isJobDescription ? 
-                JSON.stringify({
-                    job_description: message,
-                    session_id: this.sessionId
-                }) :
-                JSON.stringify({
-                    message: message,
-                    session_id: this.sessionId
-                });
-            
-            const response = await fetch(endpoint, {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json',
-                },
-                body: body
-            });
+            const response = await this.postWithRetry('/api/chatbot/analyze-job', {
+                job_description: message,
+                session_id: this.sessionId
+            }, requestKey);
             
             const data = await response.json();
             this.hideTyping();
             
             if (response.ok) {
                 this.addMessage(data.response);
+            } else if (response.status === 429) {
+                this.addMessage(data.detail);
             } else {
                 this.addMessage('Sorry, I encountered an error. Please try again.');
             }
@@ -651,6 +688,103 @@ class FarhanBotWidget {
         }
     }
 
+    async streamChat(message, requestKey) {
+        // Render the answer token by token from the SSE endpoint
+        let messageDiv = null;
+        let text = '';
+        
+        const render = (content) => {
+            if (!messageDiv) {
+                this.hideTyping();
+                this.addMessage(content);
+                messageDiv = document.getElementById('farhanbotMessages').lastElementChild;
+            } else {
+                messageDiv.innerHTML = content;
+            }
+            const messages = document.getElementById('farhanbotMessages');
+            messages.scrollTop = messages.scrollHeight;
+        };
+        
+        try {
+            const response = await this.postWithRetry('/api/chatbot/chat/stream', {
+                message: message,
+                session_id: this.sessionId
+            }, requestKey, { 'Accept': 'text/event-stream' });
+            
+            if (response.status === 429) {
+                const data = await response.json();
+                this.hideTyping();
+                this.addMessage(data.detail);
+                return;
+            }
+            
+            if (!response.ok || !response.body) {
+                this.hideTyping();
+                this.addMessage('Sorry, I encountered an error. Please try again.');
+                return;
+            }
+            
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            let buffer = '';
+            
+            while (true) {
+                const { value, done } = await reader.read();
+                if (done) break;
+                buffer += decoder.decode(value, { stream: true });
+                
+                const frames = buffer.split('\n\n');
+                buffer = frames.pop();
+                
+                for (const frame of frames) {
+                    const event = FarhanBotWidget.parseSseFrame(frame);
+                    if (!event) continue;
+                    
+                    if (event.event === 'token') {
+                        text += event.data.text;
+                        render(text);
+                    } else {
+                        // 'done' carries the full answer, 'error' a user-facing message
+                        render(event.data.response);
+                    }
+                }
+            }
+            
+            if (!messageDiv) {
+                this.hideTyping();
+                this.addMessage('Sorry, I encountered an error. Please try again.');
+            }
+        } catch (error) {
+            this.hideTyping();
+            if (messageDiv) {
+                messageDiv.innerHTML = text + '<br><br>Sorry, the connection was interrupted. Please try again.';
+            } else {
+                this.addMessage('Sorry, I am having trouble connecting. Please try again.');
+            }
+        }
+    }
+
+    static parseSseFrame(frame) {
+        let event = 'message';
+        const dataLines = [];
+        
+        frame.split('\n').forEach(line => {
+            if (line.startsWith('event:')) {
+                event = line.slice(6).trim();
+            } else if (line.startsWith('data:')) {
+                dataLines.push(line.slice(5).trim());
+            }
+        });
+        
+        if (!dataLines.length) return null;
+        
+        try {
+            return { event: event, data: JSON.parse(dataLines.join('\n')) };
+        } catch (error) {
+            return null;
+        }
+    }
+
     handleQuickAction(action) {
         const questions = {
             'experience': 'What is Muhammad Farhan experience?',
@@ -660,38 +794,19 @@ class FarhanBotWidget {
         };
         
         const question = questions[action];
-        if (question) {
+        if (question && !this.isSending) {
             this.addMessage(question, true);
             this.sendQuickQuestion(question);
         }
     }
 
     async sendQuickQuestion(question) {
-        this.showTyping();
-        
+        this.setSending(true);
         try {
-            const response = await fetch('/api/chatbot/chat', {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json',
-                },
-                body: JSON.stringify({
-                    message: question,
-                    session_id: this.sessionId
-                })
-            });
-            
-            const data = await response.json();
-            this.hideTyping();
-            
-            if (response.ok) {
-                this.addMessage(data.response);
-            } else {
-                this.addMessage('Sorry, I encountered an error. Please try again.');
-            }
-        } catch (error) {
-            this.hideTyping();
-            this.addMessage('Sorry, I am having trouble connecting. Please try again.');
+            this.showTyping();
+            await this.streamChat(question, this.newRequestKey());
+        } finally {
+            this.setSending(false);
         }
     }
 }
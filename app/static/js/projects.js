@@ -2,98 +2,176 @@
 document.addEventListener('DOMContentLoaded', function() {
     // Cache DOM elements
     const projectFilterBtns = document.querySelectorAll('.project-filter-btn');
-    const projectCards = document.querySelectorAll('.project-card');
     const showMoreBtn = document.getElementById('showMoreBtn');
     const projectsGrid = document.getElementById('projectsGrid');
 
+    if (!projectsGrid) return;
+
     console.log('🚀 Projects section initialized');
-    console.log(`Found ${projectCards.length} project cards`);
+    console.log(`Found ${projectsGrid.children.length} server-rendered project cards`);
     console.log(`Found ${projectFilterBtns.length} filter buttons`);
 
-    let currentFilter = 'enterprise'; // Default to enterprise
-    let showingAll = false;
+    // The server renders the first page of "all"; later pages and other filters come from /api/projects
+    const perPage = parseInt(projectsGrid.dataset.perPage, 10) || 6;
+    let currentFilter = 'all';
+    let currentPage = parseInt(projectsGrid.dataset.page, 10) || 1;
+    let totalPages = parseInt(projectsGrid.dataset.pages, 10) || 1;
+    let requestId = 0;
+
+    async function fetchProjects(category, page) {
+        const params = new URLSearchParams({ category, page, per_page: perPage });
+        const response = await fetch(`/api/projects?${params}`);
+        if (!response.ok) {
+            throw new Error(`Projects request failed: ${response.status}`);
+        }
+        return response.json();
+    }
 
-    // Project filtering functionality - Smooth like tech-stack
-    function filterProjects(category) {
-        console.log(`🎯 Filtering projects for category: ${category}`);
-        
-        currentFilter = category;
-        showingAll = false; // Reset show more state when filtering
-        
-        // Update filter button states
-        projectFilterBtns.forEach(btn => {
-            btn.classList.remove('active');
-            if (btn.dataset.category === category) {
-                btn.classList.add('active');
-            }
+    // Mirrors templates/components/project-card.html
+    function renderProjectCard(project) {
+        const card = document.createElement('div');
+        card.className = 'project-card';
+        card.dataset.categories = project.category;
+
+        const imageWrapper = document.createElement('div');
+        imageWrapper.className = 'project-image';
+        const image = document.createElement('img');
+        image.src = project.image;
+        image.alt = project.title;
+        image.loading = 'lazy';
+        image.decoding = 'async';
+        const sources = imageSources(project.image, '(max-width: 768px) 100vw, 400px');
+        let picture = image;
+        if (sources.length) {
+            picture = document.createElement('picture');
+            picture.append(...sources, image);
+        }
+        const overlay = document.createElement('div');
+        overlay.className = 'project-overlay';
+        const categoryLabel = document.createElement('span');
+        categoryLabel.className = 'project-category';
+        categoryLabel.textContent = project.category_label;
+        overlay.appendChild(categoryLabel);
+        imageWrapper.append(picture, overlay);
+
+        const content = document.createElement('div');
+        content.className = 'project-content';
+        const title = document.createElement('h3');
+        title.className = 'project-title';
+        title.textContent = project.title;
+        const description = document.createElement('p');
+        description.className = 'project-description';
+        description.textContent = project.description;
+        const techList = document.createElement('div');
+        techList.className = 'project-tech';
+        project.tech.slice(0, 3).forEach(tech => {
+            const tag = document.createElement('span');
+            tag.className = 'tech-tag';
+            tag.textContent = tech;
+            techList.appendChild(tag);
+        });
+        const links = document.createElement('div');
+        links.className = 'project-links';
+        const detailBtn = document.createElement('button');
+        detailBtn.className = 'project-link project-detail-btn';
+        detailBtn.textContent = 'View Details';
+        detailBtn.addEventListener('click', () => openProjectDetail(project.id));
+        const link = document.createElement('a');
+        link.className = 'project-link';
+        link.href = project.link.url;
+        link.textContent = project.link.label;
+        links.append(detailBtn, link);
+        content.append(title, description, techList, links);
+
+        card.append(imageWrapper, content);
+        return card;
+    }
+
+    // Show cards with a staggered entrance
+    function revealCards(cards) {
+        const animationDelay = 80;
+        cards.forEach((card, index) => {
+            card.style.opacity = '0';
+            card.style.transform = 'translateY(20px) scale(0.9)';
+            enhanceCard(card);
+            setTimeout(() => {
+                // Trigger reflow
+                card.offsetHeight;
+                card.style.transition = 'all 0.5s cubic-bezier(0.4, 0, 0.2, 1)';
+                card.style.opacity = '1';
+                card.style.transform = 'translateY(0) scale(1)';
+            }, index * animationDelay);
         });
+    }
 
-        let visibleCount = 0;
-        const animationDelay = 80; // Increased delay for smoother animation
+    // Project filtering - asks the server for the first page of the category
+    async function filterProjects(category) {
+        console.log(`🎯 Filtering projects for category: ${category}`);
+        const thisRequest = ++requestId;
 
-        // First, fade out all cards smoothly
-        projectCards.forEach((card) => {
+        // Fade out the current cards while the page loads
+        Array.from(projectsGrid.children).forEach(card => {
             card.style.transition = 'all 0.3s ease-out';
             card.style.opacity = '0';
             card.style.transform = 'translateY(-10px) scale(0.95)';
         });
 
-        // Wait for fade out, then show filtered cards
-        setTimeout(() => {
-            projectCards.forEach((card, index) => {
-                const cardCategories = card.dataset.categories;
-                const shouldShow = category === 'all' || cardCategories === category;
-                
-                if (shouldShow) {
-                    // Show card with staggered animation
-                    setTimeout(() => {
-                        card.style.display = 'block';
-                        card.style.opacity = '0';
-                        card.style.transform = 'translateY(20px) scale(0.9)';
-
-                        // Trigger reflow
-                        card.offsetHeight;
-
-                        // Animate in smoothly
-                        card.style.transition = 'all 0.5s cubic-bezier(0.4, 0, 0.2, 1)';
-                        card.style.opacity = '1';
-                        card.style.transform = 'translateY(0) scale(1)';
-
-                        visibleCount++;
-                        
-                        // Hide cards that should be hidden by "show more" logic
-                        if (!showingAll && card.classList.contains('hidden')) {
-                            card.style.display = 'none';
-                        }
-                    }, index * animationDelay);
-                } else {
-                    // Keep card hidden
-                    card.style.display = 'none';
-                }
+        try {
+            const [data] = await Promise.all([
+                fetchProjects(category, 1),
+                new Promise(resolve => setTimeout(resolve, 300)) // let the fade out finish
+            ]);
+            if (thisRequest !== requestId) return; // a newer filter click won
+
+            currentFilter = category;
+            currentPage = data.page;
+            totalPages = data.pages;
+            const cards = data.items.map(renderProjectCard);
+            projectsGrid.replaceChildren(...cards);
+            revealCards(cards);
+            console.log(`✅ Showing ${cards.length} of ${data.total} cards`);
+        } catch (error) {
+            console.error('Failed to load projects:', error);
+            Array.from(projectsGrid.children).forEach(card => {
+                card.style.opacity = '1';
+                card.style.transform = 'none';
             });
-        }, 300); // Wait for fade out to complete
+        }
 
-        console.log(`✅ Will show ${visibleCount} cards`);
+        updateShowMoreButton();
+    }
 
-        // Update show more button
+    // Show more loads the next page; once everything is shown the button collapses back to the first page
+    async function toggleShowMore() {
+        if (currentPage >= totalPages) {
+            Array.from(projectsGrid.children).slice(perPage).forEach(card => card.remove());
+            currentPage = 1;
+            updateShowMoreButton();
+            projectsGrid.scrollIntoView({ behavior: 'smooth', block: 'start' });
+            return;
+        }
+
+        const thisRequest = requestId;
+        try {
+            const data = await fetchProjects(currentFilter, currentPage + 1);
+            if (thisRequest !== requestId) return;
+            currentPage = data.page;
+            totalPages = data.pages;
+            const cards = data.items.map(renderProjectCard);
+            projectsGrid.append(...cards);
+            revealCards(cards);
+        } catch (error) {
+            console.error('Failed to load more projects:', error);
+        }
         updateShowMoreButton();
     }
 
-    // Show more/less functionality
-    function toggleShowMore() {
-        const hiddenCards = document.querySelectorAll('.project-card.hidden');
-        
-        if (showingAll) {
-            // Hide additional cards
-            hiddenCards.forEach((card, index) => {
-                setTimeout(() => {
-                    card.classList.remove('show');
-                    setTimeout(() => {
-                        card.style.display = 'none';
-                    }, 300);
-                }, index * 50);
-            });
-            
+    // Update show more button visibility and label
+    function updateShowMoreButton() {
+        if (!showMoreBtn) return;
+
+        showMoreBtn.style.display = totalPages > 1 ? 'inline-flex' : 'none';
+        if (currentPage < totalPages) {
             showMoreBtn.innerHTML = `
                 <svg class="w-5 h-5 mr-2" fill="none" stroke="currentColor" viewBox="0 0 24 24">
                     <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M19 9l-7 7-7-7"></path>
@@ -102,14 +180,6 @@ document.addEventListener('DOMContentLoaded', function() {
             `;
             showMoreBtn.classList.remove('showing-less');
         } else {
-            // Show additional cards
-            hiddenCards.forEach((card, index) => {
-                setTimeout(() => {
-                    card.style.display = 'block';
-                    card.classList.add('show');
-                }, index * 100);
-            });
-            
             showMoreBtn.innerHTML = `
                 <svg class="w-5 h-5 mr-2" fill="none" stroke="currentColor" viewBox="0 0 24 24">
                     <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M5 15l7-7 7 7"></path>
@@ -118,31 +188,6 @@ document.addEventListener('DOMContentLoaded', function() {
             `;
             showMoreBtn.classList.add('showing-less');
         }
-        
-        showingAll = !showingAll;
-    }
-
-    // Update show more button visibility
-    function updateShowMoreButton() {
-        const visibleCards = document.querySelectorAll('.project-card:not(.filtered-out)');
-        const hiddenCards = document.querySelectorAll('.project-card.hidden:not(.filtered-out)');
-        
-        if (hiddenCards.length > 0) {
-            showMoreBtn.style.display = 'inline-flex';
-        } else {
-            showMoreBtn.style.display = 'none';
-        }
-        
-        // Reset show more state when filtering
-        if (!showingAll) {
-            showMoreBtn.innerHTML = `
-                <svg class="w-5 h-5 mr-2" fill="none" stroke="currentColor" viewBox="0 0 24 24">
-                    <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M19 9l-7 7-7-7"></path>
-                </svg>
-                Show More Projects
-            `;
-            showMoreBtn.classList.remove('showing-less');
-        }
     }
 
     // Event listeners for filter buttons - Enhanced like tech-stack
@@ -168,16 +213,13 @@ document.addEventListener('DOMContentLoaded', function() {
             // Add active class to clicked button
             btn.classList.add('active');
 
-            // Filter projects
-            filterProjects(category);
-
-            // Re-enable buttons after animation
-            setTimeout(() => {
+            // Filter projects, then re-enable the buttons
+            filterProjects(category).finally(() => {
                 projectFilterBtns.forEach(btn => {
                     btn.classList.remove('loading');
                     btn.style.pointerEvents = 'auto';
                 });
-            }, 800);
+            });
         });
 
         // Add keyboard support
@@ -193,22 +235,29 @@ document.addEventListener('DOMContentLoaded', function() {
     if (showMoreBtn) {
         showMoreBtn.addEventListener('click', (e) => {
             e.preventDefault();
+            if (showMoreBtn.classList.contains('loading')) return;
             
-            // Add loading state
+            // Add loading state until the next page is in
             showMoreBtn.classList.add('loading');
-            
-            // Toggle show more
-            toggleShowMore();
-            
-            // Remove loading state
-            setTimeout(() => {
-                showMoreBtn.classList.remove('loading');
-            }, 500);
+            toggleShowMore().finally(() => showMoreBtn.classList.remove('loading'));
         });
     }
 
+    // Intersection Observer for scroll animations
+    const projectObserver = new IntersectionObserver((entries) => {
+        entries.forEach(entry => {
+            if (entry.isIntersecting) {
+                entry.target.classList.add('animate-in');
+                projectObserver.unobserve(entry.target);
+            }
+        });
+    }, {
+        threshold: 0.1,
+        rootMargin: '0px 0px -20px 0px'
+    });
+
     // Enhanced project card interactions
-    projectCards.forEach(card => {
+    function enhanceCard(card) {
         // Add ripple effect on click
         card.addEventListener('click', function(e) {
             // Don't trigger if clicking on links
@@ -254,42 +303,20 @@ document.addEventListener('DOMContentLoaded', function() {
         card.addEventListener('mouseleave', function() {
             this.style.zIndex = '1';
         });
-    });
-
-    // Intersection Observer for scroll animations
-    const projectObserver = new IntersectionObserver((entries) => {
-        entries.forEach(entry => {
-            if (entry.isIntersecting) {
-                entry.target.classList.add('animate-in');
-                projectObserver.unobserve(entry.target);
-            }
-        });
-    }, {
-        threshold: 0.1,
-        rootMargin: '0px 0px -20px 0px'
-    });
 
-    // Observe project cards for scroll animations
-    projectCards.forEach(card => {
+        // Observe project cards for scroll animations
         projectObserver.observe(card);
-    });
-
-    // Initialize with all projects visible (don't update hash on load)
-    filterProjects('all');
-
-    // Set initial active button
-    projectFilterBtns.forEach(btn => btn.classList.remove('active'));
-    const allButton = document.querySelector('[data-category="all"]');
-    if (allButton) {
-        allButton.classList.add('active');
     }
 
+    Array.from(projectsGrid.children).forEach(enhanceCard);
+    updateShowMoreButton();
+
     // Error handling
     function handleMissingElements() {
         if (projectFilterBtns.length === 0) {
             console.warn('⚠️ No project filter buttons found');
         }
-        if (projectCards.length === 0) {
+        if (projectsGrid.children.length === 0) {
             console.warn('⚠️ No project cards found');
         }
         if (!showMoreBtn) {
@@ -337,194 +364,59 @@ window.toggleProjectDescription = function(button) {
     }
 };
 
-// Project Detail Modal Data
-const projectDetails = {
-    'odoo-erp': {
-        title: 'Custom Odoo ERP Modules for Logistics & Manufacturing',
-        image: '/static/images/odoo-erp-for-logistics.jpg',
-        description: 'Developed and customised Odoo ERP modules tailored for inventory, HR, and production workflows in the logistics sector. Improved automation and user experience by integrating business logic directly into the ERP flows.',
-        features: [
-            'Custom Odoo models and views for real-time inventory tracking',
-            'Automated HR workflows including attendance and payroll',
-            'Production order scheduling with status dashboards',
-            'Role-based access control integrated with ERP rules',
-            'Optimized PostgreSQL queries and schema design for Odoo',
-        ],
-        tech: ['Odoo', 'Python','PostgreSQL', 'Docker', 'CI/CD'],
-        challenges: 'Version upgrade issues and module compatibility conflicts. Solved by creating abstract modules and backward-compatible logic.',
-        results: 'Boosted operational efficiency by 20%, reduced human errors, and increased ERP adoption across departments.',
-        demo: 'https://dalbagroup.odoo.com',
-        code: '#'
-    },
-    'mobile-api': {
-        title: 'Mobile App API',
-        image: '/static/images/mobile-api.png',
-        description: 'Built a high-performance RESTful API using Flask to support a mobile application, focusing on security, scalability, and optimal response times.',
-        features: [
-            'RESTful API design with comprehensive documentation',
-            'JWT-based authentication and authorization',
-            'Rate limiting and request throttling',
-            'Real-time data synchronization',
-            'Push notification system',
-            'File upload and media handling',
-            'Comprehensive error handling and logging',
-            'API versioning and backward compatibility'
-        ],
-        tech: ['Flask', 'Python', 'JWT', 'PostgreSQL', 'Redis'],
-        challenges: 'Implementing secure authentication while maintaining fast response times was challenging. Used JWT tokens with refresh mechanisms and implemented caching strategies to achieve sub-200ms response times.',
-        results: 'API now serves 50,000+ requests per minute with average response time of 150ms. Successfully scaled to support 100,000+ concurrent users.',
-        demo: '#',
-        code: '#'
-    },
-    'data-pipeline': {
-        title: 'Data Pipeline System',
-        image: 'https://lh3.googleusercontent.com/aida-public/AB6AXuCwWhh5SNVPtzwzvf1w_fhNQbDEDAvuTXyjo6-wQccMfteLggRvhfX3UPZmaItbQb9q27SN1JCL_M-Cx_jGhs3rejVu0x0a84WcDXfgbyJb-xe6Fixxrnee0Kej96rpF4u3h8uCKGJhu6Wuxh8Fdwf8LFg21WlIJKqfdMIrJLXdtoVx9ZLgS_Ycxsz3A-mWGPuOiX8WGZSk-CJROGRFAEltZK1VvnlHDa3JZAJJpIjmY7i_bxpj_Bxc367yQXKvF3WGd0fjj7eeEjPP',
-        description: 'Designed and implemented a robust data pipeline with FastAPI to process and analyze large datasets in real-time, deployed on AWS infrastructure.',
-        features: [
-            'Real-time data processing and streaming',
-            'Automated data validation and quality checks',
-            'Scalable microservices architecture',
-            'Real-time analytics and reporting',
-            'Data transformation and ETL processes',
-            'Error handling and retry mechanisms',
-            'Monitoring and alerting system',
-            'Data backup and recovery procedures'
-        ],
-        tech: ['FastAPI', 'Docker', 'AWS', 'Apache Kafka', 'PostgreSQL'],
-        challenges: 'Handling large-scale data processing while maintaining real-time performance was complex. Implemented streaming architecture with Apache Kafka and used containerization for scalability.',
-        results: 'Pipeline processes 1TB+ of data daily with 99.5% accuracy. Reduced processing time by 70% and enabled real-time analytics for business decisions.',
-        demo: '#',
-        code: '#'
-    },
-    'hr-automation': {
-        title: 'HR Process Automation',
-        image: 'https://images.unsplash.com/photo-1551288049-bebda4e38f71?ixlib=rb-4.0.3&ixid=M3wxMjA3fDB8MHxwaG90by1wYWdlfHx8fGVufDB8fHx8fA%3D%3D&auto=format&fit=crop&w=2070&q=80',
-        description: 'Automated complete HR workflows including recruitment, onboarding, and performance management using Odoo and custom Python scripts.',
-        features: [
-            'Automated recruitment workflow management',
-            'Employee onboarding automation',
-            'Performance review system',
-            'Leave management automation',
-            'Payroll integration',
-            'Employee self-service portal',
-            'Compliance tracking and reporting',
-            'Integration with external HR tools'
-        ],
-        tech: ['Odoo', 'Python', 'Automation', 'PostgreSQL', 'REST APIs'],
-        challenges: 'Integrating multiple HR systems while maintaining data consistency was challenging. Built custom connectors and implemented data validation to ensure accuracy.',
-        results: 'Reduced HR administrative workload by 80% and improved employee satisfaction by 60%. Automated 95% of routine HR tasks.',
-        demo: '#',
-        code: '#'
-    },
-    'microservices': {
-        title: 'Microservices Architecture',
-        image: '/static/images/microservices.jpg',
-        description: 'Designed and implemented a microservices-based system using FastAPI, Docker, and Kubernetes for scalable application deployment.',
-        features: [
-            'Service discovery and load balancing',
-            'Container orchestration with Kubernetes',
-            'API gateway implementation',
-            'Distributed logging and monitoring',
-            'Circuit breaker pattern implementation',
-            'Health checks and auto-scaling',
-            'Blue-green deployment strategy',
-            'Centralized configuration management'
-        ],
-        tech: ['FastAPI', 'Docker', 'Kubernetes', 'Redis', 'PostgreSQL'],
-        challenges: 'Managing service communication and ensuring fault tolerance across multiple services was complex. Implemented circuit breakers and distributed tracing.',
-        results: 'Achieved 99.9% uptime with ability to handle 10x traffic spikes. Reduced deployment time from hours to minutes.',
-        demo: '#',
-        code: '#'
-    },
-    'analytics-dashboard': {
-        title: 'Business Analytics Dashboard',
-        image: 'https://images.unsplash.com/photo-1460925895917-afdab827c52f?ixlib=rb-4.0.3&ixid=M3wxMjA3fDB8MHxwaG90by1wYWdlfHx8fGVufDB8fHx8fA%3D%3D&auto=format&fit=crop&w=2015&q=80',
-        description: 'Built a comprehensive analytics dashboard using Flask, PostgreSQL, and modern frontend technologies for real-time business insights.',
-        features: [
-            'Real-time data visualization',
-            'Interactive charts and graphs',
-            'Custom report generation',
-            'Data export functionality',
-            'User role-based access control',
-            'Automated data refresh',
-            'Mobile-responsive design',
-            'Integration with multiple data sources'
-        ],
-        tech: ['Flask', 'PostgreSQL', 'Chart.js', 'JavaScript', 'HTML/CSS'],
-        challenges: 'Creating real-time visualizations while maintaining performance with large datasets was challenging. Implemented data aggregation and caching strategies.',
-        results: 'Dashboard serves 500+ daily users with sub-second load times. Improved decision-making speed by 50% for business stakeholders.',
-        demo: '#',
-        code: '#'
-    },
-
-    'cicd-pipeline': {
-        title: 'CI/CD Pipeline',
-        image: '/static/images/devops-ci-cd.png',
-        description: 'Implemented automated CI/CD pipelines using GitHub Actions, Docker, and AWS for seamless deployment and testing.',
-        features: [
-            'Automated testing and quality checks',
-            'Docker containerization',
-            'Multi-environment deployment',
-            'Rollback mechanisms',
-            'Security scanning integration',
-            'Performance testing automation',
-            'Deployment notifications',
-            'Infrastructure as Code (IaC)'
-        ],
-        tech: ['GitHub Actions', 'Docker', 'AWS', 'Terraform', 'Jenkins'],
-        challenges: 'Ensuring consistent deployments across multiple environments while maintaining security was complex. Implemented comprehensive testing and security scanning.',
-        results: 'Reduced deployment time from 2 hours to 15 minutes. Achieved 99.5% deployment success rate with zero-downtime deployments.',
-        demo: '#',
-        code: '#'
-    },
-    'data-automation-toolkit': {
-        title: 'Data Processing & Analytics Automation Toolkit',
-        image: '/static/images/automation.jpg',
-        description: 'Built a Python toolkit using Pandas and NumPy to automate data cleaning, report generation, and statistical analysis for the business intelligence team. This internal tool reduced manual spreadsheet work and enabled data-driven decision-making.',
-        features: [
-            'CSV and API-based data ingestion pipeline',
-            'Automated outlier detection and normalisation routines',
-            'Dynamic Excel report generation with charts',
-            'Data validation rules to flag anomalies',
-            'CLI-based interface for scheduled or ad hoc use'
-        ],
-        tech: ['Python', 'Pandas', 'NumPy', 'Jupyter', 'Git', 'Docker', 'AWS'],
-        challenges: 'Memory inefficiency and slow computation for large files. Solved using vectorized Pandas operations and chunk-based data reads.',
-        results: 'Reduced manual analysis time by 60%, improved report accuracy, and enabled weekly reporting to be done in under 5 minutes.',
-        demo: '#',
-        code: '#'
-    },
-    'mutli-cloud-cicd': {
-        title: 'Multi-Cloud CI/CD Orchestration System',
-        image: '/static/images/cloud.jpg',
-        description: 'Built an advanced CI/CD orchestration system managing deployments across AWS, Alibaba Cloud, and DigitalOcean. The system automates the entire software delivery lifecycle with intelligent resource optimization, automated testing, and zero-downtime deployments for multiple production environments.',
-        features: [
-            'Multi-cloud deployment automation with intelligent resource allocation and cost optimization',
-            'Automated testing pipeline with unit, integration, and performance testing stages',
-            'Blue-green deployment strategy with automatic rollback capabilities on failure detection',
-            'Real-time monitoring and alerting system with Slack/email notifications for deployment status',
-            'Infrastructure as Code (IaC) templates for consistent environment provisioning across clouds'
-        ],
-        tech: ['GitHub Actions', 'Docker', 'Kubernetes', 'AWS EC2', 'DigitalOcean', 'Python', 'Jenkins', 'Nginx'],
-        challenges: 'Managing deployments across multiple cloud providers with different APIs and configurations was complex. Solved by creating abstraction layers and standardized deployment templates. Addressed network latency and cross-cloud communication issues by implementing intelligent routing and caching strategies.',
-        results: 'Reduced deployment time by 70%, decreased deployment failures by 85%, achieved 99.95% deployment success rate, cut infrastructure costs by 35% through automated resource optimization, and enabled 50+ deployments per week with zero manual intervention.',
-        demo: '#',
-        code: '#'
-    },
-};
+// Resized AVIF / WebP variants of the project images, from the image build (empty without one)
+const imageSrcsets = JSON.parse((document.getElementById('imageSrcsets') || {}).textContent || '{}');
+
+// Best format first, the same order as image_sources() in the templates
+const IMAGE_FORMATS = [['avif', 'image/avif'], ['webp', 'image/webp']];
+
+// <source> elements for a <picture>, like the image_sources() template helper
+function imageSources(src, sizes) {
+    const variants = imageSrcsets[src] || {};
+    return IMAGE_FORMATS.filter(([format]) => variants[format]).map(([format, type]) => {
+        const source = document.createElement('source');
+        source.type = type;
+        source.srcset = variants[format];
+        source.sizes = sizes;
+        return source;
+    });
+}
+
+// Project details fetched for the modal, by id
+const projectDetailCache = new Map();
+
+async function loadProjectDetail(projectId) {
+    if (!projectDetailCache.has(projectId)) {
+        const request = fetch(`/api/projects/${encodeURIComponent(projectId)}`).then(response => {
+            if (!response.ok) {
+                throw new Error(`Project request failed: ${response.status}`);
+            }
+            return response.json();
+        });
+        // Forget failed requests so the next click retries
+        request.catch(() => projectDetailCache.delete(projectId));
+        projectDetailCache.set(projectId, request);
+    }
+    return projectDetailCache.get(projectId);
+}
 
 // Global function for opening project details
-window.openProjectDetail = function(projectId) {
-    const project = projectDetails[projectId];
-    if (!project) {
-        console.error('Project not found:', projectId);
+window.openProjectDetail = async function(projectId) {
+    let project;
+    try {
+        project = await loadProjectDetail(projectId);
+    } catch (error) {
+        console.error('Project not found:', projectId, error);
         return;
     }
     
     // Populate modal content
     document.getElementById('modalProjectTitle').textContent = project.title;
-    document.getElementById('modalProjectImage').src = project.image;
-    document.getElementById('modalProjectImage').alt = project.title;
+    const modalImage = document.getElementById('modalProjectImage');
+    modalImage.parentElement.querySelectorAll('source').forEach(source => source.remove());
+    modalImage.before(...imageSources(project.image, '(max-width: 768px) 100vw, 800px'));
+    modalImage.src = project.image;
+    modalImage.alt = project.title;
     document.getElementById('modalProjectDescription').textContent = project.description;
     
     // Populate features
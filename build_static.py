@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Static asset build for the portfolio site
+Fingerprints the JS/CSS under app/static, writes precompressed .gz/.br
+copies to app/static/build and a manifest the templates read URLs from.
+Bundles and minifies each page's CSS/JS (inlining the critical CSS of
+the home page) and prints a size report.
+Also writes resized AVIF/WebP variants of app/static/images (needs Pillow).
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "app"))
+
+from routers.site import templates
+from services.bundles import BUNDLES, build_bundles, rjsmin
+from services.images import available_formats, build_images
+from services.static_assets import BUILD_DIR, build, brotli, write_manifest
+
+def print_report(report):
+    print(f"{'page':<12}{'requests':>12}{'bytes':>20}{'gzip bytes':>20}")
+    for page, sizes in report.items():
+        before, after = sizes["before"], sizes["after"]
+        print(
+            f"{page:<12}{before['requests']:>5} -> {after['requests']:<4}"
+            f"{before['bytes']:>9} -> {after['bytes']:<8}"
+            f"{before['gzip_bytes']:>9} -> {after['gzip_bytes']:<8}"
+        )
+        if "critical_css" in sizes:
+            critical = sizes["critical_css"]
+            print(f"{'':<12}critical CSS inlined: {critical['bytes']} bytes ({critical['gzip_bytes']} gzip)")
+
+def main():
+    manifest = build()
+    print(f"✅ Built {len(manifest)} assets into {BUILD_DIR}")
+    if brotli is None:
+        print("⚠️  brotli is not installed, only .gz variants were written")
+
+    bundles, report = build_bundles({"index": templates.get_template("index.html").render()})
+    manifest.update(bundles)
+    write_manifest(manifest)
+    print(f"✅ Built CSS/JS bundles for {len(BUNDLES)} pages (report in {BUILD_DIR / 'bundle-report.json'})")
+    if rjsmin is None:
+        print("⚠️  rjsmin is not installed, scripts were bundled without minification")
+    print_report(report)
+
+    formats = available_formats()
+    if not formats:
+        print("⚠️  Pillow is not installed, images are served without resized variants")
+        return
+    images = build_images()
+    print(f"✅ Built {', '.join(formats)} variants for {len(images)} images")
+
+if __name__ == "__main__":
+    main()